@@ -31,5 +31,7 @@ class EditCustomVariablesAction(QtWidgets.QAction):
         dlg = CustomVariableEditor.create_dialog(self.settings, parent=self.parent())
         utils.exec_obj(dlg)
 
-        # Ensure the hab_gui respects any changes the user may have made
-        self.settings.root_widget.refresh_cache()
+        # Ensure the hab_gui respects any changes the user may have saved
+        filenames = dlg.uiVariableWGT.saved_filenames
+        if filenames:
+            self.settings.root_widget.refresh_cache(filenames=filenames)
@@ -6,8 +6,8 @@ from hab.cli import UriArgument
 from hab.errors import InvalidAliasError
 from hab.user_prefs import UriObj
 
-from . import utils
-from .widgets.splash_screen import SplashScreen
+from . import uri_picker
+from .startup_profiler import profiler
 
 logger = logging.getLogger(__name__)
 
@@ -30,24 +30,31 @@ def get_application(settings=None, splash=True, **kwargs):
     """
     from Qt.QtWidgets import QApplication
 
+    from . import utils
+    from .widgets.splash_screen import SplashScreen
+
     global app
 
     if settings:
-        utils.entry_point_init(settings.resolver, "launch", cli_args=kwargs)
+        with profiler.phase("entry_point_init"):
+            utils.entry_point_init(settings.resolver, "launch", cli_args=kwargs)
 
     # Get the existing app if possible
     app = QApplication.instance()
     _splash = None
     if not app:
         # Otherwise create a new QApplication instance
-        app = QApplication([])
+        with profiler.phase("create_application"):
+            app = QApplication([])
         # Attempt to show a splash screen in case it takes a little while to
         # fully process the hab configuration
         if splash:
-            splash_image = utils.get_splash_image(settings.resolver)
+            with profiler.phase("splash_paths"):
+                splash_image = utils.get_splash_image(settings.resolver)
             if splash_image:
-                _splash = SplashScreen(splash_image)
-                _splash.show()
+                with profiler.phase("splash_show"):
+                    _splash = SplashScreen(splash_image)
+                    _splash.show()
 
         # For a consistent UI, set the window icon for the application. All top
         # level widgets will inherit this automatically unless they override
@@ -57,18 +64,25 @@ def get_application(settings=None, splash=True, **kwargs):
     return app, _splash
 
 
-def launch_alias(cli_settings, settings, alias_name, args=None):
+def launch_alias(cli_settings, uri, alias_name, args=None):
     """Runs the requested alias.
 
+    This only imports Qt if the alias name is invalid.
+
     Args:
+        cli_settings (hab.cli.SharedSettings): The hab cli settings.
+        uri (str): The URI to launch the alias from.
         alias_name (str): The alias name to run.
         args (list): Additional arguments for the command to be run by subprocess.
             This should be a list of each individual string argument. If a kwarg
             is being passed it should be passed as two items. ['--key', 'value'].
+
+    Returns:
+        bool: If the alias was launched. If not, the error was shown to the user.
     """
     try:
         cli_settings.write_script(
-            settings.uri, create_launch=True, launch=alias_name, exit=True, args=args
+            uri, create_launch=True, launch=alias_name, exit=True, args=args
         )
     except InvalidAliasError as error:
         from Qt.QtWidgets import QMessageBox
@@ -76,8 +90,106 @@ def launch_alias(cli_settings, settings, alias_name, args=None):
         # No need to show the full traceback for this error, just show simple
         # message telling them the alias is invalid.
         logger.warning(str(error))
+        # The QApplication may not exist if the alias was launched without a gui
+        get_application(splash=False)
         QMessageBox.critical(None, "Invalid Alias Name", str(error))
-        sys.exit(1)
+        return False
+    return True
+
+
+def launch_request(
+    cli_settings, verbosity, uri, is_dash, alias, args, splash=None, finished=None
+):
+    """Show the gui or launch the alias requested by `hab gui launch`.
+
+    This requires the QApplication to exist. It's used by `launch` and by
+    `hab_gui.launch_server.LaunchServer` to handle requests for clients.
+
+    Args:
+        cli_settings (hab.cli.SharedSettings): The hab cli settings.
+        verbosity (int): The verbosity passed to the cli.
+        uri (str): The URI passed to the cli or None.
+        is_dash (bool): If the dash URI was passed to the cli.
+        alias (str): The alias to launch or None to show the AliasLaunchWindow.
+        args (list): Additional arguments passed to the alias.
+        splash (SplashScreen, optional): Closed once the request is handled.
+        finished (callable, optional): Called with the exit code once the
+            request is finished. If not specified, `sys.exit` is called if
+            launching the alias failed.
+
+    Returns:
+        The window shown to the user or None if the alias was launched.
+    """
+    from .settings import Settings
+
+    def done(success):
+        if finished is not None:
+            finished(0 if success else 1)
+        elif not success:
+            sys.exit(1)
+
+    cli_settings.resolver._verbosity_target = "hab-gui"
+
+    # The site file can specifically disable user_prefs for verbosity
+    prefs_save_verbosity = cli_settings.resolver.site.get("prefs_save_verbosity", True)
+    # Handle loading verbosity from user_prefs if not explicitly specified.
+    # Unfortunately click's `count` feature doesn't let the cli set verbosity
+    # to zero. Then we could detect if the user wants to force verbosity to zero
+    # or left it as default. For now this just means that you can force a
+    # verbosity of 1 or higher to override the user pref but not zero.
+    if prefs_save_verbosity and not verbosity:
+        with profiler.phase("load_verbosity_prefs"):
+            user_prefs = cli_settings.resolver.user_prefs()
+            user_prefs.load()
+            if user_prefs.enabled:
+                verbosity_settings = user_prefs.get("verbosity", {})
+                if "hab-gui" in verbosity_settings:
+                    verbosity = verbosity_settings["hab-gui"]
+                    logger.info(f"Verbosity set to {verbosity} by user_prefs.")
+
+    with profiler.phase("settings"):
+        s = Settings(cli_settings.resolver, verbosity, uri=uri)
+
+    if alias:
+        # If an alias was passed, launch it, possibly asking to update the URI
+        from .dialogs.uri_picker_dialog import UriPickerDialog
+
+        with profiler.phase("should_show"):
+            show = is_dash and UriPickerDialog.should_show(s, alias=alias)
+        if not show:
+            with profiler.phase("launch_alias"):
+                success = launch_alias(cli_settings, s.uri, alias, args=args)
+            if splash:
+                splash.close()
+            profiler.finish()
+            done(success)
+            return None
+
+        logger.info("Showing the URI Picker dialog.")
+        with profiler.phase("create_window"):
+            window = UriPickerDialog(s, alias=alias)
+        window.accepted.connect(
+            lambda: done(launch_alias(cli_settings, s.uri, alias, args=args))
+        )
+        window.rejected.connect(lambda: done(True))
+    else:
+        # Otherwise Show the alias launcher so the user can also choose aliases
+        from .windows.alias_launch_window import AliasLaunchWindow
+
+        with profiler.phase("create_window"):
+            window = AliasLaunchWindow(s)
+
+    # Record the first time the URI is resolved and the window is painted
+    s.uri_changed.connect(lambda: profiler.mark("uri_changed"))
+    profiler.watch(window)
+    with profiler.phase("show_window"):
+        window.show()
+    if splash:
+        splash.finish(window)
+    if not alias and finished is not None:
+        # The launcher window doesn't need the client to wait
+        finished(0)
+    return window
 
 
 @click.group()
@@ -94,12 +206,41 @@ def gui(ctx):
     count=True,
     help="Show increasingly detailed output. Can be used up to 3 times.",
 )
+@click.option(
+    "--profile-startup",
+    "profile_startup",
+    envvar="HAB_GUI_PROFILE_STARTUP",
+    default=None,
+    help="Record how long each phase of startup takes until the gui is first "
+    "painted. Pass a filename ending in .json to save a json report, any other "
+    "filename to save a table, or - to print the table. Can also be set using "
+    "the HAB_GUI_PROFILE_STARTUP environment variable.",
+)
+@click.option(
+    "--trace-signals",
+    "trace_signals",
+    envvar="HAB_GUI_TRACE_SIGNALS",
+    default=None,
+    help="Record the signals emitted by the gui's Settings and how long each "
+    "slot connected to them takes. Pass a filename to save a Chrome trace json "
+    "file once the gui is closed, or - to print a summary table. Can also be set "
+    "using the HAB_GUI_TRACE_SIGNALS environment variable.",
+)
+@click.option(
+    "--server/--no-server",
+    default=False,
+    envvar="HAB_GUI_SERVER",
+    help="Send the request to a running `hab gui serve` process if possible. "
+    "Can also be enabled by setting the HAB_GUI_SERVER environment variable to 1.",
+)
 @click.argument("uri", cls=UriArgument, required=False, prompt=False)
 @click.argument("alias", required=False)
 # Pass all remaining arguments to the requested alias
 @click.argument("args", nargs=-1, type=click.UNPROCESSED)
 @click.pass_obj
-def launch(settings, verbosity, uri, alias, args):
+def launch(
+    settings, verbosity, profile_startup, trace_signals, server, uri, alias, args
+):
     """Show a gui letting the user launch applications or choose URI's.
 
     If ALIAS is omitted then the Hab Launcher is shown. This lets the
@@ -112,7 +253,12 @@ def launch(settings, verbosity, uri, alias, args):
     URI Picker allowing the user to choose the URI. If the shift key is pressed
     it will always show the URI Picker.
     """
-    from .settings import Settings
+    if profile_startup:
+        profiler.start(profile_startup)
+    if trace_signals:
+        from .signal_tracer import tracer
+
+        tracer.start(trace_signals)
 
     if isinstance(uri, click.UsageError):
         # Launch doesn't require a URI, but if its not passed a UsageError
@@ -125,51 +271,98 @@ def launch(settings, verbosity, uri, alias, args):
         uri = uri.uri
         is_dash = True
 
-    app, splash = get_application(settings, uri=uri, verbosity=verbosity)
+    if server and not (profile_startup or trace_signals):
+        # If `hab gui serve` is running, let it handle this request
+        from . import launch_client
 
-    settings.resolver._verbosity_target = "hab-gui"
+        reply = launch_client.launch(settings, verbosity, uri, is_dash, alias, args)
+        if reply is not None:
+            if reply["error"]:
+                logger.error(reply["error"])
+            if reply["exit_code"]:
+                sys.exit(reply["exit_code"])
+            return
 
-    # The site file can specifically disable user_prefs for verbosity
-    prefs_save_verbosity = settings.resolver.site.get("prefs_save_verbosity", True)
-    # Handle loading verbosity from user_prefs if not explicitly specified.
-    # Unfortunately click's `count` feature doesn't let the cli set verbosity
-    # to zero. Then we could detect if the user wants to force verbosity to zero
-    # or left it as default. For now this just means that you can force a
-    # verbosity of 1 or higher to override the user pref but not zero.
-    if prefs_save_verbosity and not verbosity:
-        user_prefs = settings.resolver.user_prefs()
-        user_prefs.load()
-        if user_prefs.enabled:
-            verbosity_settings = user_prefs.get("verbosity", {})
-            if "hab-gui" in verbosity_settings:
-                verbosity = verbosity_settings["hab-gui"]
-                logger.info(f"Verbosity set to {verbosity} by user_prefs.")
+    if alias:
+        # Check if the URI Picker is needed without importing Qt. If the shift
+        # key can't be checked without Qt, the gui checks it.
+        with profiler.phase("should_show"):
+            show = is_dash and uri_picker.should_show(
+                settings.resolver.user_prefs(), alias=alias
+            )
+        if show is False:
+            # Launch the alias without creating a QApplication or importing Qt.
+            # The `hab_gui.init` entry points still run, the default only
+            # imports Qt if it needs to report an exception.
+            from .entry_points.base_init import entry_point_init
+
+            with profiler.phase("entry_point_init"):
+                entry_point_init(
+                    settings.resolver,
+                    "launch",
+                    cli_args=dict(uri=uri, verbosity=verbosity),
+                )
+            settings.resolver._verbosity_target = "hab-gui"
+            with profiler.phase("launch_alias"):
+                success = launch_alias(settings, uri, alias, args=args)
+            profiler.finish()
+            if not success:
+                sys.exit(1)
+            return
 
-    s = Settings(settings.resolver, verbosity, uri=uri)
+    from . import utils
 
-    if alias:
-        # If an alias was passed, launch it, possibly asking to update the URI
-        from .dialogs.uri_picker_dialog import UriPickerDialog
+    app, splash = get_application(settings, uri=uri, verbosity=verbosity)
 
-        if not is_dash or not UriPickerDialog.should_show(s, alias=alias):
-            launch_alias(settings, s, alias, args=args)
-            if splash:
-                splash.close()
-            return
+    window = launch_request(
+        settings, verbosity, uri, is_dash, alias, args, splash=splash
+    )
+    if window is not None:
+        utils.exec_obj(app)
+    if trace_signals:
+        tracer.finish()
 
-        logger.info("Showing the URI Picker dialog.")
-        window = UriPickerDialog(s, alias=alias)
-        window.accepted.connect(lambda: launch_alias(settings, s, alias, args=args))
-    else:
-        # Otherwise Show the alias launcher so the user can also choose aliases
-        from .windows.alias_launch_window import AliasLaunchWindow
 
-        window = AliasLaunchWindow(s)
+@gui.command()
+@click.option(
+    "--stop",
+    is_flag=True,
+    help="Stop the server running for this site configuration instead.",
+)
+@click.pass_obj
+def serve(settings, stop):
+    """Keep a hab gui process running to quickly handle `hab gui launch`.
 
-    window.show()
-    if splash:
-        splash.finish(window)
+    While this is running `hab gui launch` sends its request to this process
+    instead of creating a QApplication and parsing the hab configuration. If
+    the `launch` was called with different hab cli options than `serve`, it
+    handles the request itself.
+    """
+    from . import launch_client
+
+    if stop:
+        if not launch_client.stop(settings.resolver.site):
+            click.echo("No hab gui server is running.")
+        return
 
+    from . import utils
+    from .launch_server import LaunchServer
+
+    app, _ = get_application(settings, splash=False)
+    # Keep running once all windows are closed
+    app.setQuitOnLastWindowClosed(False)
+    # Parse the hab configuration now instead of on the first request
+    settings.resolver.configs
+    settings.resolver.distros
+
+    server = LaunchServer(settings)
+    try:
+        started = server.start()
+    except PermissionError as error:
+        raise click.ClickException(str(error)) from None
+    if not started:
+        raise click.ClickException("A hab gui server is already running.")
+    app.aboutToQuit.connect(server.close)
     utils.exec_obj(app)
 
 
@@ -199,18 +392,45 @@ def set_uri(settings, uri):
 
     # Otherwise ask the user what uri to use.
     # TODO: Use fancy hab-gui widgets configured by site
-    current_uri = settings.resolver.user_prefs().uri
-    uris = list(settings.resolver.dump_forest(settings.resolver.configs, indent=""))
-    if current_uri and current_uri not in uris:
-        uris.append(current_uri)
-    uris.sort(key=str.casefold)
-
-    current_index = -1
-    if current_uri:
-        current_index = uris.index(current_uri)
+    from . import utils, workers
+    from .disk_cache import URICache
 
-    uri, ok = QInputDialog.getItem(
-        None, "Set hab URI", "Set default hab URI to:", uris, current=current_index
+    current_uri = settings.resolver.user_prefs().uri
+    dialog = QInputDialog()
+    dialog.setWindowTitle("Set hab URI")
+    dialog.setLabelText("Set default hab URI to:")
+
+    def set_uris(uris):
+        uris = list(uris or [])
+        if current_uri and current_uri not in uris:
+            uris.append(current_uri)
+        uris.sort(key=str.casefold)
+        # Keep the URI the user has chosen while updating the list
+        text = dialog.textValue() if dialog.comboBoxItems() else current_uri
+        dialog.setComboBoxItems(uris)
+        if text:
+            dialog.setTextValue(text)
+
+    # Show the cached URIs, if any, while they are validated
+    uri_cache = URICache(settings.resolver)
+    fingerprint, uris = uri_cache.load(None)
+    set_uris(uris)
+    worker = workers.Worker(
+        uri_cache.validate,
+        None,
+        fingerprint if uris is not None else None,
+        lock=workers.resolve_lock(settings.resolver),
+        parent=dialog,
     )
-    if ok:
-        settings.resolver.user_prefs().uri = uri
+    worker.signals.finished.connect(
+        lambda token, uris: uris is not None and set_uris(uris)
+    )
+    worker.signals.errored.connect(
+        lambda token, error: logger.warning(
+            "Unable to generate the URIs", exc_info=error
+        )
+    )
+    workers.start(worker)
+
+    if utils.exec_obj(dialog):
+        settings.resolver.user_prefs().uri = dialog.textValue()
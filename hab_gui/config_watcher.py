@@ -0,0 +1,172 @@
+import logging
+import os
+from pathlib import Path
+
+import hab.utils
+from Qt import QtCore
+
+from . import disk_cache, workers
+
+logger = logging.getLogger(__name__)
+
+
+def watched_paths(resolver):
+    """Returns the files and directories that define the resolver's configuration.
+
+    This includes the site files, every config and distro json file found by
+    the resolver, and the directories containing them so new files are noticed.
+    Only reading the resolver's paths is done while holding its resolve lock,
+    so this can be called from a worker thread.
+
+    Returns:
+        files, dirs: Sorted lists of file and directory paths as strings.
+    """
+    with workers.resolve_lock(resolver):
+        files = [Path(path) for path in disk_cache.site_files(resolver.site)]
+        config_paths = [Path(dirname) for dirname in resolver.config_paths]
+        finders = [
+            (Path(finder.root), getattr(finder, "glob_str", None))
+            for finder in resolver.distro_paths
+        ]
+    dirs = set()
+
+    for dirname in config_paths:
+        dirs.add(dirname)
+        files.extend(hab.utils.glob_path(dirname / "*.json"))
+
+    for root, glob_str in finders:
+        if glob_str is None:
+            # This distro finder doesn't use the file system the same way
+            files.append(root)
+            continue
+        # Watch the directory matched by a glob root and the directories it
+        # matched so adding a new distro or distro version is noticed.
+        dirs.add(root.parent)
+        dirs.update(hab.utils.glob_path(root))
+        files.extend(hab.utils.glob_path(root / glob_str))
+
+    dirs.update(path.parent for path in files)
+    return sorted({str(p) for p in files}), sorted(str(p) for p in dirs)
+
+
+class ConfigWatcher(QtCore.QObject):
+    """Emits `changed` when any of the files defining the hab configuration change.
+
+    A QFileSystemWatcher is used to notice changes as soon as they happen. File
+    system notifications are not reliable on network shares, so the files are
+    also checked every `poll_interval` seconds. In both cases a fingerprint of
+    the modified time and size of every file is calculated on a worker thread
+    and `changed` is only emitted if it is different than the last check.
+
+    Each watched path uses an inotify watch on linux, which are limited per
+    user. If there are more than `max_watched_paths` files and directories,
+    only the directories are watched. This notices files being added, removed
+    or replaced, but modifying a file in place is only noticed by polling.
+    If there are more directories than that, only polling is used.
+
+    Args:
+        resolver (hab.Resolver): The resolver whose configuration is watched.
+        poll_interval (float, optional): Check for changes this often in
+            seconds. If not specified, only the QFileSystemWatcher is used.
+        parent (Qt.QtCore.QObject, optional): Define a parent for this object.
+    """
+
+    changed = QtCore.Signal()
+    """Emitted when the configuration files have changed since the last check."""
+
+    debounce = 1000
+    """Wait this many milliseconds after the last file system notification
+    before checking, editing and saving a file often sends several notifications."""
+
+    max_watched_paths = 1000
+    """The maximum number of paths the QFileSystemWatcher is asked to watch."""
+
+    def __init__(self, resolver, poll_interval=None, parent=None):
+        super().__init__(parent)
+        self.resolver = resolver
+        self.fingerprint = None
+        self._checking = False
+        self._recheck = False
+
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._path_changed)
+        self.watcher.directoryChanged.connect(self._path_changed)
+
+        self._debounce_timer = QtCore.QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.timeout.connect(self.check)
+
+        self.poll_timer = QtCore.QTimer(self)
+        self.poll_timer.timeout.connect(self.check)
+        if poll_interval:
+            self.poll_timer.start(int(poll_interval * 1000))
+
+    def _checked(self, token, result):
+        """Called on the main thread with the results of `_scan`."""
+        self._checking = False
+        if self._recheck:
+            # Files changed while checking, discard this result and check
+            # again to get the final state
+            self._recheck = False
+            self.check()
+            return
+        paths, fingerprint = result
+        changed = self.fingerprint is not None and fingerprint != self.fingerprint
+        self.fingerprint = fingerprint
+        self._watch(paths)
+        if changed:
+            logger.debug("Hab configuration files changed.")
+            self.changed.emit()
+
+    def _check_failed(self, token, error):
+        self._checking = False
+        self._recheck = False
+        logger.warning("Unable to check for configuration changes", exc_info=error)
+
+    def _path_changed(self, path):
+        self._debounce_timer.start(self.debounce)
+
+    def _scan(self):
+        """Find and fingerprint the watched paths. This is run on a worker thread.
+
+        Returns the paths to watch, see `max_watched_paths`, and the fingerprint.
+        """
+        files, dirs = watched_paths(self.resolver)
+        paths = files + dirs
+        fingerprint = disk_cache.fingerprint(paths)
+        if len(paths) > self.max_watched_paths:
+            paths = dirs if len(dirs) <= self.max_watched_paths else []
+            logger.debug(
+                f"Too many paths to watch, watching {len(paths)} directories. "
+                "Modified files are found by polling."
+            )
+        # Missing files like un-used .habcache files can't be watched
+        existing = [path for path in paths if os.path.exists(path)]
+        return existing, fingerprint
+
+    def _watch(self, paths):
+        """Update the paths watched by the QFileSystemWatcher."""
+        current = set(self.watcher.files() + self.watcher.directories())
+        paths = set(paths)
+        removed = current - paths
+        if removed:
+            self.watcher.removePaths(list(removed))
+        added = paths - current
+        if added:
+            failed = self.watcher.addPaths(sorted(added))
+            if failed:
+                logger.debug(f"Unable to watch {len(failed)} paths, using polling.")
+
+    def check(self):
+        """Check for changes on a worker thread, emitting `changed` if needed.
+
+        The first check only records the current state of the files.
+        """
+        if self._checking:
+            self._recheck = True
+            return
+        self._checking = True
+        worker = workers.Worker(self._scan, parent=self)
+        worker.signals.finished.connect(self._checked)
+        worker.signals.errored.connect(self._check_failed)
+        workers.start(worker)
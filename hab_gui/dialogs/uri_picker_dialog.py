@@ -1,5 +1,7 @@
 from Qt import QtCore, QtWidgets
 
+from .. import uri_picker
+
 
 class UriPickerDialog(QtWidgets.QDialog):
     """A dialog for asking the user to pick a URI only when required.
@@ -136,30 +138,16 @@ class UriPickerDialog(QtWidgets.QDialog):
     def should_show(cls, settings, alias=None):
         """Checks if this dialog should be shown.
 
-        Checks for and returns True if any of the following are true:
-
-        - If user_prefs are disabled.
-        - If the user is pressing the shift key.
-        - If the user has checked the always ask checkbox for this alias.
-        - If the uri has timed out.
+        See `hab_gui.uri_picker.should_show` for details. This checks the shift
+        key using Qt.
         """
-        prefs = cls.prefs(settings, alias)
-        # If prefs are disabled, always show the dialog
-        if not prefs["enabled"]:
-            print("no prefs")
-            return True
-
-        # The shift key is pressed
-        # Note: Not using `keyboardModifiers` because it is not updated when
-        # calling this from the cli module.
-        modifiers = QtWidgets.QApplication.queryKeyboardModifiers()
-        if modifiers == QtCore.Qt.KeyboardModifier.ShiftModifier:
-            return True
-
-        # always_ask is checked for this alias
-        if prefs["ask"]:
-            return True
-
-        # finally check if the uri has expired
-        uri_check = prefs["user_prefs"].uri_check()
-        return uri_check.timedout
+
+        def shift_pressed():
+            # Note: Not using `keyboardModifiers` because it is not updated when
+            # calling this from the cli module.
+            modifiers = QtWidgets.QApplication.queryKeyboardModifiers()
+            return modifiers == QtCore.Qt.KeyboardModifier.ShiftModifier
+
+        return uri_picker.should_show(
+            settings.resolver.user_prefs(), alias=alias, shift_pressed=shift_pressed
+        )
@@ -0,0 +1,472 @@
+import contextlib
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import hab.utils
+
+logger = logging.getLogger(__name__)
+
+
+def cache_dir(site):
+    """Returns the directory hab_gui stores its persistent caches in.
+
+    Persistent caches are only used if the site config setting
+    `hab_gui_cache_dir` is set to a directory path. Environment variables and
+    `~` are expanded. If not set, None is returned.
+    """
+    paths = site.get("hab_gui_cache_dir")
+    if not paths or not paths[0]:
+        return None
+    return Path(os.path.expandvars(str(paths[0]))).expanduser()
+
+
+def config_filenames(cfg):
+    """Returns a set of the file paths that a resolved FlatConfig was built from.
+
+    This includes the file of the config, the config files it may inherit
+    values from, and the files of each distro version it uses.
+    """
+    ret = set()
+    node = cfg.original_node
+    while node is not None:
+        if node.filename:
+            ret.add(str(node.filename))
+        node = node.parent
+    for version in cfg.versions:
+        if version.filename:
+            ret.add(str(version.filename))
+    return ret
+
+
+def fingerprint(paths):
+    """Returns a hash of the modified time and size of each path.
+
+    Paths that don't exist are included so creating them changes the hash.
+    """
+    digest = hashlib.sha1()
+    for path in sorted(str(p) for p in paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            info = f"{path}|missing\n"
+        else:
+            info = f"{path}|{stat.st_mtime_ns}|{stat.st_size}\n"
+        digest.update(info.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def site_files(site):
+    """Returns the site json files and any .habcache files hab may use for them."""
+    ret = []
+    for path in site.paths:
+        ret.append(path)
+        ret.append(site.cache.site_cache_path(path))
+    return ret
+
+
+def site_id(site):
+    """Returns a short str uniquely identifying the site files used by site.
+
+    This is used to store separate caches for each site configuration.
+    """
+    paths = "|".join(str(p) for p in site.paths)
+    return hashlib.sha1(paths.encode("utf-8")).hexdigest()[:12]
+
+
+def load(filename):
+    """Returns the json data stored in filename or None if it can't be read."""
+    try:
+        with open(filename) as fle:
+            return json.load(fle)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as error:
+        logger.debug(f"Unable to read cache {filename}", exc_info=error)
+        return None
+
+
+def save(filename, data):
+    """Save data as json to filename, creating its directory if needed.
+
+    Any errors are logged instead of raised, caches are optional.
+    """
+    # Note: utils imports Qt, this module is used by cli code that may not
+    # need to import Qt, so only import it when required.
+    from . import utils
+
+    try:
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        utils.save_json(filename, data)
+    except OSError as error:
+        logger.warning(f"Unable to save cache {filename}: {error}")
+        return False
+    return True
+
+
+class URICache:
+    """Stores the URIs defined by a resolver's configs on disk.
+
+    Generating the list of URIs requires finding and parsing every config file.
+    This stores the result on disk along with a fingerprint of the config files,
+    so the list can be shown immediately and re-validated later using
+    `fingerprint` which only needs to find and stat the config files.
+
+    Args:
+        resolver (hab.Resolver): The resolver the URIs are generated from.
+    """
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+
+    @property
+    def enabled(self):
+        """If the site has enabled persistent caches. See `cache_dir`."""
+        return cache_dir(self.resolver.site) is not None
+
+    def filename(self, verbosity):
+        """The file the URIs for verbosity are cached in."""
+        site = self.resolver.site
+        return cache_dir(site) / f"uris-{site_id(site)}-v{verbosity}.json"
+
+    def fingerprint(self):
+        """Returns a fingerprint of the site and config files on disk.
+
+        This doesn't modify the resolver so it can be called from a worker thread.
+        """
+        paths = site_files(self.resolver.site)
+        for dirname in self.resolver.config_paths:
+            paths.extend(hab.utils.glob_path(Path(dirname) / "*.json"))
+        return fingerprint(paths)
+
+    def load(self, verbosity):
+        """Returns the cached fingerprint and list of URIs for verbosity.
+
+        Returns:
+            fingerprint, uris: If not cached or disabled `(None, None)` is returned.
+        """
+        if not self.enabled:
+            return None, None
+        data = load(self.filename(verbosity))
+        if not data:
+            return None, None
+        return data.get("fingerprint"), data.get("uris")
+
+    def save(self, verbosity, fingerprint, uris):
+        """Save the uris generated while the config files matched fingerprint."""
+        if not self.enabled:
+            return False
+        data = {"fingerprint": fingerprint, "uris": list(uris)}
+        return save(self.filename(verbosity), data)
+
+    def uris(self, verbosity=None):
+        """Returns the URIs for verbosity validating the cache first.
+
+        This is blocking, if the cache is out of date or disabled, the resolver
+        is used to generate the URIs and the cache is updated. See `validate`.
+        """
+        cached_fingerprint, uris = self.load(verbosity)
+        if uris is None:
+            cached_fingerprint = None
+        current = self.validate(verbosity, cached_fingerprint)
+        return uris if current is None else current
+
+    def validate(self, verbosity, cached_fingerprint, lock=None):
+        """Returns the current URIs if the cached URIs are out of date.
+
+        If the config files still match cached_fingerprint, the fingerprint
+        returned by `load`, None is returned. Otherwise the URIs are generated
+        using the resolver and saved in the cache.
+
+        This can be called from a worker thread to show the cached URIs while
+        they are validated.
+
+        Args:
+            verbosity (int): Generate the URIs visible at this verbosity.
+            cached_fingerprint (str): The fingerprint of the cached URIs, or
+                None to always generate the URIs.
+            lock (optional): A context manager held while using the resolver,
+                like `hab_gui.workers.resolve_lock`.
+        """
+        current = self.fingerprint() if self.enabled else None
+        if cached_fingerprint is not None and cached_fingerprint == current:
+            return None
+
+        resolver = self.resolver
+        with lock or contextlib.nullcontext():
+            with hab.utils.verbosity_filter(resolver, verbosity):
+                uris = list(resolver.dump_forest(resolver.configs, indent=""))
+        self.save(verbosity, current, uris)
+        return uris
+
+
+class AliasSnapshot:
+    """A stand-in for a resolved config showing the aliases saved by `AliasSnapshots`.
+
+    This provides the `uri` and `aliases` used by the alias widgets so they can
+    be shown before the URI has been resolved. `launch` resolves the URI first,
+    so launching an alias always uses the authoritative config.
+
+    Args:
+        uri (str): The URI the aliases were saved for.
+        aliases (dict): The label and icon of each alias keyed by alias name.
+        resolve (callable): Called with uri, returns the resolved FlatConfig.
+            This is called by `launch` which may be on a worker thread.
+        files (list, optional): The files the aliases were resolved from if
+            known. See `config_filenames`.
+    """
+
+    def __init__(self, uri, aliases, resolve, files=None):
+        self.uri = uri
+        self.aliases = aliases
+        self.resolve = resolve
+        self.files = files
+
+    def launch(self, alias_name, args=None, **kwargs):
+        """Resolve `uri` and launch alias_name using the resolved config.
+
+        See `hab.parsers.flat_config.FlatConfig.launch` for details.
+        """
+        return self.resolve(self.uri).launch(alias_name, args=args, **kwargs)
+
+
+class AliasSnapshots:
+    """Stores the aliases shown for each URI so they can be shown before resolving.
+
+    For each URI, verbosity and set of forced requirements, the label and icon
+    of each visible alias are saved along with a fingerprint of the files the
+    resolved config was built from. The snapshot is only re-written if the
+    aliases or fingerprint have changed.
+
+    Args:
+        resolver (hab.Resolver): The resolver the URIs are resolved by.
+    """
+
+    keys = ("label", "icon")
+    """The alias keys saved in each snapshot."""
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+
+    @property
+    def enabled(self):
+        """If the site has enabled persistent caches. See `cache_dir`."""
+        return cache_dir(self.resolver.site) is not None
+
+    @classmethod
+    def display(cls, alias):
+        """Returns the part of the alias dict saved in a snapshot."""
+        return {key: str(alias[key]) for key in cls.keys if alias.get(key) is not None}
+
+    def filename(self, uri, verbosity):
+        """The file the snapshot of uri is stored in.
+
+        This uses the resolver's current forced_requirements, so it shouldn't be
+        called while `hab_gui.settings.Settings.resolve` may be resolving.
+        """
+        site = self.resolver.site
+        forced = sorted(str(v) for v in self.resolver.forced_requirements.values())
+        key = json.dumps([uri, verbosity, forced])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return cache_dir(site) / f"aliases-{site_id(site)}" / f"{digest}.json"
+
+    def load(self, filename, uri):
+        """Returns the snapshot stored in filename for uri or None."""
+        if not self.enabled:
+            return None
+        data = load(filename)
+        if not data or data.get("uri") != uri:
+            return None
+        return data
+
+    def save(self, filename, uri, aliases, filenames):
+        """Save a snapshot of aliases for uri if it has changed.
+
+        This doesn't modify the resolver so it can be called from a worker thread.
+
+        Args:
+            filename: The file returned by `filename` for this uri.
+            uri (str): The URI that was resolved.
+            aliases (dict): The visible aliases of the resolved config.
+            filenames (list): The files the resolved config was built from.
+                See `config_filenames`.
+
+        Returns:
+            bool: If the snapshot was saved.
+        """
+        if not self.enabled:
+            return False
+        files = sorted(str(name) for name in filenames)
+        data = dict(
+            uri=uri,
+            fingerprint=fingerprint(files + site_files(self.resolver.site)),
+            files=files,
+            aliases={name: self.display(alias) for name, alias in aliases.items()},
+        )
+        if load(filename) == data:
+            return False
+        return save(filename, data)
+
+
+class SplashIndex:
+    """Stores the splash screen images found in the site's `splash_screen` paths.
+
+    Scanning directories with many images on a network share can take longer
+    than the startup the splash screen is meant to hide. This stores the images
+    found on disk along with the modified time of each `splash_screen` path. The
+    index is valid as long as none of those paths have been modified, adding or
+    removing an image from a directory changes its modified time.
+
+    Args:
+        resolver (hab.Resolver): The resolver whose site defines `splash_screen`.
+    """
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+
+    @property
+    def enabled(self):
+        """If the site has enabled persistent caches. See `cache_dir`."""
+        return cache_dir(self.resolver.site) is not None
+
+    @property
+    def filename(self):
+        """The file the index is stored in."""
+        site = self.resolver.site
+        return cache_dir(site) / f"splash-{site_id(site)}.json"
+
+    def load(self):
+        """Returns the cached list of images if the index is still valid.
+
+        Only the `splash_screen` paths are checked, not every image. If the
+        index doesn't exist or is out of date None is returned.
+        """
+        if not self.enabled:
+            return None
+        data = load(self.filename)
+        if not data or data.get("mtimes") != self.mtimes():
+            return None
+        return data.get("paths")
+
+    def mtimes(self):
+        """Returns a dict of the modified time of each `splash_screen` path."""
+        ret = {}
+        for path in self.resolver.site.get("splash_screen", []):
+            try:
+                ret[str(path)] = os.stat(path).st_mtime_ns
+            except OSError:
+                ret[str(path)] = None
+        return ret
+
+    def rescan(self):
+        """Scan the `splash_screen` paths for images and save the index.
+
+        This doesn't modify the resolver so it can be called from a worker thread.
+        """
+        # Get the modified times before scanning so changes made while
+        # scanning cause the next launch to scan again.
+        from . import utils
+
+        mtimes = self.mtimes()
+        paths = utils.scan_splash_paths(self.resolver.site.get("splash_screen", []))
+        if self.enabled:
+            save(self.filename, {"mtimes": mtimes, "paths": paths})
+        return paths
+
+
+class VariableEditorIndex:
+    """Tracks which config and distro files opt in to the `variable_editor`.
+
+    Checking the `variable_editor` flag requires reading and parsing every json
+    file. This remembers the flag along with the modified time and size of each
+    file so only files that have changed need to be read again. Files that need
+    to be read are read in parallel using a thread pool. If persistent caches are
+    enabled the index is also saved to disk so it can be re-used next launch.
+
+    Args:
+        resolver (hab.Resolver): The resolver whose files are indexed.
+    """
+
+    max_workers = 16
+    """The maximum number of threads used to read files that are not indexed."""
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+        # filename: [mtime_ns, size, variable_editor]
+        self._entries = None
+
+    @property
+    def enabled(self):
+        """If the site has enabled persistent caches. See `cache_dir`."""
+        return cache_dir(self.resolver.site) is not None
+
+    @property
+    def filename(self):
+        """The file the index is stored in."""
+        site = self.resolver.site
+        return cache_dir(site) / f"variable-editor-{site_id(site)}.json"
+
+    @classmethod
+    def read_flag(cls, filename):
+        """Returns the `variable_editor` value stored in the json filename."""
+        return bool(hab.utils.load_json_file(Path(filename)).get("variable_editor"))
+
+    def _load(self):
+        """Load the saved index, dropping entries for files that no longer exist.
+
+        Returns:
+            bool: If any entries were dropped.
+        """
+        entries = (load(self.filename) if self.enabled else None) or {}
+        self._entries = {
+            filename: entry
+            for filename, entry in entries.items()
+            if os.path.exists(filename)
+        }
+        return len(self._entries) != len(entries)
+
+    def flags(self, filenames):
+        """Returns a dict of the `variable_editor` flag for each filename.
+
+        Only files that are not indexed or have been modified since they were
+        indexed are read. Files that no longer exist are removed from the index
+        and return False.
+        """
+        modified = False
+        if self._entries is None:
+            modified = self._load()
+
+        ret = {}
+        stats = {}
+        missed = []
+        for filename in filenames:
+            filename = str(filename)
+            try:
+                stat = os.stat(filename)
+            except OSError as error:
+                logger.debug(f"Unable to index {filename}: {error}")
+                ret[filename] = False
+                modified |= self._entries.pop(filename, None) is not None
+                continue
+            stats[filename] = [stat.st_mtime_ns, stat.st_size]
+            entry = self._entries.get(filename)
+            if entry and entry[:2] == stats[filename]:
+                ret[filename] = entry[2]
+            else:
+                missed.append(filename)
+
+        if missed:
+            logger.debug(f"Reading {len(missed)} files missing from the index.")
+            workers = min(self.max_workers, len(missed))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self.read_flag, missed))
+            for index, filename in enumerate(missed):
+                ret[filename] = results[index]
+                self._entries[filename] = stats[filename] + [results[index]]
+            modified = True
+        if modified and self.enabled:
+            save(self.filename, self._entries)
+        return ret
@@ -1,3 +1,48 @@
+def entry_point_init(resolver, cmd, cli_args=None, **kwargs):
+    """Used to apply startup configuration via site config.
+
+    Example of site config replicating the default:
+        {
+            "append": {
+                "entry_points": {
+                    "hab_gui.init": {
+                        "init": "hab_gui.entry_points.message_box:MessageBoxInit"
+                    }
+                }
+            }
+        }
+
+    This uses the site entry_point `hab_gui.init` to initialize a class using
+    the interface defined by `hab_gui.entry_points.BaseInit`. Defaults to
+    `hab_gui.entry_points.message_box:MessageBoxInit` which shows a QMessageBox if
+    any exceptions are raised. This prevents Qt from closing the application due
+    to unhanded exceptions. If you want to disable this entry point default set
+    the object reference to a empty string.
+
+    Example of disabling entry point:
+        {"append": {"entry_points": {"hab_gui.init": {"init": ""}}}}`
+
+    This doesn't import Qt so `hab gui launch` can call it before launching an
+    alias without creating a QApplication. Entry points should only import Qt
+    once they need it.
+    """
+    if cli_args is None:
+        cli_args = {}
+
+    default = {"init": "hab_gui.entry_points.message_box:MessageBoxInit"}
+
+    # NOTE: kwargs should be added to allow for future changes to this call
+    eps = resolver.site.entry_points_for_group("hab_gui.init", default=default)
+    for ep in eps:
+        if not ep.value:
+            # Passing an empty value disables processing this entry point
+            continue
+
+        # Evaluate the entry point and initialize it
+        func = ep.load()
+        func(resolver, cmd, cli_args=cli_args, **kwargs)
+
+
 class BaseInit:
     """Base class that can be called by `hab_gui.utils.entry_point_init` to
     customize some part of hab_gui based on site configuration.
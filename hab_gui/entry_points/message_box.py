@@ -1,6 +1,5 @@
 import logging
 
-from .. import utils
 from .logging_exception import LoggingExceptionInit
 
 logger = logging.getLogger(__name__)
@@ -10,12 +9,19 @@ class MessageBoxInit(LoggingExceptionInit):
     """Overrides `sys.excepthook` and handles any exceptions raised instead of
     raising them. This prevents Qt from closing when an exception is raised.
     It logs the traceback and then shows a QMessageBox with the exception raised.
+
+    Qt is only imported once an exception is raised, creating the QApplication
+    if needed. `hab gui launch` may launch an alias without creating it.
     """
 
     def excepthook(self, cls, exception, tb):
         super().excepthook(cls, exception, tb)
 
+        from .. import utils
+        from ..cli import get_application
         from ..dialogs.error_message_box import ErrorMessageBox
 
+        get_application(splash=False)
+
         box = ErrorMessageBox(cls, exception, tb, parent=None)
         utils.exec_obj(box)
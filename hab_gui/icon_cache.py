@@ -0,0 +1,204 @@
+import logging
+import os
+from collections import OrderedDict
+
+from Qt import QtCore, QtGui
+
+from . import workers
+
+logger = logging.getLogger(__name__)
+
+
+class IconCache(QtCore.QObject):
+    """A process wide cache of the scaled images used for alias icons.
+
+    Images are read and scaled on a worker thread using `QImageReader` so slow
+    file systems don't block the gui. The loaded images are cached using the
+    file path, its modified time and the requested size. Once the total size of
+    the cached images exceeds `max_bytes` the least recently used images are
+    discarded.
+
+    Use `instance` to get the shared instance instead of creating your own.
+
+    Args:
+        max_bytes (int, optional): The memory budget for the cached images.
+        parent (Qt.QtCore.QObject, optional): Define a parent for this object.
+    """
+
+    icon_loaded = QtCore.Signal(str)
+    """Emitted with the file path once a image requested by `pixmap` is loaded
+    or has failed to load."""
+
+    _instance = None
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        # (path, mtime, (width, height)): QPixmap
+        self._pixmaps = OrderedDict()
+        # (path, (width, height)): The key in _pixmaps for the last loaded image
+        self._keys = {}
+        # (path, (width, height)) of files that could not be read
+        self._missing = set()
+        self._pending = set()
+        self._placeholders = {}
+
+    def _load_failed(self, token, error):
+        logger.debug(f"Unable to load icon {token[0]}", exc_info=error)
+        self._loaded(token, None)
+
+    def _loaded(self, token, result):
+        path, size = token
+        self._pending.discard(token)
+        if result is None:
+            self._missing.add(token)
+            logger.debug(f"The specified icon file {path} could not be loaded")
+            # Let the buttons replace the placeholder
+            self.icon_loaded.emit(path)
+            return
+
+        mtime, image = result
+        key = (path, mtime, size)
+        if image is not None:
+            pixmap = QtGui.QPixmap.fromImage(image)
+            self._pixmaps[key] = pixmap
+            self._bytes += self.pixmap_bytes(pixmap)
+            # Discard the least recently used images until under budget
+            while self._bytes > self.max_bytes and len(self._pixmaps) > 1:
+                _, old = self._pixmaps.popitem(last=False)
+                self._bytes -= self.pixmap_bytes(old)
+        self._keys[token] = key
+        self.icon_loaded.emit(path)
+
+    @classmethod
+    def _read(cls, path, size, cached_mtimes):
+        """Reads and scales the image. This is called on a worker thread.
+
+        Args:
+            path (str): The file path of the image to load.
+            size (tuple): The width and height to scale the image to fit inside.
+            cached_mtimes (frozenset): The modified times of the images of path
+                and size that are already cached. If the file's modified time
+                is in this set, the image isn't read.
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        # The file hasn't changed since it was last loaded, no need to read it
+        if mtime in cached_mtimes:
+            return mtime, None
+
+        reader = QtGui.QImageReader(path)
+        reader.setAutoTransform(True)
+        source = reader.size()
+        if source.isValid():
+            reader.setScaledSize(
+                source.scaled(
+                    QtCore.QSize(*size), QtCore.Qt.AspectRatioMode.KeepAspectRatio
+                )
+            )
+        image = reader.read()
+        if image.isNull():
+            logger.debug(f"Unable to read icon {path}: {reader.errorString()}")
+            return None
+        return mtime, image
+
+    def clear(self):
+        """Remove all cached images."""
+        self._pixmaps.clear()
+        self._keys.clear()
+        self._missing.clear()
+        self._bytes = 0
+
+    @classmethod
+    def instance(cls):
+        """Returns the shared IconCache instance, creating it if required."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def icon(self, path, size):
+        """Returns a QIcon for path scaled to fit inside size.
+
+        If the image is still loading, a transparent placeholder icon is
+        returned. If the file doesn't exist or is not a valid image, a null
+        QIcon is returned. See `pixmap` for details.
+        """
+        if not path:
+            return QtGui.QIcon()
+
+        pixmap = self.pixmap(path, size)
+        if pixmap is None:
+            # The icon is still loading
+            pixmap = self.placeholder(size)
+        elif pixmap.isNull():
+            # The icon file doesn't exist or is not a valid image
+            return QtGui.QIcon()
+        return QtGui.QIcon(pixmap)
+
+    def invalidate(self):
+        """Check the modified time of the files the next time they are requested.
+
+        The cached images are kept and only re-read if the file has changed.
+        """
+        self._keys.clear()
+        self._missing.clear()
+
+    def pixmap(self, path, size):
+        """Returns the cached QPixmap for path scaled to fit inside size.
+
+        If the image has not been loaded, it is loaded on a worker thread and
+        None is returned. `icon_loaded` is emitted once it's ready and calling
+        this again will return it. If the file does not exist or can not be
+        read, a null QPixmap is returned.
+
+        Args:
+            path (str): The file path of the image to load.
+            size (Qt.QtCore.QSize): The image is scaled to fit inside this size
+                keeping its aspect ratio.
+        """
+        token = (path, (size.width(), size.height()))
+        if token in self._missing:
+            return QtGui.QPixmap()
+
+        key = self._keys.get(token)
+        if key in self._pixmaps:
+            self._pixmaps.move_to_end(key)
+            return self._pixmaps[key]
+
+        if token not in self._pending:
+            self._pending.add(token)
+            # The worker can't safely access _pixmaps, pass it what it needs
+            cached_mtimes = frozenset(
+                mtime for p, mtime, s in self._pixmaps if (p, s) == token
+            )
+            worker = workers.Worker(
+                self._read, *token, cached_mtimes, token=token, parent=self
+            )
+            worker.signals.finished.connect(self._loaded)
+            worker.signals.errored.connect(self._load_failed)
+            workers.start(worker)
+        return None
+
+    @classmethod
+    def pixmap_bytes(cls, pixmap):
+        """Returns the approximate memory used by pixmap."""
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def placeholder(self, size):
+        """Returns a transparent QPixmap of size shown while the image loads."""
+        key = (size.width(), size.height())
+        if key not in self._placeholders:
+            pixmap = QtGui.QPixmap(size)
+            pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+            self._placeholders[key] = pixmap
+        return self._placeholders[key]
+
+
+def invalidate():
+    """Calls `IconCache.invalidate` on the shared instance if it was created."""
+    if IconCache._instance is not None:
+        IconCache._instance.invalidate()
@@ -0,0 +1,188 @@
+"""Sends `hab gui launch` requests to a resident `hab gui serve` process.
+
+See `hab_gui.launch_server.LaunchServer` for details. This module doesn't import
+Qt so clients can check for a server without paying for importing it.
+"""
+
+import copy
+import getpass
+import json
+import logging
+import os
+import stat
+import sys
+import tempfile
+from multiprocessing.connection import AuthenticationError, Client
+from pathlib import Path
+
+from . import disk_cache
+
+logger = logging.getLogger(__name__)
+
+
+max_message_size = 1024 * 1024
+"""The maximum size in bytes of a request or reply."""
+
+
+def runtime_dir():
+    """Returns the directory the server's socket and key files are stored in.
+
+    This uses `XDG_RUNTIME_DIR` if set, otherwise a directory in the temp dir
+    named after the current user. See `secure_runtime_dir`.
+    """
+    xdg_runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if xdg_runtime_dir:
+        return Path(xdg_runtime_dir) / "hab_gui"
+    return Path(tempfile.gettempdir()) / f"hab_gui-{getpass.getuser()}"
+
+
+def secure_runtime_dir(create=False):
+    """Returns `runtime_dir` if it's only accessible by the current user.
+
+    The temp dir is shared by all users, so another user could create the
+    directory first. The directory is only used if it's not a symlink, is
+    owned by the current user and its mode is exactly 0700.
+
+    Args:
+        create (bool, optional): Create the directory if it doesn't exist.
+
+    Returns:
+        pathlib.Path or None: The directory, or None if it doesn't exist or
+            isn't secure.
+    """
+    path = runtime_dir()
+    if create:
+        try:
+            path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        except OSError as error:
+            logger.warning(f"Unable to create {path}: {error}")
+            return None
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return None
+    if sys.platform == "win32":
+        # The temp dir is already private to each user
+        return path if stat.S_ISDIR(info.st_mode) else None
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or stat.S_IMODE(info.st_mode) != 0o700
+    ):
+        logger.warning(
+            f"Not using the hab gui server, {path} must be a directory owned "
+            "by the current user with mode 0700."
+        )
+        return None
+    return path
+
+
+def address(site):
+    """Returns the address of the server for this site configuration."""
+    name = f"server-{disk_cache.site_id(site)}"
+    if sys.platform == "win32":
+        return rf"\\.\pipe\hab_gui-{getpass.getuser()}-{name}"
+    return str(runtime_dir() / f"{name}.sock")
+
+
+def key_file(site):
+    """Returns the file storing the key clients authenticate with."""
+    return runtime_dir() / f"server-{disk_cache.site_id(site)}.key"
+
+
+def cli_settings_key(cli_settings):
+    """Returns the hab cli settings a server must match to handle a request."""
+    forced = cli_settings.forced_requirements
+    return dict(
+        site_paths=[str(path) for path in cli_settings.site_paths],
+        forced_requirements=sorted(str(req) for req in forced) if forced else [],
+        prereleases=cli_settings.prereleases,
+        enable_user_prefs=cli_settings.enable_user_prefs,
+        dump_scripts=cli_settings.dump_scripts,
+        cached=cli_settings.cached,
+    )
+
+
+def client_cli_settings(cli_settings, request):
+    """Returns a copy of the server's cli_settings using the script_dir and
+    script_ext of the client that sent request. The resolver is shared."""
+    ret = copy.copy(cli_settings)
+    ret.script_dir = Path(request["script_dir"])
+    ret.script_ext = request["script_ext"]
+    return ret
+
+
+def launch(cli_settings, verbosity, uri, is_dash, alias, args):
+    """Ask the server to handle a `hab gui launch` request.
+
+    Returns:
+        dict or None: None if the server isn't running or can't handle this
+            request. Otherwise a dict with the `exit_code` to use and any
+            `error` message.
+    """
+    request = dict(
+        command="launch",
+        settings=cli_settings_key(cli_settings),
+        script_dir=str(cli_settings.script_dir),
+        script_ext=cli_settings.script_ext,
+        verbosity=verbosity,
+        uri=uri,
+        is_dash=is_dash,
+        alias=alias,
+        args=list(args) if args else None,
+    )
+    reply = send(cli_settings.resolver.site, request)
+    if reply is None or reply.get("exit_code") is None:
+        return None
+    return reply
+
+
+def recv_message(conn):
+    """Receive a json message sent by `send_message` on conn.
+
+    Messages are sent as json instead of pickled so a malicious peer can't run
+    code in this process.
+
+    Raises:
+        ValueError: The message was not a valid json dict.
+    """
+    data = json.loads(conn.recv_bytes(max_message_size).decode("utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError("Expected a json object.")
+    return data
+
+
+def send_message(conn, message):
+    """Send the dict message as json on conn. See `recv_message`."""
+    conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+
+def send(site, request):
+    """Send request to the server running for site and return its reply.
+
+    Returns:
+        dict or None: The reply of the server, or None if no server is running.
+    """
+    if secure_runtime_dir() is None:
+        return None
+    try:
+        authkey = key_file(site).read_bytes()
+        conn = Client(address(site), authkey=authkey)
+    except (OSError, EOFError, AuthenticationError) as error:
+        logger.debug(f"hab gui server not available: {error}")
+        return None
+    with conn:
+        try:
+            send_message(conn, request)
+            return recv_message(conn)
+        except (OSError, EOFError) as error:
+            logger.warning(f"Lost connection to the hab gui server: {error}")
+            return None
+        except ValueError as error:
+            logger.warning(f"Invalid reply from the hab gui server: {error}")
+            return None
+
+
+def stop(site):
+    """Ask the server for site to exit. Returns if a server was running."""
+    return send(site, dict(command="stop")) is not None
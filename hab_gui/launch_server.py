@@ -0,0 +1,224 @@
+import logging
+import os
+import secrets
+import sys
+import threading
+from multiprocessing.connection import (
+    AuthenticationError,
+    Listener,
+    answer_challenge,
+    deliver_challenge,
+)
+
+from Qt import QtCore, QtWidgets
+
+from . import icon_cache, launch_client
+from .config_watcher import ConfigWatcher
+
+logger = logging.getLogger(__name__)
+
+
+class LaunchServer(QtCore.QObject):
+    """Handles `hab gui launch` requests for a resident `hab gui serve` process.
+
+    Starting python, importing Qt, creating the QApplication and parsing the hab
+    configuration takes a while. This keeps a process running with all of that
+    already done. `hab gui launch` sends its request using
+    `hab_gui.launch_client.launch` and exits once it's been handled. If no server
+    is running, it handles the request itself.
+
+    Connections are accepted on a background thread and each one is
+    authenticated and received on its own thread, so a stalled client can't
+    block other launches. The request must be sent within `request_timeout`
+    seconds. The requests are processed on the main thread using the shared
+    hab resolver. Requests are
+    only handled if the client uses the same hab cli settings as the server,
+    otherwise the client is told to handle the request itself. The address is
+    unique to the user and site configuration and clients must authenticate
+    using a key stored in a file only the user can read, see
+    `hab_gui.launch_client.secure_runtime_dir`. Requests and replies are sent
+    as json, never pickled.
+
+    The resolver's caches are cleared if any of its configuration files are
+    modified, see `hab_gui.config_watcher.ConfigWatcher`.
+
+    Args:
+        cli_settings (hab.cli.SharedSettings): The hab cli settings the server
+            was started with.
+        parent (Qt.QtCore.QObject, optional): Define a parent for this object.
+    """
+
+    poll_interval = 60
+    """Check for modified hab configuration files this often in seconds."""
+
+    request_timeout = 10
+    """Close connections that haven't sent their request after this many seconds."""
+
+    received = QtCore.Signal(object, object)
+    """Emitted by the accept thread with the connection and request. This queues
+    the request to be handled on the main thread."""
+
+    def __init__(self, cli_settings, parent=None):
+        super().__init__(parent)
+        self.cli_settings = cli_settings
+        self.listener = None
+        self.windows = set()
+        self.received.connect(self.handle)
+        self.watcher = ConfigWatcher(
+            cli_settings.resolver, poll_interval=self.poll_interval, parent=self
+        )
+        self.watcher.changed.connect(self.config_changed)
+
+    def _accept(self, listener, authkey):
+        """Accept connections on a background thread, starting a thread to
+        receive the request of each one."""
+        while True:
+            try:
+                conn = listener.accept()
+            except OSError:
+                # The listener was closed
+                return
+            thread = threading.Thread(
+                target=self._receive, args=(conn, authkey), daemon=True
+            )
+            thread.start()
+
+    def _receive(self, conn, authkey):
+        """Authenticate conn and receive its request on a background thread."""
+        try:
+            deliver_challenge(conn, authkey)
+            answer_challenge(conn, authkey)
+            if not conn.poll(self.request_timeout):
+                raise TimeoutError("No request was sent")
+            request = launch_client.recv_message(conn)
+        except (AuthenticationError, EOFError, ValueError) as error:
+            logger.debug(f"Rejected hab gui client connection: {error}")
+            conn.close()
+            return
+        except OSError as error:
+            logger.debug(f"Lost connection to hab gui client: {error}")
+            conn.close()
+            return
+        self.received.emit(conn, request)
+
+    def _reply(self, conn, exit_code=0, error=None):
+        try:
+            launch_client.send_message(conn, dict(exit_code=exit_code, error=error))
+        except OSError as err:
+            logger.debug(f"Unable to reply to hab gui client: {err}")
+        finally:
+            conn.close()
+
+    def close(self):
+        """Stop accepting new requests and remove the server's files."""
+        if self.listener is None:
+            return
+        self.listener.close()
+        self.listener = None
+        try:
+            os.remove(launch_client.key_file(self.cli_settings.resolver.site))
+        except OSError:
+            pass
+
+    def config_changed(self):
+        logger.info("Hab configuration changed, clearing caches.")
+        self.cli_settings.resolver.clear_caches()
+        icon_cache.invalidate()
+
+    def handle(self, conn, request):
+        """Process request on the main thread, replying once it's finished."""
+        # Imported here to prevent a circular import
+        from .cli import launch_request
+
+        command = request.get("command")
+        if command == "ping":
+            self._reply(conn)
+            return
+        if command == "stop":
+            self._reply(conn)
+            QtWidgets.QApplication.instance().quit()
+            return
+        if command != "launch" or request.get(
+            "settings"
+        ) != launch_client.cli_settings_key(self.cli_settings):
+            # Tell the client to handle the request itself
+            self._reply(conn, exit_code=None)
+            return
+
+        logger.info(f"Handling launch request: {request['uri']} {request['alias']}")
+        # Use the script settings of the client so it runs the generated scripts
+        cli_settings = launch_client.client_cli_settings(self.cli_settings, request)
+        self.refresh_prefs()
+        try:
+            window = launch_request(
+                cli_settings,
+                request["verbosity"],
+                request["uri"],
+                request["is_dash"],
+                request["alias"],
+                request["args"],
+                finished=lambda exit_code: self._reply(conn, exit_code),
+            )
+        except Exception as error:
+            logger.exception("Unable to handle launch request.")
+            self._reply(conn, 1, str(error))
+            return
+
+        if window is not None:
+            window.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+            self.windows.add(window)
+            window.destroyed.connect(lambda *args: self.windows.discard(window))
+            window.raise_()
+            window.activateWindow()
+
+    def refresh_prefs(self):
+        """Re-load the user_prefs as other processes may have modified them.
+
+        Any changes made by the open windows are saved first.
+        """
+        for window in self.windows:
+            window.settings.prefs.flush()
+        self.cli_settings.resolver.user_prefs().load(force=True)
+
+    def start(self):
+        """Start listening for requests on a background thread.
+
+        Returns:
+            bool: False if a server is already running for this site.
+
+        Raises:
+            PermissionError: The directory storing the server's files isn't
+                secure, see `hab_gui.launch_client.secure_runtime_dir`.
+        """
+        site = self.cli_settings.resolver.site
+        if launch_client.send(site, dict(command="ping")) is not None:
+            return False
+
+        if launch_client.secure_runtime_dir(create=True) is None:
+            raise PermissionError(
+                f"Unable to use {launch_client.runtime_dir()} to store the server's "
+                "files, it must be owned by the current user with mode 0700."
+            )
+        authkey = secrets.token_bytes(32)
+        filename = launch_client.key_file(site)
+        if filename.exists():
+            filename.unlink()
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as fle:
+            fle.write(authkey)
+
+        address = launch_client.address(site)
+        if sys.platform != "win32" and os.path.exists(address):
+            # Remove the socket left by a server that didn't exit cleanly
+            os.remove(address)
+        # Connections are authenticated by `_receive` so a client that stalls
+        # while authenticating doesn't block accepting other connections.
+        self.listener = Listener(address)
+        # Record the current state of the configuration files
+        self.watcher.check()
+        thread = threading.Thread(
+            target=self._accept, args=(self.listener, authkey), daemon=True
+        )
+        thread.start()
+        logger.info(f"hab gui server listening on {address}")
+        return True
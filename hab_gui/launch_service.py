@@ -0,0 +1,117 @@
+import logging
+import time
+from collections import defaultdict
+
+from Qt import QtCore
+
+from . import workers
+from .disk_cache import AliasSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class LaunchService(QtCore.QObject):
+    """Launches aliases on a worker thread so the gui doesn't freeze.
+
+    Building the alias environment and spawning the process can take a while,
+    this does that work using a worker thread. While an alias is launching any
+    other requests to launch the same alias for the same URI are ignored, so
+    double clicking a button only launches the alias once.
+
+    The hab resolver is not thread safe, so the alias is launched while holding
+    the resolver's `hab_gui.workers.resolve_lock`. If launching fails, the
+    error is logged and `launch_errored` is emitted.
+
+    The time it takes from requesting the launch until the process is spawned
+    is recorded in `timings` for each alias name.
+
+    Use `instance` to get the shared instance instead of creating your own.
+
+    Args:
+        parent (Qt.QtCore.QObject, optional): Define a parent for this object.
+    """
+
+    launch_started = QtCore.Signal(str, str)
+    """Emitted with the URI and alias name when a launch is started."""
+    launch_finished = QtCore.Signal(str, str, object)
+    """Emitted with the URI, alias name and process once the alias has been
+    spawned. If the launch failed None is passed instead of the process."""
+    launch_errored = QtCore.Signal(str, str, object)
+    """Emitted with the URI, alias name and exception if the launch failed."""
+
+    _instance = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # (uri, alias_name): start time of launches that haven't finished
+        self._pending = {}
+        self.timings = defaultdict(list)
+
+    def _finish(self, key):
+        uri, alias_name = key
+        duration = time.perf_counter() - self._pending.pop(key)
+        self.timings[alias_name].append(duration)
+        return duration
+
+    @classmethod
+    def _launch(cls, cfg, alias_name, args):
+        """Launch alias_name of cfg on a worker thread."""
+        if isinstance(cfg, AliasSnapshot):
+            # Launching from a snapshot requires resolving the URI first
+            cfg = cfg.resolve(cfg.uri)
+        with workers.resolve_lock(cfg.resolver):
+            return cfg.launch(alias_name, args=args)
+
+    def _launch_errored(self, key, error):
+        uri, alias_name = key
+        self._finish(key)
+        # Raising the error in a slot wouldn't stop anything, report it instead
+        logger.error(f"Unable to launch {alias_name} for {uri}", exc_info=error)
+        self.launch_errored.emit(uri, alias_name, error)
+        self.launch_finished.emit(uri, alias_name, None)
+
+    def _launched(self, key, proc):
+        uri, alias_name = key
+        duration = self._finish(key)
+        logger.info(f"Launched {alias_name} for {uri} in {duration:.3f} seconds.")
+        self.launch_finished.emit(uri, alias_name, proc)
+
+    @classmethod
+    def instance(cls):
+        """Returns the shared LaunchService instance, creating it if required."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def is_launching(self, uri, alias_name):
+        """Returns True if alias_name is currently being launched for uri."""
+        return (uri, alias_name) in self._pending
+
+    def launch(self, cfg, alias_name, args=None):
+        """Launch alias_name of cfg on a worker thread.
+
+        Args:
+            cfg (hab.parsers.flat_config.FlatConfig): The resolved config to
+                launch the alias from. This can also be a
+                `hab_gui.disk_cache.AliasSnapshot`.
+            alias_name (str): The alias name to run.
+            args (list, optional): Additional arguments passed to the alias.
+                See `FlatConfig.launch` for details.
+
+        Returns:
+            bool: False if this alias is already being launched for cfg's URI.
+        """
+        key = (cfg.uri, alias_name)
+        if key in self._pending:
+            logger.debug(f"Ignoring launch of {alias_name}, it's already launching.")
+            return False
+
+        self._pending[key] = time.perf_counter()
+        worker = workers.Worker(
+            self._launch, cfg, alias_name, args, token=key, parent=self
+        )
+        worker.signals.finished.connect(self._launched)
+        worker.signals.errored.connect(self._launch_errored)
+        self.launch_started.emit(*key)
+        workers.start(worker)
+        return True
@@ -0,0 +1,130 @@
+from Qt import QtCore
+
+from .. import utils
+from ..icon_cache import IconCache
+from ..launch_service import LaunchService
+
+
+class AliasModel(QtCore.QAbstractListModel):
+    """A list model of the aliases of a resolved hab config arranged in a grid.
+
+    The aliases are positioned using `hab_gui.utils.make_button_coords` and
+    stored in row-major order with `columns` model rows per grid row. Grid
+    cells that `make_button_coords` doesn't use are empty rows with no flags,
+    this allows a wrapping `QListView` showing `columns` items per row to match
+    the layout used by `hab_gui.widgets.alias_button_grid.AliasButtonGrid`.
+
+    Aliases are disabled while they are being launched by the shared
+    `hab_gui.launch_service.LaunchService`.
+
+    Args:
+        parent (Qt.QtCore.QObject, optional): Define a parent for this model.
+    """
+
+    AliasNameRole = QtCore.Qt.ItemDataRole.UserRole + 1
+    IconPathRole = QtCore.Qt.ItemDataRole.UserRole + 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cfg = None
+        self.columns = 0
+        # FlatConfig.aliases builds a new dict each time, so it's cached
+        self._aliases = {}
+        # The alias name shown by each grid cell, or None for empty cells
+        self._cells = []
+        # The row of each alias name in _cells
+        self._rows = {}
+        # The first and last row of the aliases using each icon path
+        self._icon_rows = {}
+
+        service = LaunchService.instance()
+        service.launch_started.connect(self._launch_state_changed)
+        service.launch_finished.connect(self._launch_state_changed)
+        IconCache.instance().icon_loaded.connect(self._icon_loaded)
+
+    def _icon_loaded(self, path):
+        if path not in self._icon_rows:
+            return
+        first, last = self._icon_rows[path]
+        self.dataChanged.emit(self.index(first), self.index(last))
+
+    def _launch_state_changed(self, uri, alias_name, *args):
+        if self.cfg is None or uri != self.cfg.uri or alias_name not in self._rows:
+            return
+        index = self.index(self._rows[alias_name])
+        self.dataChanged.emit(index, index)
+
+    def alias_index(self, alias_name):
+        """Returns the QModelIndex for alias_name, invalid if it's not shown."""
+        if alias_name not in self._rows:
+            return QtCore.QModelIndex()
+        return self.index(self._rows[alias_name])
+
+    def clear(self):
+        """Remove all aliases."""
+        self.set_aliases(None, [], 1, 0)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        alias_name = self._cells[index.row()]
+        if alias_name is None:
+            return None
+
+        if role == self.AliasNameRole:
+            return alias_name
+        alias = self._aliases[alias_name]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return alias.get("label", alias_name)
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            return alias_name
+        if role == self.IconPathRole:
+            return alias.get("icon", "")
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.ItemFlag.NoItemFlags
+        alias_name = self._cells[index.row()]
+        if alias_name is None:
+            return QtCore.Qt.ItemFlag.NoItemFlags
+        if LaunchService.instance().is_launching(self.cfg.uri, alias_name):
+            return QtCore.Qt.ItemFlag.NoItemFlags
+        return QtCore.Qt.ItemFlag.ItemIsEnabled
+
+    def rowCount(self, parent=None):  # noqa: N802
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._cells)
+
+    def set_aliases(self, cfg, alias_names, wrap_length, arrangement):
+        """Show alias_names of the resolved config cfg.
+
+        Args:
+            cfg (hab.parsers.flat_config.FlatConfig): The config the aliases
+                are launched from.
+            alias_names (list): The names of the aliases to show in order.
+            wrap_length (int): Indicates the number of aliases per column/row.
+            arrangement (int): The `make_button_coords` arrangement, 0 to fill
+                rows first or 1 to fill columns first.
+        """
+        coords = utils.make_button_coords(alias_names, wrap_length, arrangement)
+        columns = max([col + 1 for _, col in coords.values()], default=1)
+        rows = max([row + 1 for row, _ in coords.values()], default=0)
+
+        self.beginResetModel()
+        self.cfg = cfg
+        self._aliases = cfg.aliases if cfg is not None else {}
+        self.columns = columns
+        self._cells = [None] * (rows * columns)
+        self._rows = {}
+        self._icon_rows = {}
+        for alias_name, (row, col) in coords.items():
+            cell = row * columns + col
+            self._cells[cell] = alias_name
+            self._rows[alias_name] = cell
+            path = self._aliases[alias_name].get("icon")
+            if path:
+                first, last = self._icon_rows.get(path, (cell, cell))
+                self._icon_rows[path] = (min(first, cell), max(last, cell))
+        self.endResetModel()
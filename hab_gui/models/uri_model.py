@@ -0,0 +1,91 @@
+from bisect import bisect_left
+
+from hab.parsers import HabBase
+from Qt import QtCore
+
+
+class URIModel(QtCore.QAbstractListModel):
+    """A flat list model of URIs with a prebuilt index for fast lookups.
+
+    In addition to a dict used to find the row of a URI, a sorted index of every
+    URI and each of its trailing segments is built. This allows `matches` to find
+    all URIs that start with some text, or contain a segment that starts with
+    it, using a binary search instead of checking every row.
+
+    Args:
+        uris (list, optional): The URIs shown by this model.
+        parent (Qt.QtCore.QObject, optional): Define a parent for this model.
+    """
+
+    def __init__(self, uris=None, parent=None):
+        super().__init__(parent)
+        self._uris = []
+        self._rows = {}
+        self._index_keys = []
+        self._index_rows = []
+        if uris:
+            self.set_uris(uris)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (
+            QtCore.Qt.ItemDataRole.DisplayRole,
+            QtCore.Qt.ItemDataRole.EditRole,
+        ):
+            return self._uris[index.row()]
+        return None
+
+    def find(self, uri):
+        """Returns the row of uri or -1 if its not in this model."""
+        return self._rows.get(uri, -1)
+
+    def matches(self, text, limit=None):
+        """Returns the URIs that start with text or have a segment that starts
+        with text. This is case-insensitive and the results are in row order.
+
+        Args:
+            text (str): The text to match.
+            limit (int, optional): Stop after finding this many matches.
+        """
+        text = text.strip().casefold()
+        if not text:
+            return list(self._uris[:limit])
+
+        rows = set()
+        start = bisect_left(self._index_keys, text)
+        for i in range(start, len(self._index_keys)):
+            if not self._index_keys[i].startswith(text):
+                break
+            rows.add(self._index_rows[i])
+            if limit and len(rows) >= limit:
+                break
+        return [self._uris[row] for row in sorted(rows)]
+
+    def rowCount(self, parent=None):  # noqa: N802
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._uris)
+
+    def set_uris(self, uris):
+        """Replace the URIs shown by this model and rebuild the lookup index."""
+        self.beginResetModel()
+        try:
+            self._uris = list(uris)
+            self._rows = {}
+            index = []
+            for row, uri in enumerate(self._uris):
+                # Keep the first row if a URI is duplicated
+                self._rows.setdefault(uri, row)
+                segments = uri.casefold().split(HabBase.separator)
+                for i in range(len(segments)):
+                    index.append((HabBase.separator.join(segments[i:]), row))
+            index.sort()
+            self._index_keys = [key for key, _ in index]
+            self._index_rows = [row for _, row in index]
+        finally:
+            self.endResetModel()
+
+    def uris(self):
+        """Returns a list of the URIs shown by this model."""
+        return list(self._uris)
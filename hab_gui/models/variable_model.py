@@ -0,0 +1,267 @@
+import hab.utils
+from Qt import QtCore
+
+from .. import utils
+
+
+class FileEntry:
+    """Stores the state of a config/distro file shown by `VariableModel`.
+
+    Args:
+        parser: The hab config or distro version parser for the file.
+    """
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.dirty = False
+        # The variable names shown as child rows. This is None until the rows
+        # are fetched when the file is expanded.
+        self.names = None
+
+    @property
+    def fetched(self):
+        return self.names is not None
+
+    def load(self):
+        """Re-read the variables from disk discarding any unsaved changes."""
+        raw_data = hab.utils.load_json_file(self.parser.filename)
+        self.parser.variables = raw_data.get("variables", {})
+        self.dirty = False
+
+    def save(self):
+        """Save the variable changes to disk.
+
+        NOTE: This saves the data as regular json data not json5. Any comments,
+        etc will be cleared by calling this method.
+
+        The file is replaced atomically and this doesn't modify the model, so
+        it can be called from a worker thread. Use `VariableModel.reload` to
+        update the model afterwards.
+
+        Returns:
+            bool: Returns if this was dirty and updated data was saved to disk.
+        """
+        if not self.dirty:
+            return False
+
+        # Reload data from disk
+        raw_data = hab.utils.load_json_file(self.parser.filename)
+
+        # Update the variables section with the changes.
+        raw_data["variables"] = self.parser.variables
+
+        # Save changes over top of the existing file.
+        utils.save_json(self.parser.filename, raw_data)
+
+        return True
+
+
+class VariableModel(QtCore.QAbstractItemModel):
+    """A model showing the custom variables of hab config/distro files.
+
+    Each top level row is a file. Its child rows are only created once the view
+    expands it, using `canFetchMore`/`fetchMore`. The first child row shows the
+    filename and each following row is one of its variables, the first column
+    is the variable name and the second is its value. Variable names and values
+    can be edited.
+
+    Args:
+        parent (Qt.QtCore.QObject, optional): Define a parent for this object.
+    """
+
+    headers = ("Name", "Value")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.files = []
+
+    def add_variable(self, row, name="Undefined", value="Undefined"):
+        """Add a new variable to the file at row.
+
+        Returns:
+            bool: False if a variable named name already exists.
+        """
+        entry = self.files[row]
+        if name in entry.parser.variables:
+            return False
+        entry.parser.variables[name] = value
+        if entry.fetched:
+            index = len(entry.names) + 1
+            self.beginInsertRows(self.index(row, 0), index, index)
+            entry.names.append(name)
+            self.endInsertRows()
+        self.set_dirty(row)
+        return True
+
+    def canFetchMore(self, parent):  # noqa: N802
+        if self.is_file(parent) and parent.column() == 0:
+            return not self.files[parent.row()].fetched
+        return False
+
+    def columnCount(self, parent=None):  # noqa: N802
+        return len(self.headers)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (
+            QtCore.Qt.ItemDataRole.DisplayRole,
+            QtCore.Qt.ItemDataRole.EditRole,
+        ):
+            return None
+
+        column = index.column()
+        if self.is_file(index):
+            if column:
+                return None
+            entry = self.files[index.row()]
+            name = entry.parser.name
+            return f"{name}*" if entry.dirty else name
+
+        entry = self.files[index.internalId() - 1]
+        if index.row() == 0:
+            return str(entry.parser.filename) if column else "Filename"
+        name = entry.names[index.row() - 1]
+        return entry.parser.variables[name] if column else name
+
+    @property
+    def dirty(self):
+        """Generator that yields the row of any files that are modified."""
+        for row, entry in enumerate(self.files):
+            if entry.dirty:
+                yield row
+
+    def fetchMore(self, parent):  # noqa: N802
+        if not self.canFetchMore(parent):
+            return
+        entry = self.files[parent.row()]
+        names = list(entry.parser.variables)
+        # Include the filename row
+        self.beginInsertRows(parent, 0, len(names))
+        entry.names = names
+        self.endInsertRows()
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.ItemFlag.NoItemFlags
+        if self.is_file(index):
+            return (
+                QtCore.Qt.ItemFlag.ItemIsEnabled | QtCore.Qt.ItemFlag.ItemIsSelectable
+            )
+        if index.row() == 0:
+            # The filename row should not be editable
+            return QtCore.Qt.ItemFlag.NoItemFlags
+        return (
+            QtCore.Qt.ItemFlag.ItemIsEnabled
+            | QtCore.Qt.ItemFlag.ItemIsSelectable
+            | QtCore.Qt.ItemFlag.ItemIsEditable
+        )
+
+    def hasChildren(self, parent=None):  # noqa: N802
+        if parent is None or not parent.isValid():
+            return bool(self.files)
+        # Files always have the filename row, even if not fetched yet
+        return self.is_file(parent) and parent.column() == 0
+
+    def headerData(  # noqa: N802
+        self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole
+    ):
+        if (
+            orientation == QtCore.Qt.Orientation.Horizontal
+            and role == QtCore.Qt.ItemDataRole.DisplayRole
+        ):
+            return self.headers[section]
+        return None
+
+    def index(self, row, column, parent=None):
+        if parent is None or not parent.isValid():
+            if 0 <= row < len(self.files) and 0 <= column < len(self.headers):
+                return self.createIndex(row, column, 0)
+            return QtCore.QModelIndex()
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        # The internal id of child rows is the row of their file plus one.
+        return self.createIndex(row, column, parent.row() + 1)
+
+    @classmethod
+    def is_file(cls, index):
+        """Returns if index is a top level file row."""
+        return index.isValid() and index.internalId() == 0
+
+    def parent(self, index=None):
+        if index is None:
+            # Support calling the QObject parent method
+            return super().parent()
+        if not index.isValid() or self.is_file(index):
+            return QtCore.QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def reload(self, row):
+        """Re-read the variables of the file at row from disk."""
+        entry = self.files[row]
+        parent = self.index(row, 0)
+        if entry.fetched:
+            self.beginRemoveRows(parent, 0, len(entry.names))
+            entry.names = None
+            self.endRemoveRows()
+            entry.load()
+            self.fetchMore(parent)
+        else:
+            entry.load()
+        self.dataChanged.emit(parent, parent)
+
+    def remove_variable(self, index):
+        """Remove the variable shown by index."""
+        row = index.internalId() - 1
+        entry = self.files[row]
+        name = entry.names[index.row() - 1]
+        self.beginRemoveRows(index.parent(), index.row(), index.row())
+        del entry.names[index.row() - 1]
+        del entry.parser.variables[name]
+        self.endRemoveRows()
+        self.set_dirty(row)
+
+    def rowCount(self, parent=None):  # noqa: N802
+        if parent is None or not parent.isValid():
+            return len(self.files)
+        if self.is_file(parent) and parent.column() == 0:
+            entry = self.files[parent.row()]
+            return len(entry.names) + 1 if entry.fetched else 0
+        return 0
+
+    def set_dirty(self, row, state=True):
+        """Mark the file at row as modified and update its name."""
+        self.files[row].dirty = state
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    def set_parsers(self, parsers):
+        """Show the variables of each of these hab parsers."""
+        self.beginResetModel()
+        self.files = [FileEntry(parser) for parser in parsers]
+        self.endResetModel()
+
+    def setData(self, index, value, role=QtCore.Qt.ItemDataRole.EditRole):  # noqa: N802
+        if role != QtCore.Qt.ItemDataRole.EditRole or not (
+            self.flags(index) & QtCore.Qt.ItemFlag.ItemIsEditable
+        ):
+            return False
+
+        row = index.internalId() - 1
+        entry = self.files[row]
+        name = entry.names[index.row() - 1]
+        variables = entry.parser.variables
+        if index.column() == 1:
+            if variables[name] == value:
+                return False
+            variables[name] = value
+        else:
+            if value == name or value in variables:
+                return False
+            # Rename the variable keeping the order of the variables
+            entry.parser.variables = {
+                value if key == name else key: v for key, v in variables.items()
+            }
+            entry.names[index.row() - 1] = value
+
+        self.dataChanged.emit(index, index)
+        self.set_dirty(row)
+        return True
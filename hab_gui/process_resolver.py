@@ -0,0 +1,186 @@
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import hab
+import hab.utils
+from hab.solvers import Solver
+from hab.utils import NotSet
+
+from .disk_cache import AliasSnapshots, config_filenames
+
+logger = logging.getLogger(__name__)
+
+# The resolver used by `resolve_payload`, created by `_init_worker` in each
+# worker process.
+_resolver = None
+
+
+def _init_worker(site_paths, prereleases, target):
+    """Called when a worker process starts to create its `hab.Resolver`."""
+    global _resolver
+
+    _resolver = hab.Resolver(site=hab.Site(site_paths), prereleases=prereleases)
+    _resolver._verbosity_target = target
+    # Parse the configs and distros now so the first resolve doesn't have to
+    _resolver.configs
+    _resolver.distros
+    logger.debug(f"Resolve worker process {os.getpid()} started.")
+
+
+def resolve_payload(uri, verbosity, forced_requirements):
+    """Resolve uri in a worker process returning the result as a dict.
+
+    A `hab.parsers.flat_config.FlatConfig` can't be sent between processes so
+    only the information the gui needs to show it is returned.
+
+    Args:
+        uri (str): The URI to resolve.
+        verbosity (int): Only return the aliases visible at this verbosity.
+        forced_requirements (list): The forced requirements to resolve with as
+            strings.
+
+    Returns:
+        dict: The resolved `uri`, the label and icon of each visible alias in
+            `aliases`, the `optional_distros` and the config `files` used.
+    """
+    _resolver.forced_requirements = Solver.simplify_requirements(forced_requirements)
+    cfg = _resolver.resolve(uri)
+    with hab.utils.verbosity_filter(_resolver, verbosity):
+        aliases = cfg.aliases
+    optional_distros = cfg.optional_distros
+    if optional_distros is NotSet:
+        optional_distros = {}
+    return dict(
+        uri=cfg.uri,
+        aliases={name: AliasSnapshots.display(a) for name, a in aliases.items()},
+        optional_distros=dict(optional_distros),
+        files=sorted(config_filenames(cfg)),
+    )
+
+
+class ProcessResolver:
+    """Resolves URIs in a pool of worker processes.
+
+    Resolving a URI is CPU bound python code that holds the GIL, so resolving
+    on a worker thread still makes the gui stutter. Each worker process creates
+    its own `hab.Resolver` using the same site files, prereleases and verbosity
+    target as resolver. The forced requirements are passed with each URI.
+
+    Workers are replaced after they have resolved `max_jobs` URIs and when
+    `recycle` is called, so they pick up changes to the configs on disk. If a
+    worker process crashes, the pool is recycled and `BrokenProcessPool` is
+    raised for the URIs it was resolving.
+
+    The most recent `cache_size` results are kept, so widgets asking for the same
+    URI, verbosity and forced requirements share a single job. They are cleared
+    when the workers are replaced.
+
+    The number of processes and `max_jobs` are controlled by the site config
+    settings `hab_gui_process_workers` and `hab_gui_process_max_jobs`.
+
+    Args:
+        resolver (hab.Resolver): The resolver whose settings are used.
+    """
+
+    cache_size = 16
+    """The number of results kept for re-use by `submit`."""
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+        self._executor = None
+        # The Futures returned by `submit` keyed by their arguments
+        self._futures = OrderedDict()
+        self._jobs = 0
+        self._lock = threading.Lock()
+
+    def _shutdown(self):
+        # Let any running jobs finish without blocking the caller
+        self._executor.shutdown(wait=False)
+        self._executor = None
+        self._futures.clear()
+
+    def _get_executor(self):
+        """Returns the ProcessPoolExecutor, creating a new one if needed. This
+        must be called while holding `_lock`."""
+        if self._executor is not None and self._jobs >= self.max_jobs:
+            logger.debug(f"Recycling resolve workers after {self._jobs} jobs.")
+            self._shutdown()
+        if self._executor is None:
+            site_paths = [str(path) for path in self.resolver.site.paths]
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # Forking a process running Qt threads is not safe
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    site_paths,
+                    self.resolver.prereleases,
+                    self.resolver._verbosity_target,
+                ),
+            )
+            self._jobs = 0
+        return self._executor
+
+    @property
+    def max_jobs(self):
+        """The number of URIs resolved before the worker processes are replaced."""
+        return self.resolver.site.get("hab_gui_process_max_jobs", [50])[0]
+
+    @property
+    def max_workers(self):
+        """The number of worker processes used to resolve URIs."""
+        return self.resolver.site.get("hab_gui_process_workers", [1])[0]
+
+    def recycle(self):
+        """Replace the worker processes the next time a URI is resolved."""
+        with self._lock:
+            if self._executor is not None:
+                self._shutdown()
+
+    def resolve(self, uri, verbosity, forced_requirements):
+        """Resolve uri in a worker process, blocking until it's finished.
+
+        See `resolve_payload` for details on the arguments and return value.
+        """
+        try:
+            return self.submit(uri, verbosity, forced_requirements).result()
+        except BrokenProcessPool:
+            logger.warning(f"A resolve worker process crashed resolving {uri}.")
+            self.recycle()
+            raise
+
+    def submit(self, uri, verbosity, forced_requirements):
+        """Start resolving uri in a worker process returning a `Future`.
+
+        If the same arguments were recently submitted, their Future is returned
+        unless it failed.
+
+        Args:
+            uri (str): The URI to resolve.
+            verbosity (int): Only return the aliases visible at this verbosity.
+            forced_requirements (list): The forced requirements to resolve with.
+        """
+        forced_requirements = sorted(str(req) for req in forced_requirements)
+        key = (uri, verbosity, tuple(forced_requirements))
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and not (
+                future.done() and (future.cancelled() or future.exception())
+            ):
+                self._futures.move_to_end(key)
+                return future
+
+            executor = self._get_executor()
+            self._jobs += 1
+            future = executor.submit(
+                resolve_payload, uri, verbosity, forced_requirements
+            )
+            self._futures[key] = future
+            while len(self._futures) > self.cache_size:
+                self._futures.popitem(last=False)
+            return future
@@ -0,0 +1,199 @@
+import logging
+import threading
+import time
+import weakref
+
+from Qt import QtCore
+
+from . import workers
+
+logger = logging.getLogger(__name__)
+
+
+class ResolvePrefetcher(QtCore.QObject):
+    """Resolves configs the user is likely to need next on a worker thread.
+
+    The resolved configs are stored in the cache used by
+    `hab_gui.settings.Settings.resolve`, so when the user later needs one of
+    them it's returned instantly. Work only starts once no new requests have
+    been made for `delay` milliseconds. Configs are resolved one at a time using
+    `hab_gui.workers.resolve_pool` so they never hold up the resolve of the
+    current URI for long.
+    The prefetchers using the same settings share the resolve cache, see
+    `available`.
+
+    Call `postpone` while the user is interacting with the gui to wait another
+    `delay` milliseconds before starting the next request. This is called every
+    time `settings.uri_changing` is emitted, use `postpone_all` for other
+    interactive changes. A resolve holds the settings `resolve_lock`, so a
+    prefetch that is waiting for the resolve pool is put back in the queue, and
+    one that was cancelled doesn't resolve once it starts. A hab resolve can't
+    be interrupted, so an interactive resolve may still wait for a prefetch
+    resolve that had already started, but never for more than one.
+
+    Each call to `prefetch` has a CPU budget of `budget` seconds. Once the
+    resolves have taken longer than this, the rest of the requests are skipped.
+
+    Args:
+        settings (hab_gui.settings.Settings): Used to access shared hab settings.
+        parent (Qt.QtCore.QObject, optional): Define a parent for this object.
+    """
+
+    delay = 250
+    """Wait this many milliseconds after `prefetch` is called before starting."""
+
+    _instances = weakref.WeakSet()
+    """Every ResolvePrefetcher, used to share the resolve cache between them."""
+
+    def __init__(self, settings, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        # Incremented every time the requests are replaced so the results of
+        # out of date workers are ignored.
+        self._generation = 0
+        self._requests = []
+        # The number of resolve cache entries reserved by the last `prefetch`
+        self._claimed = 0
+        self._worker = None
+        # Set when the running worker's request is no longer wanted
+        self._cancelled = threading.Event()
+        self.spent = 0.0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._next)
+
+        self.settings.uri_changing.connect(self.postpone)
+        self._instances.add(self)
+
+    def _errored(self, token, error):
+        uri, _ = token[1]
+        logger.debug(f"Unable to prefetch {uri}", exc_info=error)
+        self._finished(token, 0.0)
+
+    def _finished(self, token, duration):
+        generation, _ = token
+        if generation != self._generation:
+            return
+        self._worker = None
+        self.spent += duration
+        if not self._timer.isActive():
+            # Wait for the timer if `postpone` was called
+            self._next()
+
+    def _next(self):
+        """Start resolving the next request that isn't already resolved."""
+        if self._worker is not None:
+            return
+        budget = self.budget
+        while self._requests and self.spent < budget:
+            uri, forced_requirements = self._requests.pop(0)
+            if self.settings.is_resolved(uri, forced_requirements):
+                continue
+            self._cancelled = threading.Event()
+            self._worker = workers.Worker(
+                self._resolve,
+                uri,
+                forced_requirements,
+                self._cancelled,
+                token=(self._generation, (uri, forced_requirements)),
+                parent=self,
+            )
+            self._worker.signals.finished.connect(self._finished)
+            self._worker.signals.errored.connect(self._errored)
+            workers.start(self._worker, pool=workers.resolve_pool())
+            return
+        if self._requests:
+            logger.debug(f"Prefetch budget spent, skipping {len(self._requests)}.")
+            self._requests = []
+
+    def _resolve(self, uri, forced_requirements, cancelled):
+        """Resolve on a worker thread returning the CPU time it took.
+
+        Nothing is resolved if cancelled was set before the worker started.
+        """
+        if cancelled.is_set():
+            return 0.0
+        start = time.thread_time()
+        self.settings.resolve(uri, forced_requirements=forced_requirements)
+        return time.thread_time() - start
+
+    @property
+    def budget(self):
+        """The CPU time in seconds each call to `prefetch` may use.
+
+        This is controlled by the site config setting `hab_gui_prefetch_budget`
+        and defaults to 2 seconds. Setting it to zero disables prefetching.
+        """
+        return float(self.settings.resolver.site.get("hab_gui_prefetch_budget", [2])[0])
+
+    def available(self):
+        """The number of requests `prefetch` may use.
+
+        All prefetchers using the same settings share `resolve_cache_size - 1`
+        entries of the resolve cache, so they don't evict each other's
+        configs or the current URI's config.
+        """
+        claimed = sum(
+            prefetcher._claimed
+            for prefetcher in self._instances
+            if prefetcher is not self and prefetcher.settings is self.settings
+        )
+        return max(self.settings.resolve_cache_size - 1 - claimed, 0)
+
+    def cancel(self):
+        """Discard any requests that haven't been resolved yet."""
+        self._generation += 1
+        self._requests = []
+        self._claimed = 0
+        self._timer.stop()
+        self._cancelled.set()
+        if self._worker is not None:
+            workers.cancel(self._worker, pool=workers.resolve_pool())
+            self._worker = None
+
+    def postpone(self):
+        """Wait another `delay` milliseconds before starting the next request.
+
+        If the current request is still waiting for the resolve pool it's put
+        back at the start of the requests. A resolve that has already started
+        is allowed to finish.
+        """
+        if self._worker is not None and workers.cancel(
+            self._worker, pool=workers.resolve_pool()
+        ):
+            self._requests.insert(0, self._worker.token[1])
+            self._worker = None
+        if self._requests:
+            self._timer.start(self.delay)
+
+    @classmethod
+    def postpone_all(cls, settings):
+        """Call `postpone` on every prefetcher using settings.
+
+        Call this before resolving a config the user is waiting for so queued
+        prefetches don't start ahead of it.
+        """
+        for prefetcher in list(cls._instances):
+            if prefetcher.settings is settings:
+                prefetcher.postpone()
+
+    def prefetch(self, requests):
+        """Replace the requests to resolve in the background.
+
+        Any previous requests that haven't started are cancelled. To prevent
+        them from pushing the current URI out of the resolve cache, only the
+        first `available` requests are used.
+
+        Args:
+            requests (list): A list of `(uri, forced_requirements)` tuples to
+                pass to `hab_gui.settings.Settings.resolve`.
+        """
+        self.cancel()
+        self.spent = 0.0
+        if self.budget <= 0:
+            return
+        self._requests = list(requests)[: self.available()]
+        self._claimed = len(self._requests)
+        if self._requests:
+            self._timer.start(self.delay)
@@ -1,9 +1,107 @@
+import atexit
 import logging
+import weakref
+from collections import OrderedDict
 
-from Qt.QtCore import QObject, Signal
+from Qt.QtCore import QObject, QTimer, Signal
+
+from . import disk_cache, icon_cache, utils, workers
+from .process_resolver import ProcessResolver
+from .signal_tracer import tracer
 
 logger = logging.getLogger(__name__)
 
+_prefs_stores = weakref.WeakSet()
+"""Every PrefsStore with unsaved changes, these are saved when python exits."""
+
+
+@atexit.register
+def _flush_prefs_stores():
+    for store in list(_prefs_stores):
+        store.flush()
+
+
+class PrefsStore(QObject):
+    """Write-behind access to the resolver's hab user_prefs.
+
+    Values are read from and written to an in-memory copy of the user_prefs.
+    Changes are written to disk once no changes have been made for `flush_delay`
+    milliseconds, when `flush` is called, or when python exits. This prevents
+    re-writing the prefs file for every click when several prefs are changed in
+    quick succession. The file is replaced atomically so multiple hab-gui
+    processes never read a partially written file.
+
+    Args:
+        resolver (hab.Resolver): The resolver whose user_prefs are stored.
+        parent (Qt.QtCore.QObject, optional): Define a parent for this object.
+    """
+
+    flush_delay = 500
+    """How long to wait in milliseconds after the last change before saving."""
+
+    def __init__(self, resolver, parent=None):
+        super().__init__(parent)
+        self.resolver = resolver
+        self._dirty = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def dirty(self):
+        """If there are changes that have not been saved to disk yet."""
+        return self._dirty
+
+    @property
+    def enabled(self):
+        """If user_prefs are enabled. Nothing is stored or saved if disabled."""
+        return self.user_prefs.enabled
+
+    def flush(self):
+        """Save any pending changes to disk now.
+
+        Returns:
+            bool: If the user_prefs were saved.
+        """
+        if not self._dirty:
+            return False
+        self._dirty = False
+        _prefs_stores.discard(self)
+        user_prefs = self.user_prefs
+        utils.save_json(user_prefs.filename, user_prefs)
+        logger.debug(f"User prefs saved to {user_prefs.filename}")
+        return True
+
+    def get(self, key, default=None):
+        """Returns the value for a specific user_prefs setting or default."""
+        user_prefs = self.user_prefs
+        if user_prefs.enabled:
+            user_prefs.load()
+            return user_prefs.get(key, default)
+        return default
+
+    def set(self, key, value):
+        """Update a specific user_pref and schedule saving the prefs to disk.
+
+        Returns:
+            bool: If user_prefs are enabled and the value was stored.
+        """
+        user_prefs = self.user_prefs
+        if not user_prefs.enabled:
+            return False
+        user_prefs.load()
+        user_prefs[key] = value
+        self._dirty = True
+        # Ensure pending changes are saved even if the gui isn't closed
+        _prefs_stores.add(self)
+        self._timer.start(self.flush_delay)
+        return True
+
+    @property
+    def user_prefs(self):
+        """The hab.user_prefs.UserPrefs object this stores values in."""
+        return self.resolver.user_prefs()
+
 
 class Settings(QObject):
     """A collection shared hab gui settings passed to widgets.
@@ -25,6 +123,9 @@ class Settings(QObject):
     uri_changed = Signal(str)
     """Signal emitted just after the URI has been updated, passing the new URI."""
 
+    recent_uris_limit = 10
+    """The number of recently used URIs saved by `recent_uris`."""
+
     def __init__(self, resolver, verbosity, uri=None, root_widget=None, parent=None):
         super().__init__(parent=parent)
         self._verbosity = verbosity
@@ -34,6 +135,76 @@ class Settings(QObject):
         self._uri = uri
         self.resolver = resolver
         self.root_widget = root_widget
+        # The hab resolver is not thread safe, any code that resolves URIs or
+        # modifies the resolver while a worker may be resolving should use this.
+        self.resolve_lock = workers.resolve_lock(resolver)
+        # LRU cache of resolved FlatConfigs, see `resolve` for details.
+        self._resolve_cache = OrderedDict()
+        self.resolve_cache_hits = 0
+        self.resolve_cache_misses = 0
+        # Created on first use by `process_resolver`
+        self._process_resolver = None
+        # Use `user_pref` and `set_user_pref` to access this
+        self.prefs = PrefsStore(resolver, parent=self)
+        # Record the signals emitted if `hab gui launch --trace-signals` is used
+        tracer.install(self)
+
+    def clear_caches(self, resolver=True):
+        """Clears the resolver's caches and the resolved configs cached by `resolve`
+        so they are re-generated on next use.
+
+        Args:
+            resolver (bool, optional): Pass False if the resolver's caches and
+                the resolved configs were already cleared while holding the
+                `resolve_lock` on a worker thread. Only the rest of the caches,
+                which must be cleared on the main thread, are cleared.
+        """
+        if resolver:
+            with self.resolve_lock:
+                self.resolver.clear_caches()
+                self.clear_resolve_cache()
+        if self._process_resolver is not None:
+            # Worker processes have their own resolver caches
+            self._process_resolver.recycle()
+        # Check if any alias icons have been modified when they are next shown
+        icon_cache.invalidate()
+        logger.debug("Resolved config cache cleared.")
+
+    def clear_resolve_cache(self):
+        """Clears only the resolved configs cached by `resolve`.
+
+        Unlike `clear_caches`, the configs and distros parsed by the resolver
+        are kept so the next `resolve` only has to re-resolve the URI.
+        """
+        with self.resolve_lock:
+            self._resolve_cache.clear()
+
+    @classmethod
+    def config_filenames(cls, cfg):
+        """Returns a set of the file paths that a resolved FlatConfig was built from.
+
+        See `hab_gui.disk_cache.config_filenames` for details.
+        """
+        return disk_cache.config_filenames(cfg)
+
+    def invalidate_files(self, filenames):
+        """Remove any configs cached by `resolve` that depend on filenames.
+
+        Unlike `clear_caches` the resolver's caches are not cleared. Use this
+        when the parsed configs or distros for these files have already been
+        updated to match the files on disk. The `process_resolver` worker
+        processes are recycled so they re-read the files.
+        """
+        filenames = {str(filename) for filename in filenames}
+        with self.resolve_lock:
+            for key, cfg in list(self._resolve_cache.items()):
+                if self.config_filenames(cfg) & filenames:
+                    del self._resolve_cache[key]
+        if self._process_resolver is not None:
+            # Worker processes have their own parsed configs and distros, and
+            # the results they already returned may use these files.
+            self._process_resolver.recycle()
+        logger.debug(f"Resolved configs using {len(filenames)} files cleared.")
 
     def load_entry_point(self, name, default, allow_none=False):
         """Work function that loads the requested entry_point defined in site."""
@@ -46,6 +217,100 @@ class Settings(QObject):
             raise ValueError(f"A valid entry_point for {name} must be defined")
         return eps[0].load()
 
+    def _resolve_key(self, uri, forced_requirements):
+        forced = tuple(sorted(str(v) for v in forced_requirements.values()))
+        return (uri, self.verbosity, forced)
+
+    def is_resolved(self, uri, forced_requirements=None):
+        """Returns if `resolve` has a cached config for these arguments."""
+        with self.resolve_lock:
+            if forced_requirements is None:
+                forced_requirements = self.resolver.forced_requirements
+            return self._resolve_key(uri, forced_requirements) in self._resolve_cache
+
+    def resolve(self, uri, forced_requirements=None):
+        """Resolve uri using `self.resolver` returning the FlatConfig.
+
+        The results are cached using the uri, verbosity and the resolver's
+        forced_requirements. Only the most recently used `resolve_cache_size`
+        configs are kept. Use `clear_caches` to clear this cache.
+
+        This is safe to call from a worker thread, only one URI is resolved at
+        a time by the resolver.
+
+        Args:
+            uri (str): The URI to resolve.
+            forced_requirements (dict, optional): Resolve using these simplified
+                requirements instead of the resolver's forced_requirements.
+                The resolver's forced_requirements are restored afterwards.
+        """
+        with self.resolve_lock:
+            current = self.resolver.forced_requirements
+            if forced_requirements is None:
+                forced_requirements = current
+            key = self._resolve_key(uri, forced_requirements)
+            cfg = self._resolve_cache.get(key)
+            if cfg is not None:
+                self.resolve_cache_hits += 1
+                self._resolve_cache.move_to_end(key)
+                return cfg
+
+            self.resolve_cache_misses += 1
+            # Note: `hab.Resolver.resolve` also accepts forced_requirements,
+            # but logs a warning every time they are used.
+            self.resolver.forced_requirements = forced_requirements
+            try:
+                cfg = self.resolver.resolve(uri)
+            finally:
+                self.resolver.forced_requirements = current
+            self._resolve_cache[key] = cfg
+            while len(self._resolve_cache) > self.resolve_cache_size:
+                self._resolve_cache.popitem(last=False)
+            return cfg
+
+    @property
+    def process_resolver(self):
+        """The `hab_gui.process_resolver.ProcessResolver` used by the `process`
+        `resolve_mode`. Its worker processes are recycled by `clear_caches`
+        and `invalidate_files`."""
+        if self._process_resolver is None:
+            self._process_resolver = ProcessResolver(self.resolver)
+        return self._process_resolver
+
+    @property
+    def resolve_cache_size(self):
+        """The maximum number of resolved configs cached by `resolve`.
+
+        This is controlled by the site config setting `hab_gui_resolve_cache_size`
+        and defaults to 16. Setting it to zero disables caching.
+        """
+        return self.resolver.site.get("hab_gui_resolve_cache_size", 16)
+
+    def resolve_cache_info(self):
+        """Returns a dict of statistics about the cache used by `resolve`.
+
+        This includes the number of cache `hits` and `misses` since this
+        instance was created, and the current and max `size` of the cache.
+        """
+        with self.resolve_lock:
+            return dict(
+                hits=self.resolve_cache_hits,
+                misses=self.resolve_cache_misses,
+                size=len(self._resolve_cache),
+                max_size=self.resolve_cache_size,
+            )
+
+    @property
+    def resolve_mode(self):
+        """How widgets should resolve the current URI.
+
+        This is controlled by the site config setting `hab_gui_resolve_mode`.
+        `sync`(the default) resolves on the main thread blocking the gui until
+        it's finished. `thread` resolves using a worker thread. `process`
+        resolves using the worker processes of `process_resolver`.
+        """
+        return self.resolver.site.get("hab_gui_resolve_mode", ["sync"])[0]
+
     @property
     def verbosity(self):
         """The verbosity setting used by hab_gui.
@@ -66,30 +331,29 @@ class Settings(QObject):
         if not self.resolver.site.get("prefs_save_verbosity", True):
             return
 
-        user_prefs = self.resolver.user_prefs()
-        if user_prefs.enabled:
-            user_prefs.load()
-            user_prefs.setdefault("verbosity", {})["hab-gui"] = value
-            user_prefs.save()
-            logger.debug(f"User prefs verbosity saved to {user_prefs.filename}")
+        verbosity = self.user_pref("verbosity", {})
+        verbosity["hab-gui"] = value
+        if self.set_user_pref("verbosity", verbosity):
+            logger.debug("User prefs verbosity updated.")
+
+    def recent_uris(self):
+        """Returns the URIs most recently used in the gui, most recent first.
+
+        These are saved in the user_prefs when the URI is changed.
+        """
+        return list(self.user_pref("recent_uris", []))
 
     def user_pref(self, key, default=None):
         """Returns the value for a specific user_prefs setting or default."""
-        user_prefs = self.resolver.user_prefs()
-        if user_prefs.enabled:
-            user_prefs.load()
-            return user_prefs.get(key, default)
-        return default
+        return self.prefs.get(key, default)
 
     def set_user_pref(self, key, value):
-        """Update a specific user_pref and save prefs to disk."""
-        user_prefs = self.resolver.user_prefs()
-        if user_prefs.enabled:
-            user_prefs.load()
-            user_prefs[key] = value
-            user_prefs.save()
-            return True
-        return False
+        """Update a specific user_pref and save prefs to disk.
+
+        The prefs are saved shortly after the last change instead of immediately,
+        see `PrefsStore` for details. Use `self.prefs.flush()` to save them now.
+        """
+        return self.prefs.set(key, value)
 
     @property
     def uri(self):
@@ -105,3 +369,7 @@ class Settings(QObject):
         # using the `-` URI to use the same URI they just selected in this GUI.
         if changed:
             self.set_user_pref("uri", uri)
+            if uri:
+                # Used by `hab_gui.uri_prefetcher.URIPrefetcher`
+                recent = [uri] + [u for u in self.recent_uris() if u != uri]
+                self.set_user_pref("recent_uris", recent[: self.recent_uris_limit])
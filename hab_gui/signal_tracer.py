@@ -0,0 +1,269 @@
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from Qt import QtCore
+
+logger = logging.getLogger(__name__)
+
+
+def slot_name(slot):
+    """Returns a human readable name for the callable slot."""
+    receiver = getattr(slot, "__self__", None)
+    func = getattr(slot, "__func__", slot)
+    name = getattr(func, "__qualname__", None) or repr(func)
+    if receiver is not None and not inspect.isclass(receiver):
+        # Use the class of the receiver, the method may be inherited
+        name = f"{type(receiver).__name__}.{func.__name__}"
+    return name
+
+
+class TracedSlot(QtCore.QObject):
+    """Calls slot recording how long it takes with a `SignalTracer`.
+
+    If slot is a method of a QObject, this is parented to it so the connection
+    is removed when the receiver is destroyed like it would be for slot.
+
+    Args:
+        tracer (SignalTracer): Records the calls to slot.
+        slot (callable): The slot to call.
+        signal (str): The name of the signal slot is connected to.
+    """
+
+    def __init__(self, tracer, slot, signal):
+        receiver = getattr(slot, "__self__", None)
+        parent = receiver if isinstance(receiver, QtCore.QObject) else None
+        super().__init__(parent)
+        self.tracer = tracer
+        self.slot = slot
+        self.signal = signal
+        self.name = slot_name(slot)
+        # Like Qt, only pass as many arguments as the slot accepts
+        self._count = None
+        try:
+            params = inspect.signature(slot).parameters.values()
+        except (TypeError, ValueError):
+            return
+        kinds = [param.kind for param in params]
+        if inspect.Parameter.VAR_POSITIONAL not in kinds:
+            positional = (
+                inspect.Parameter.POSITIONAL_ONLY,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            )
+            self._count = sum(kind in positional for kind in kinds)
+
+    def call(self, *args):
+        if self._count is not None:
+            args = args[: self._count]
+        with self.tracer.record(self.name, "slot", signal=self.signal):
+            self.slot(*args)
+
+
+class TracedSignal:
+    """Wraps a bound Qt signal so its emits and connected slots are traced.
+
+    This implements the `connect`, `disconnect` and `emit` methods of a bound
+    signal. Only slots connected after this is installed are traced.
+
+    Args:
+        tracer (SignalTracer): Records the emits and slot calls.
+        signal: The bound signal to wrap.
+        name (str): The name used to report emits of this signal.
+    """
+
+    def __init__(self, tracer, signal, name):
+        self.tracer = tracer
+        self.signal = signal
+        self.name = name
+        self._slots = []
+
+    def connect(self, slot, *args, **kwargs):
+        if not callable(slot):
+            # Connecting to another signal, it's traced if it's wrapped too
+            return self.signal.connect(slot, *args, **kwargs)
+        traced = TracedSlot(self.tracer, slot, self.name)
+        self._slots.append((slot, traced))
+        return self.signal.connect(traced.call, *args, **kwargs)
+
+    def disconnect(self, slot=None):
+        if slot is None:
+            self._slots = []
+            return self.signal.disconnect()
+        for index, (_slot, traced) in enumerate(self._slots):
+            if _slot == slot:
+                del self._slots[index]
+                return self.signal.disconnect(traced.call)
+        return self.signal.disconnect(slot)
+
+    def emit(self, *args):
+        with self.tracer.record(self.name, "signal", args=[repr(arg) for arg in args]):
+            self.signal.emit(*args)
+
+
+class SignalTracer:
+    """Records the Qt signals emitted by `hab_gui.settings.Settings`.
+
+    Every emit is recorded along with each slot it calls, how long they take
+    and their nesting, for example when a slot emits another signal. Recording
+    is a no-op unless `enabled` is True, `Settings` calls `install` when it's
+    created so tracing has to be started before the gui is created.
+
+    Use the module level `tracer` instance so all of hab_gui records into the
+    same tracer. `hab gui launch --trace-signals` enables it. The recorded data
+    can be saved in the Chrome trace event format using `write` and opened in
+    a trace viewer like chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    signals = ("uri_changing", "uri_changed", "verbosity_changed")
+    """The names of the `Settings` signals that `install` traces by default."""
+
+    def __init__(self):
+        self.enabled = False
+        self.output = None
+        self.origin = time.perf_counter()
+        self.records = []
+        self._depth = 0
+
+    def chrome_trace(self):
+        """Returns the records as a Chrome trace event format dict."""
+        pid = os.getpid()
+        events = []
+        for record in self.report():
+            events.append(
+                dict(
+                    name=record["name"],
+                    cat=record["category"],
+                    ph="X",
+                    ts=record["start"] * 1e6,
+                    dur=record["duration"] * 1e6,
+                    pid=pid,
+                    tid=record["thread"],
+                    args=record["args"],
+                )
+            )
+        return dict(traceEvents=events, displayTimeUnit="ms")
+
+    def finish(self):
+        """Stop recording and write the records to `output` if enabled."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self.write(self.output)
+
+    def install(self, obj, signals=None):
+        """Trace the signals of obj if enabled.
+
+        Args:
+            obj (Qt.QtCore.QObject): The object whose signals are traced.
+            signals (list, optional): The names of the signals to trace.
+                Defaults to `self.signals`.
+        """
+        if not self.enabled:
+            return
+        if signals is None:
+            signals = self.signals
+        for name in signals:
+            signal = TracedSignal(
+                self, getattr(obj, name), f"{type(obj).__name__}.{name}"
+            )
+            # The instance attribute is used instead of the class's Signal
+            setattr(obj, name, signal)
+
+    @contextmanager
+    def record(self, name, category, **args):
+        """Context manager recording how long the code inside it takes to run.
+
+        Args:
+            name (str): The name of the signal or slot.
+            category (str): "signal" or "slot".
+            **args: Extra information to store with the record.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        index = len(self.records)
+        # Insert a placeholder so nested records are reported in order
+        self.records.append(None)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.records[index] = dict(
+                name=name,
+                category=category,
+                start=start - self.origin,
+                duration=time.perf_counter() - start,
+                depth=self._depth,
+                thread=threading.get_ident(),
+                args=args,
+            )
+
+    def report(self):
+        """Returns the finished records as a list of dicts.
+
+        Each dict contains the `name`, `category`, `start` time and `duration`
+        in seconds, the `depth` indicating how deeply it was nested, the
+        `thread` it ran on and any extra `args`.
+        """
+        return [record for record in self.records if record is not None]
+
+    def start(self, output=None):
+        """Enable recording, resetting any previously recorded data.
+
+        Args:
+            output (str, optional): Where `finish` writes the Chrome trace json
+                file. `-` writes a summary table to stdout. If not specified
+                the table is logged.
+        """
+        self.enabled = True
+        self.output = output
+        self.records = []
+        self._depth = 0
+
+    def summary(self):
+        """Returns a dict of call count and time in seconds for each name."""
+        ret = {}
+        for record in self.report():
+            stats = ret.setdefault(
+                record["name"],
+                dict(category=record["category"], calls=0, total=0.0, max=0.0),
+            )
+            stats["calls"] += 1
+            stats["total"] += record["duration"]
+            stats["max"] = max(stats["max"], record["duration"])
+        return ret
+
+    def table(self):
+        """Returns the summary formatted as a human readable table."""
+        rows = ["  Calls  Total ms    Max ms  Name"]
+        summary = sorted(
+            self.summary().items(), key=lambda item: item[1]["total"], reverse=True
+        )
+        for name, stats in summary:
+            rows.append(
+                f"{stats['calls']:7d}  {stats['total'] * 1000:8.1f}  "
+                f"{stats['max'] * 1000:8.1f}  {name}"
+            )
+        return "\n".join(rows)
+
+    def write(self, output=None):
+        """Write the records to output. See `start` for details on output."""
+        if not output:
+            logger.info(f"hab gui signal trace:\n{self.table()}")
+        elif output == "-":
+            sys.stdout.write(f"{self.table()}\n")
+        else:
+            with open(output, "w") as fle:
+                json.dump(self.chrome_trace(), fle, indent=4)
+
+
+tracer = SignalTracer()
+"""The SignalTracer used by hab_gui to record `Settings` signals."""
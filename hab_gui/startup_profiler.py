@@ -0,0 +1,132 @@
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """Records how long each phase of launching hab gui takes.
+
+    Phases are recorded using `phase` and single events using `mark`. Recording
+    is a no-op unless `enabled` is True. Use `watch` to finish recording and
+    write the report once a widget has been painted for the first time.
+
+    Use the module level `profiler` instance so all of hab_gui records into
+    the same profiler. `hab gui launch --profile-startup` enables it.
+
+    This doesn't import Qt so it can profile `hab gui launch` requests that
+    launch an alias without creating a QApplication.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.output = None
+        self.origin = time.perf_counter()
+        self.records = []
+        self._depth = 0
+
+    def finish(self):
+        """Stop recording and write the report to `output` if enabled."""
+        if not self.enabled:
+            return
+        self.mark("finished")
+        self.enabled = False
+        self.write(self.output)
+
+    def mark(self, name):
+        """Record that name happened now."""
+        if self.enabled:
+            self.records.append((name, time.perf_counter(), 0, self._depth))
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager recording how long the code inside it takes to run."""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        index = len(self.records)
+        # Insert a placeholder so nested phases are reported in order
+        self.records.append(None)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            duration = time.perf_counter() - start
+            self.records[index] = (name, start, duration, self._depth)
+
+    def report(self):
+        """Returns the recorded phases as a list of dicts.
+
+        Each dict contains the `name`, `start` time and `duration` in seconds,
+        and the `depth` indicating if it was recorded inside another phase.
+        `start` is relative to when this profiler was created, for the shared
+        `profiler` that is when hab_gui's cli was imported by hab.
+        """
+        return [
+            dict(name=name, start=start - self.origin, duration=duration, depth=depth)
+            for name, start, duration, depth in self.records
+            if name is not None
+        ]
+
+    def start(self, output=None):
+        """Enable recording, resetting any previously recorded phases.
+
+        Args:
+            output (str, optional): Where `finish` writes the report. If this ends
+                in `.json` the report is saved as json, otherwise a table is
+                written. `-` writes the table to stdout. If not specified the
+                table is logged.
+        """
+        self.enabled = True
+        self.output = output
+        self.records = []
+        self.mark("start")
+
+    def table(self):
+        """Returns the report formatted as a human readable table."""
+        rows = ["  Start ms  Duration ms  Phase"]
+        for record in self.report():
+            name = "  " * record["depth"] + record["name"]
+            start = record["start"] * 1000
+            duration = record["duration"] * 1000
+            rows.append(f"{start:10.1f}  {duration:11.1f}  {name}")
+        return "\n".join(rows)
+
+    def watch(self, widget):
+        """Finish recording once widget is painted for the first time."""
+        if not self.enabled:
+            return
+        # Only import Qt if it's actually being used
+        from Qt import QtCore
+
+        from .utils import PaintWatcher
+
+        def painted():
+            self.mark("first_paint")
+            # Finish after the paint event has been processed
+            QtCore.QTimer.singleShot(0, self.finish)
+
+        PaintWatcher(widget, painted)
+
+    def write(self, output=None):
+        """Write the report to output. See `start` for details on output."""
+        if not output:
+            logger.info(f"hab gui startup profile:\n{self.table()}")
+        elif output == "-":
+            sys.stdout.write(f"{self.table()}\n")
+        elif str(output).endswith(".json"):
+            with open(output, "w") as fle:
+                json.dump({"phases": self.report()}, fle, indent=4)
+        else:
+            with open(output, "w") as fle:
+                fle.write(f"{self.table()}\n")
+
+
+profiler = StartupProfiler()
+"""The StartupProfiler used by hab_gui to record startup phases."""
@@ -0,0 +1,77 @@
+import logging
+
+from Qt import QtCore
+
+logger = logging.getLogger(__name__)
+
+
+class URICommitter(QtCore.QObject):
+    """Decides when the URI typed into a URI widget is applied to `Settings.uri`.
+
+    Setting `Settings.uri` resolves the URI and saves it to the user prefs, so
+    this isn't done for every keystroke. While the user is typing, the URI is
+    committed once they stop typing for `delay` milliseconds if it's a known
+    URI, or `unknown_delay` milliseconds otherwise. Pressing Enter or moving
+    focus away from the widget commits the URI immediately. A URI is only
+    committed if it's different from the previously committed URI.
+
+    Args:
+        settings (hab_gui.settings.Settings): The settings to update.
+        widget (Qt.QtWidgets.QWidget): The URI widget, its `uri` method returns
+            the URI to commit.
+        line_edit (Qt.QtWidgets.QLineEdit): The line edit the user types in.
+        is_known (callable, optional): Called with a URI, returns if it's a
+            known URI. Defaults to checking the resolver's configs.
+        parent (Qt.QtCore.QObject, optional): Define a parent for this object.
+            Defaults to widget.
+    """
+
+    delay = 300
+    """Commit a known URI once the user has stopped typing for this many ms."""
+
+    unknown_delay = 1500
+    """Commit an unknown URI once the user has stopped typing for this many ms.
+    Unknown URIs are often only part of the URI the user is typing."""
+
+    def __init__(self, settings, widget, line_edit, is_known=None, parent=None):
+        super().__init__(widget if parent is None else parent)
+        self.settings = settings
+        self.widget = widget
+        self.is_known = is_known or self._is_config
+        self.committed = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.commit)
+
+        line_edit.textEdited.connect(self.edited)
+        # Emitted when Enter is pressed or the line edit loses focus
+        line_edit.editingFinished.connect(self.commit)
+
+    def _is_config(self, uri):
+        with self.settings.resolve_lock:
+            return uri in self.settings.resolver.configs
+
+    def commit(self, force=False):
+        """Update `Settings.uri` with the widget's URI if it has changed.
+
+        Args:
+            force (bool, optional): Update `Settings.uri` even if the URI hasn't
+                changed. This makes the rest of the gui refresh.
+        """
+        self._timer.stop()
+        uri = self.widget.uri()
+        if not force and uri == self.committed and uri == self.settings.uri:
+            return
+        self.committed = uri
+        self.settings.uri = uri
+
+    def edited(self):
+        """Restart the timer to commit the URI after the user stops typing."""
+        delay = self.delay if self.is_known(self.widget.uri()) else self.unknown_delay
+        self._timer.start(delay)
+
+    @property
+    def pending(self):
+        """If a URI has been edited but not committed yet."""
+        return self._timer.isActive()
@@ -0,0 +1,122 @@
+"""Decide if `hab gui launch - alias` needs to show the URI Picker dialog.
+
+Nothing in this module imports Qt. This lets the cli launch the alias without
+creating a QApplication when `hab_gui.dialogs.uri_picker_dialog.UriPickerDialog`
+doesn't need to be shown.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+def _shift_pressed_macos():
+    path = ctypes.util.find_library("ApplicationServices")
+    if not path:
+        return None
+    lib = ctypes.cdll.LoadLibrary(path)
+    lib.CGEventSourceFlagsState.restype = ctypes.c_uint64
+    lib.CGEventSourceFlagsState.argtypes = [ctypes.c_int32]
+    # kCGEventSourceStateCombinedSessionState and kCGEventFlagMaskShift
+    return bool(lib.CGEventSourceFlagsState(0) & 0x20000)
+
+
+def _shift_pressed_windows():
+    # VK_SHIFT, the most significant bit is set if the key is down
+    return bool(ctypes.windll.user32.GetAsyncKeyState(0x10) & 0x8000)
+
+
+def _shift_pressed_x11():
+    path = ctypes.util.find_library("X11")
+    if not path:
+        return None
+    lib = ctypes.cdll.LoadLibrary(path)
+    lib.XOpenDisplay.restype = ctypes.c_void_p
+    lib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    lib.XQueryKeymap.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+    lib.XKeysymToKeycode.restype = ctypes.c_ubyte
+    lib.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+    lib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+
+    display = lib.XOpenDisplay(None)
+    if not display:
+        return None
+    try:
+        keys = (ctypes.c_ubyte * 32)()
+        lib.XQueryKeymap(display, keys)
+        # The Shift_L and Shift_R keysyms
+        for keysym in (0xFFE1, 0xFFE2):
+            code = lib.XKeysymToKeycode(display, keysym)
+            if code and keys[code // 8] & (1 << (code % 8)):
+                return True
+        return False
+    finally:
+        lib.XCloseDisplay(display)
+
+
+def shift_pressed():
+    """Returns if the user is currently pressing the shift key.
+
+    This queries the operating system directly instead of using
+    `QApplication.queryKeyboardModifiers` which requires a QApplication.
+
+    Returns:
+        bool: If shift is pressed or None if it can't be checked without Qt.
+            For example when using Wayland.
+    """
+    if os.getenv("QT_QPA_PLATFORM") == "offscreen":
+        # Qt doesn't have access to the keyboard either
+        return False
+    try:
+        if sys.platform == "win32":
+            return _shift_pressed_windows()
+        if sys.platform == "darwin":
+            return _shift_pressed_macos()
+        if os.getenv("DISPLAY") and not os.getenv("WAYLAND_DISPLAY"):
+            return _shift_pressed_x11()
+    except (AttributeError, OSError) as error:
+        logger.debug(f"Unable to check the shift key: {error}")
+    return None
+
+
+def should_show(user_prefs, alias=None, shift_pressed=shift_pressed):
+    """Checks if the URI Picker dialog should be shown.
+
+    Returns True if any of the following are true:
+
+    - If user_prefs are disabled.
+    - If the user has checked the always ask checkbox for this alias.
+    - If the uri has timed out.
+    - If the user is pressing the shift key.
+
+    The user prefs are only read from disk if they haven't already been loaded.
+
+    Args:
+        user_prefs (hab.user_prefs.UserPrefs): The user prefs to check.
+        alias (str, optional): The alias name the user want's to launch.
+        shift_pressed (callable, optional): Returns if the shift key is pressed,
+            or None if that can't be checked.
+
+    Returns:
+        bool: If the dialog should be shown. None is returned if it only depends
+            on the shift key and `shift_pressed` returned None.
+    """
+    # If prefs are disabled, always show the dialog
+    if not user_prefs.enabled:
+        return True
+
+    user_prefs.load()
+    # always_ask is checked for this alias
+    if user_prefs.get("uri_picker", {}).get(alias, False):
+        return True
+
+    # The uri has expired
+    if user_prefs.get("uri") and user_prefs.uri_is_timedout:
+        return True
+
+    # Check the shift key last as it may require querying the operating system
+    return shift_pressed()
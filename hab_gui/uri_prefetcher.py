@@ -0,0 +1,76 @@
+import logging
+
+from Qt import QtCore
+
+from .resolve_prefetcher import ResolvePrefetcher
+from .widgets.distro_picker import DistroPicker
+
+logger = logging.getLogger(__name__)
+
+
+class URIPrefetcher(QtCore.QObject):
+    """Resolves the user's recently used and pinned URIs while the gui is idle.
+
+    Switching to one of these URIs then uses the config cached by
+    `hab_gui.settings.Settings.resolve` instead of resolving it. Call `refresh`
+    after the gui has started and any time the resolve cache is cleared.
+
+    The URIs are resolved by a `ResolvePrefetcher` once the gui has been idle
+    for `delay` milliseconds. Only one URI is resolved at a time, and changing
+    the URI or verbosity postpones starting the next one so prefetching doesn't
+    compete with the user. The site config setting `hab_gui_prefetch_budget`
+    limits how much CPU time is used, see `ResolvePrefetcher.budget`.
+
+    Args:
+        settings (hab_gui.settings.Settings): Used to access shared hab settings.
+        parent (Qt.QtCore.QObject, optional): Define a parent for this object.
+    """
+
+    delay = 1000
+    """Wait until the gui has been idle this many milliseconds before starting."""
+
+    max_uris = 8
+    """The maximum number of URIs to prefetch."""
+
+    def __init__(self, settings, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        self.prefetcher = ResolvePrefetcher(settings, parent=self)
+        self.prefetcher.delay = self.delay
+
+        # The verbosity is part of the resolve cache key
+        self.settings.verbosity_changed.connect(self.refresh)
+
+    def forced_requirements(self, uri):
+        """Returns the forced requirements uri will be resolved with if selected.
+
+        When the URI is changed, a `DistroPicker` in the gui replaces the forced
+        requirements with the optional distros the user saved for the URI. The
+        same requirements are used so the prefetched config is used. If the gui
+        doesn't have a DistroPicker, None is returned so the current forced
+        requirements are used.
+        """
+        root = self.settings.root_widget
+        picker = root.findChild(DistroPicker) if root is not None else None
+        if picker is None:
+            return None
+        return picker.forced_requirements(picker.user_selection(uri) or ())
+
+    def refresh(self):
+        """Replace any pending requests with the current `uris`."""
+        uris = self.uris()
+        logger.debug(f"Prefetching {len(uris)} recent and pinned URIs.")
+        self.prefetcher.prefetch([(uri, self.forced_requirements(uri)) for uri in uris])
+
+    def uris(self):
+        """Returns the URIs to prefetch.
+
+        These are the `Settings.recent_uris` followed by the pinned URIs,
+        excluding the current URI.
+        """
+        pinned = sorted(self.settings.user_pref("pinned_uris", []), key=str.casefold)
+        uris = []
+        for uri in self.settings.recent_uris() + pinned:
+            if uri and uri != self.settings.uri and uri not in uris:
+                uris.append(uri)
+        return uris[: self.max_uris]
@@ -1,15 +1,27 @@
 import datetime
+import json
 import logging
+import os
 import random
+import stat
+import tempfile
 import time
 from contextlib import contextmanager
 from pathlib import Path
 
+import hab.utils
 from Qt import QtCompat, QtCore, QtGui, QtWidgets
 from Qt.QtWidgets import QApplication
 
+from .entry_points.base_init import entry_point_init  # noqa: F401
+
 logger = logging.getLogger(__name__)
 
+# The process umask used to set the permissions of new files created by
+# `save_json`. It can only be read by changing it, so it's read once on import.
+_umask = os.umask(0o022)
+os.umask(_umask)
+
 
 @contextmanager
 def cursor_override(cursor=QtCore.Qt.CursorShape.BusyCursor):
@@ -23,47 +35,6 @@ def cursor_override(cursor=QtCore.Qt.CursorShape.BusyCursor):
         QtWidgets.QApplication.restoreOverrideCursor()
 
 
-def entry_point_init(resolver, cmd, cli_args=None, **kwargs):
-    """Used to apply startup configuration via site config.
-
-    Example of site config replicating the default:
-        {
-            "append": {
-                "entry_points": {
-                    "hab_gui.init": {
-                        "init": "hab_gui.entry_points.message_box:MessageBoxInit"
-                    }
-                }
-            }
-        }
-
-    This uses the site entry_point `hab_gui.init` to initialize a class using
-    the interface defined by `hab_gui.entry_points.BaseInit`. Defaults to
-    `hab_gui.entry_points.message_box:MessageBoxInit` which shows a QMessageBox if
-    any exceptions are raised. This prevents Qt from closing the application due
-    to unhanded exceptions. If you want to disable this entry point default set
-    the object reference to a empty string.
-
-    Example of disabling entry point:
-        {"append": {"entry_points": {"hab_gui.init": {"init": ""}}}}`
-    """
-    if cli_args is None:
-        cli_args = {}
-
-    default = {"init": "hab_gui.entry_points.message_box:MessageBoxInit"}
-
-    # NOTE: kwargs should be added to allow for future changes to this call
-    eps = resolver.site.entry_points_for_group("hab_gui.init", default=default)
-    for ep in eps:
-        if not ep.value:
-            # Passing an empty value disables processing this entry point
-            continue
-
-        # Evaluate the entry point and initialize it
-        func = ep.load()
-        func(resolver, cmd, cli_args=cli_args, **kwargs)
-
-
 def interval(interval, fmt="%H:%M:%S"):
     """Convert interval string to seconds. Uses the `%H:%M:%S` format by default.
     Source: https://stackoverflow.com/a/10663851
@@ -125,37 +96,42 @@ def get_splash_image(resolver):
     to any image or image directory.  Those will be distilled down to a list of
     valid images that can be used by the Hab-Gui SplashScreen class.  This method
     will then randomly choose an image from that list.
+
+    If persistent caches are enabled, the list of images is read from a
+    `hab_gui.disk_cache.SplashIndex` instead of scanning the directories. If the
+    index is missing or out of date, the bundled `habihat.svg` image is returned
+    and the index is re-built on a worker thread for the next launch.
     """
-    resolved_list = splash_paths(resolver)
+    # Imported here to prevent a circular import
+    from . import disk_cache, workers
+
+    if not resolver.site.get("splash_screen"):
+        logger.debug("[Splash Image] No splash_screen paths defined.")
+        return None
+
+    index = disk_cache.SplashIndex(resolver)
+    if index.enabled:
+        resolved_list = index.load()
+        if resolved_list is None:
+            logger.debug("[Splash Image] Index out of date, updating it.")
+            workers.start(workers.Worker(index.rescan))
+            return str(Paths.resource_path("habihat.svg"))
+    else:
+        resolved_list = splash_paths(resolver)
+
     if not resolved_list:
         logger.debug("[Splash Image] No valid paths found to show.")
         return None
     return random.choice(resolved_list)
 
 
-_splash_paths = None
-
-
-def splash_paths(resolver, force=False):
-    """Returns a list of all existing splash screen files found on disk.
-    Uses the "splash_screen" list if defined in `resolver.site`. Any directories
-    defined in this list will be expanded to include their direct children.
-    Any file paths will also be included if they exist.
+def scan_splash_paths(paths):
+    """Returns a list of the image files found in paths.
 
-    The resolved list is cached, pass `force=True` to re-calculate the list.
+    Any directories in paths are expanded to include their direct children.
+    Any file paths will also be included if they exist. Only files with a file
+    extension supported by QImageReader are included.
     """
-    global _splash_paths
-
-    # Return the cached list if it was defined
-    if not force and _splash_paths is not None:
-        return _splash_paths
-
-    paths = resolver.site.get("splash_screen", [])
-    if not paths:
-        # There are no paths to scan, just exit with an empty list
-        _splash_paths = []
-        return _splash_paths
-
     splash_paths = set()
     valid_extentions = set(
         [f".{x.data().decode()}" for x in QtGui.QImageReader.supportedImageFormats()]
@@ -170,7 +146,26 @@ def splash_paths(resolver, force=False):
         elif item.is_file() and item.suffix in valid_extentions:
             splash_paths.add(str(item))
 
-    _splash_paths = list(splash_paths)
+    return list(splash_paths)
+
+
+_splash_paths = None
+
+
+def splash_paths(resolver, force=False):
+    """Returns a list of all existing splash screen files found on disk.
+    Uses the "splash_screen" list if defined in `resolver.site`. See
+    `scan_splash_paths` for details on how the paths are expanded.
+
+    The resolved list is cached, pass `force=True` to re-calculate the list.
+    """
+    global _splash_paths
+
+    # Return the cached list if it was defined
+    if not force and _splash_paths is not None:
+        return _splash_paths
+
+    _splash_paths = scan_splash_paths(resolver.site.get("splash_screen", []))
     return _splash_paths
 
 
@@ -234,6 +229,36 @@ def exec_obj(obj, *args, **kwargs):
     return obj.exec_(*args, **kwargs)
 
 
+def save_json(filename, data, indent=4, cls=hab.utils.HabJsonEncoder):
+    """Save data to filename as json replacing the file atomically.
+
+    The data is written to a temporary file in the same directory, which is then
+    renamed over filename. This ensures that other processes reading the file
+    never see a partially written file. The permissions of an existing file are
+    preserved, new files use the default permissions for the process umask.
+    """
+    filename = Path(filename)
+    fd, temp = tempfile.mkstemp(
+        dir=filename.parent, prefix=f".{filename.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as fle:
+            json.dump(data, fle, indent=indent, cls=cls)
+        if filename.exists():
+            mode = stat.S_IMODE(filename.stat().st_mode)
+        else:
+            # mkstemp only gives the owner access
+            mode = 0o666 & ~_umask
+        os.chmod(temp, mode)
+        os.replace(temp, filename)
+    except BaseException:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
+
+
 def ensure_window_is_visible(widget):
     """
     Checks the widget's geometry against all of the system's screens. If it does
@@ -259,3 +284,24 @@ def ensure_window_is_visible(widget):
             widget.checkScreenGeo = True
         return True
     return False
+
+
+class PaintWatcher(QtCore.QObject):
+    """Calls callback when widget receives its first paint event.
+
+    Args:
+        widget (Qt.QtWidgets.QWidget): The widget to watch.
+        callback (callable): Called with no arguments before the first paint
+            event is processed.
+    """
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):  # noqa: N802
+        if event.type() == QtCore.QEvent.Type.Paint:
+            obj.removeEventFilter(self)
+            self.callback()
+        return False
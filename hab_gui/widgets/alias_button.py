@@ -2,12 +2,17 @@ import logging
 
 from Qt import QtCore, QtWidgets
 
+from ..launch_service import LaunchService
+
 logger = logging.getLogger(__name__)
 
 
 class AliasButton(QtWidgets.QToolButton):
     """Create a QToolButton which will launch a specified alias via a subprocess.
 
+    The alias is launched using the shared `hab_gui.launch_service.LaunchService`.
+    The button is disabled while the alias is launching.
+
     Args:
         cfg (hab.parsers.flat_config.FlatConfig): The config object which contains
         URI related data.
@@ -28,13 +33,45 @@ class AliasButton(QtWidgets.QToolButton):
         )
         self.setSizePolicy(size_policy)
         self.clicked.connect(self._button_action)
+        service = LaunchService.instance()
+        service.launch_started.connect(self._launch_state_changed)
+        service.launch_finished.connect(self._launch_state_changed)
         self.refresh()
 
     def _button_action(self):
         """Launch the alias in a subprocess."""
-        self.cfg.launch(self.alias_name)
+        LaunchService.instance().launch(self.cfg, self.alias_name)
+
+    def _launch_state_changed(self, uri, alias_name, *args):
+        if uri == self.cfg.uri and alias_name == self.alias_name:
+            self.update_launching()
+
+    def set_config(self, cfg, alias_name, refresh=True):
+        """Re-use this button for another config and/or alias name.
+
+        If either has changed, `refresh` is called to update the button.
+
+        Args:
+            refresh (bool, optional): If False, the button isn't refreshed. Use
+                this if the alias is shown the same way by the new config.
+        """
+        if cfg is self.cfg and alias_name == self.alias_name:
+            return
+        self.cfg = cfg
+        self.alias_name = alias_name
+        self.alias_dict = self.cfg.aliases
+        if refresh:
+            self.refresh()
+        else:
+            self.update_launching()
 
     def refresh(self):
         alias = self.alias_dict[self.alias_name]
         label = alias.get("label", self.alias_name)
         self.setText(label)
+        self.update_launching()
+
+    def update_launching(self):
+        """Disable this button while its alias is being launched."""
+        launching = LaunchService.instance().is_launching(self.cfg.uri, self.alias_name)
+        self.setEnabled(not launching)
@@ -2,9 +2,10 @@ import logging
 
 import hab
 from hab.errors import InvalidRequirementError
-from Qt import QtWidgets
+from Qt import QtCore, QtWidgets
 
-from .. import utils
+from .. import utils, workers
+from ..disk_cache import AliasSnapshot, AliasSnapshots
 from .alias_icon_button import AliasIconButton
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,17 @@ class AliasButtonGrid(QtWidgets.QWidget):
     """Create a grid layout to hold buttons that are used to launch alias
     applications.
 
+    If persistent caches are enabled, the aliases shown for each URI are saved
+    using `hab_gui.disk_cache.AliasSnapshots`. When a URI that hasn't been
+    resolved yet is shown, its snapshot is shown immediately while the URI is
+    resolved on a worker thread. Once resolved, only the buttons that changed
+    are updated. Launching an alias from a snapshot waits for the URI to be
+    resolved, see `hab_gui.disk_cache.AliasSnapshot`.
+
+    If the `resolve_mode` is `process`, URIs that haven't been resolved by
+    `Settings.resolve` are resolved using `Settings.process_resolver` and the
+    aliases it returns are shown using a `AliasSnapshot`.
+
     Args:
         settings (hab_gui.settings.Settings): Used to access shared hab settings.
         button_wrap_length (int) Indicates the number of buttons per column/row.
@@ -37,6 +49,22 @@ class AliasButtonGrid(QtWidgets.QWidget):
         self.button_wrap_length = button_wrap_length
         self.button_layout = button_layout
         self.button_cls = button_cls
+        # Incremented every refresh so results of out of date resolves are ignored
+        self._generation = 0
+        self._worker = None
+        self._worker_pool = None
+        # The config or AliasSnapshot currently shown
+        self._cfg = None
+        self.snapshots = AliasSnapshots(settings.resolver)
+        # If the worker's result should be saved using `save_snapshot`
+        self._save_snapshot = False
+        # The buttons currently shown keyed by alias name and their grid coords.
+        self._buttons = {}
+        self._button_coords = {}
+        # Buttons removed from the grid that can be re-used by later refreshes
+        self._button_pool = []
+        # A QLabel used to show status information instead of the buttons
+        self._message = None
 
         self.grid_layout = QtWidgets.QGridLayout(self)
         self.grid_layout.setContentsMargins(0, 0, 0, 0)
@@ -46,38 +74,254 @@ class AliasButtonGrid(QtWidgets.QWidget):
         self.settings.uri_changed.connect(self.refresh)
         self.settings.verbosity_changed.connect(self.refresh)
 
-    def refresh(self):
-        self.clear()
-        if self.settings.uri is None:
+    def _resolve_errored(self, token, error):
+        """Called on the main thread if a worker failed to resolve the URI."""
+        generation, uri = token
+        if generation != self._generation:
             return
-        resolver = self.settings.resolver
-        try:
-            cfg = resolver.resolve(self.settings.uri)
-        except InvalidRequirementError as error:
-            # Show the user that there is a problem with this URI and log the
-            # exception instead of raising it. The user doesn't need to be
-            # confronted with a error dialog, and this is likely being called
-            # from a signal, so raising the exception won't stop code execution.
-            msg = f"Error resolving URI: {self.settings.uri}"
-            label = QtWidgets.QLabel()
-            label.setText(f"{msg}\n\n{error}")
-            label.setWordWrap(True)
-            self.grid_layout.addWidget(label)
-            logger.exception(msg)
+        self._worker = None
+        # Raising the error in a slot wouldn't stop anything, show it instead.
+        # This includes worker processes that crashed.
+        self.show_error(uri, error)
+
+    def _resolve_finished(self, token, cfg):
+        """Called on the main thread once a worker has resolved the URI."""
+        generation, uri = token
+        if generation != self._generation:
+            # The URI was changed while resolving, this result is out of date
+            logger.debug(f"Discarding out of date resolve of {uri}")
+            return
+        self._worker = None
+        self.populate(cfg)
+        if self._save_snapshot:
+            self.save_snapshot(uri, cfg)
+
+    def _release_button(self, alias_name):
+        """Remove the button for alias_name from the grid and add it to the pool."""
+        button = self._buttons.pop(alias_name)
+        del self._button_coords[alias_name]
+        self.grid_layout.removeWidget(button)
+        button.hide()
+        self._button_pool.append(button)
+
+    def _set_message(self, text):
+        """Hide all buttons and show text to the user instead.
+
+        The buttons are kept so they can be re-used by the next `populate` call.
+        """
+        for button in self._buttons.values():
+            button.hide()
+
+        if self._message is None:
+            self._message = QtWidgets.QLabel()
+            self._message.setWordWrap(True)
+            self.grid_layout.addWidget(self._message, 0, 0, 1, -1)
+        self._message.setEnabled(True)
+        self._message.setText(text)
+        return self._message
+
+    def _clear_message(self):
+        """Remove the message shown by `_set_message` if any."""
+        if self._message is None:
             return
+        self.grid_layout.removeWidget(self._message)
+        self._message.deleteLater()
+        self._message = None
 
+    def alias_names(self, cfg):
+        """Returns the sorted names of the aliases of cfg visible at the
+        current verbosity."""
+        resolver = self.settings.resolver
         with hab.utils.verbosity_filter(resolver, self.settings.verbosity):
             alias_list = list(cfg.aliases.keys())
-            # So buttons show up in alphabetical order
-            alias_list.sort()
+        # So buttons show up in alphabetical order
+        alias_list.sort()
+        return alias_list
+
+    def populate(self, cfg):
+        """Show a `button_cls` for each alias of the resolved config in the grid.
+
+        Existing buttons are updated to use cfg instead of being re-created.
+        Buttons for aliases that are no longer shown are hidden and re-used for
+        new aliases. Buttons are only moved if their grid coordinates changed.
+        """
+        self._clear_message()
         button_coords = utils.make_button_coords(
-            alias_list, self.button_wrap_length, self.button_layout
+            self.alias_names(cfg), self.button_wrap_length, self.button_layout
         )
+        # When replacing the snapshot of this URI, only refresh the buttons
+        # whose label or icon changed.
+        snapshot = self._cfg
+        patch = isinstance(snapshot, AliasSnapshot) and snapshot.uri == cfg.uri
+        aliases = cfg.aliases if patch else {}
+        self._cfg = cfg
+
+        for alias_name in list(self._buttons):
+            if alias_name not in button_coords:
+                self._release_button(alias_name)
+
         for button_name, button_coord in button_coords.items():
-            button = self.button_cls(cfg, button_name)
-            self.grid_layout.addWidget(button, button_coord[0], button_coord[1])
+            button_coord = tuple(button_coord)
+            button = self._buttons.get(button_name)
+            if button is not None:
+                refresh = not patch or snapshot.aliases.get(
+                    button_name
+                ) != self.snapshots.display(aliases[button_name])
+                button.set_config(cfg, button_name, refresh=refresh)
+            elif self._button_pool:
+                button = self._button_pool.pop()
+                button.set_config(cfg, button_name)
+            else:
+                button = self.button_cls(cfg, button_name)
+            self._buttons[button_name] = button
+
+            if self._button_coords.get(button_name) != button_coord:
+                self.grid_layout.removeWidget(button)
+                self.grid_layout.addWidget(button, *button_coord)
+                self._button_coords[button_name] = button_coord
+            button.show()
+
+    def refresh(self):
+        # Any resolves already in progress are no longer needed
+        self._generation += 1
+        if self._worker is not None:
+            workers.cancel(self._worker, pool=self._worker_pool)
+            self._worker = None
+
+        if self.settings.uri is None:
+            self.clear()
+            return
+
+        uri = self.settings.uri
+        resolved = self.settings.is_resolved(uri)
+        self._save_snapshot = not resolved
+        if not resolved:
+            # Show the aliases saved the last time uri was resolved, if any
+            snapshot = self.load_snapshot(uri)
+            if snapshot is not None:
+                self.populate(snapshot)
+                self._start_resolve(uri)
+                return
+
+        mode = self.settings.resolve_mode
+        if mode == "thread" or (mode == "process" and not resolved):
+            self.show_resolving(uri)
+            self._start_resolve(uri)
+            return
+
+        try:
+            cfg = self.settings.resolve(uri)
+        except InvalidRequirementError as error:
+            self.show_error(uri, error)
+            return
+        except Exception:
+            # Don't leave the buttons for the previous URI visible
+            self.clear()
+            raise
+        self.populate(cfg)
+        if not resolved:
+            self.save_snapshot(uri, cfg)
+
+    def _resolve_in_process(self, uri, verbosity, forced_requirements):
+        """Resolve uri using `Settings.process_resolver` returning a `AliasSnapshot`.
+
+        This is called on a worker thread that waits for the worker process.
+        """
+        payload = self.settings.process_resolver.resolve(
+            uri, verbosity, forced_requirements
+        )
+        return AliasSnapshot(
+            payload["uri"],
+            payload["aliases"],
+            self.settings.resolve,
+            files=payload["files"],
+        )
+
+    def _start_resolve(self, uri):
+        """Resolve uri on a worker thread calling `populate` once finished."""
+        if self.settings.resolve_mode == "process":
+            with self.settings.resolve_lock:
+                forced = list(self.settings.resolver.forced_requirements.values())
+            func = self._resolve_in_process
+            args = (uri, self.settings.verbosity, forced)
+            # The thread only waits for the worker process
+            self._worker_pool = QtCore.QThreadPool.globalInstance()
+        else:
+            func = self.settings.resolve
+            args = (uri,)
+            self._worker_pool = workers.resolve_pool()
+        self._worker = workers.Worker(
+            func, *args, token=(self._generation, uri), parent=self
+        )
+        self._worker.signals.finished.connect(self._resolve_finished)
+        self._worker.signals.errored.connect(self._resolve_errored)
+        workers.start(self._worker, pool=self._worker_pool)
+
+    def load_snapshot(self, uri):
+        """Returns a `AliasSnapshot` of the aliases saved for uri or None."""
+        if not self.snapshots.enabled:
+            return None
+        with self.settings.resolve_lock:
+            # The resolver's forced_requirements are modified while resolving
+            filename = self.snapshots.filename(uri, self.settings.verbosity)
+        data = self.snapshots.load(filename, uri)
+        if data is None:
+            return None
+        logger.debug(f"Showing the alias snapshot of {uri} while resolving.")
+        return AliasSnapshot(uri, data["aliases"], self.settings.resolve)
+
+    def save_snapshot(self, uri, cfg):
+        """Save the visible aliases of the resolved config cfg for uri.
+
+        The snapshot is written on a worker thread if it has changed.
+        """
+        if not self.snapshots.enabled:
+            return
+        if isinstance(cfg, AliasSnapshot):
+            # Resolved by a worker process, only the visible aliases are known
+            aliases = cfg.aliases
+            filenames = cfg.files
+        else:
+            resolver = self.settings.resolver
+            with hab.utils.verbosity_filter(resolver, self.settings.verbosity):
+                aliases = cfg.aliases
+            filenames = self.settings.config_filenames(cfg)
+        with self.settings.resolve_lock:
+            filename = self.snapshots.filename(uri, self.settings.verbosity)
+        worker = workers.Worker(
+            self.snapshots.save,
+            filename,
+            uri,
+            aliases,
+            filenames,
+            parent=self,
+        )
+        workers.start(worker)
+
+    def show_error(self, uri, error):
+        """Show the user that there is a problem with this URI and log the
+        exception instead of raising it. The user doesn't need to be
+        confronted with a error dialog, and this is likely being called
+        from a signal, so raising the exception won't stop code execution.
+        """
+        msg = f"Error resolving URI: {uri}"
+        self._set_message(f"{msg}\n\n{error}")
+        logger.error(msg, exc_info=error)
+
+    def show_resolving(self, uri):
+        """Show a placeholder while the URI is resolved by a worker thread."""
+        self._set_message(f"Resolving {uri}\u2026").setEnabled(False)
 
     def clear(self):
+        """Remove and delete all widgets including any buttons kept for re-use."""
+        self._cfg = None
+        self._buttons.clear()
+        self._button_coords.clear()
+        self._message = None
+        for button in self._button_pool:
+            button.deleteLater()
+        self._button_pool = []
+
         while self.grid_layout.count():
             item = self.grid_layout.takeAt(0)
             widget = item.widget()
@@ -1,8 +1,8 @@
 import logging
-import os
 
-from Qt import QtCore, QtGui
+from Qt import QtCore
 
+from ..icon_cache import IconCache
 from .alias_button import AliasButton
 
 logger = logging.getLogger(__name__)
@@ -11,6 +11,10 @@ logger = logging.getLogger(__name__)
 class AliasIconButton(AliasButton):
     """Create a AliasButton that also shows a icon for each alias.
 
+    Icons are loaded using the shared `hab_gui.icon_cache.IconCache`. If the
+    icon has not been loaded yet, a transparent placeholder is shown until it
+    has finished loading.
+
     Args:
         cfg (hab.parsers.flat_config.FlatConfig): The config object which contains
         URI related data.
@@ -21,19 +25,23 @@ class AliasIconButton(AliasButton):
     button_pressed = QtCore.Signal(str)
 
     def __init__(self, *args, **kwargs):
+        self.icon_path = ""
         super().__init__(*args, **kwargs)
         self.setToolButtonStyle(QtCore.Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
+        IconCache.instance().icon_loaded.connect(self._icon_loaded)
+
+    def _icon_loaded(self, path):
+        if path == self.icon_path:
+            self.setIcon(self.load_icon())
+
+    def load_icon(self):
+        """Returns the QIcon to show for `icon_path`."""
+        size = self.iconSize() * self.devicePixelRatioF()
+        return IconCache.instance().icon(self.icon_path, size)
 
     def refresh(self):
         alias = self.alias_dict[self.alias_name]
-        icon = QtGui.QIcon()
-        icon_path = alias.get("icon", "")
-        if os.path.exists(icon_path):
-            icon.addPixmap(QtGui.QPixmap(icon_path))
-        elif icon_path:
-            logger.debug(
-                f"The specified icon file {icon_path} does not exist for {self.alias_dict}"
-            )
-        self.setIcon(icon)
+        self.icon_path = alias.get("icon", "")
+        self.setIcon(self.load_icon())
 
         super().refresh()
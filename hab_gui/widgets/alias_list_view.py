@@ -0,0 +1,298 @@
+import logging
+
+from Qt import QtCore, QtWidgets
+
+from ..icon_cache import IconCache
+from ..launch_service import LaunchService
+from ..models.alias_model import AliasModel
+from .alias_button_grid import AliasButtonGrid
+from .alias_icon_button import AliasIconButton
+
+logger = logging.getLogger(__name__)
+
+
+class AliasItemDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints the aliases of a `AliasModel` so they look like `AliasIconButton`s.
+
+    Args:
+        parent (AliasView): The view this delegate is used by.
+    """
+
+    def _button_option(self, option, index, load_icon=True):
+        """Returns a QStyleOptionToolButton used to draw or size index.
+
+        Args:
+            load_icon (bool, optional): Set the icon using `IconCache`. If the
+                icon isn't needed this prevents loading it.
+        """
+        view = self.parent()
+        button = QtWidgets.QStyleOptionToolButton()
+        button.initFrom(view)
+        button.rect = option.rect
+        button.state = QtWidgets.QStyle.StateFlag.State_Raised
+        if index.flags() & QtCore.Qt.ItemFlag.ItemIsEnabled:
+            button.state |= QtWidgets.QStyle.StateFlag.State_Enabled
+            if option.state & QtWidgets.QStyle.StateFlag.State_MouseOver:
+                button.state |= QtWidgets.QStyle.StateFlag.State_MouseOver
+            if index == view.pressed_index:
+                button.state |= QtWidgets.QStyle.StateFlag.State_Sunken
+        button.subControls = QtWidgets.QStyle.SubControl.SC_ToolButton
+        button.toolButtonStyle = QtCore.Qt.ToolButtonStyle.ToolButtonTextBesideIcon
+        button.text = index.data()
+        button.iconSize = view.iconSize()
+        icon_path = index.data(AliasModel.IconPathRole)
+        if icon_path and load_icon:
+            size = view.iconSize() * view.devicePixelRatioF()
+            button.icon = IconCache.instance().icon(icon_path, size)
+        return button
+
+    def button_size(self, option, index):
+        """Returns the minimum size needed to show index like `QToolButton.sizeHint`."""
+        view = self.parent()
+        # Only the visible icons should be loaded
+        button = self._button_option(option, index, load_icon=False)
+        metrics = view.fontMetrics()
+        size = metrics.size(QtCore.Qt.TextFlag.TextShowMnemonic, button.text)
+        if index.data(AliasModel.IconPathRole):
+            size.setWidth(size.width() + button.iconSize.width() + 4)
+            size.setHeight(max(size.height(), button.iconSize.height()))
+        return view.style().sizeFromContents(
+            QtWidgets.QStyle.ContentsType.CT_ToolButton, button, size, view
+        )
+
+    def paint(self, painter, option, index):
+        if index.data(AliasModel.AliasNameRole) is None:
+            # Don't draw the empty grid cells
+            return
+        view = self.parent()
+        button = self._button_option(option, index)
+        view.style().drawComplexControl(
+            QtWidgets.QStyle.ComplexControl.CC_ToolButton, button, painter, view
+        )
+
+    def sizeHint(self, option, index):  # noqa: N802
+        # Fill the grid cell so all aliases have the same size
+        return self.parent().cell_size()
+
+
+class AliasView(QtWidgets.QListView):
+    """A QListView showing the aliases of a `AliasModel` in a grid.
+
+    Each row of the grid shows `AliasModel.columns` items. Like a QGridLayout,
+    the items are stretched to fill the width of the view, but never narrower
+    than the widest alias. Only the visible items are painted.
+
+    Args:
+        parent (Qt.QtWidgets.QWidget, optional): Define a parent for this widget.
+    """
+
+    min_rows = 4
+    """Show at least this many rows of aliases before scrolling is required."""
+
+    spacing = 2
+    """The number of pixels between aliases."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pressed_index = QtCore.QPersistentModelIndex()
+        self._min_cell = QtCore.QSize()
+
+        self.setViewMode(QtWidgets.QListView.ViewMode.IconMode)
+        self.setMovement(QtWidgets.QListView.Movement.Static)
+        self.setFlow(QtWidgets.QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QtWidgets.QListView.ResizeMode.Adjust)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        # Draw the background like a regular widget
+        self.viewport().setAutoFillBackground(False)
+        self.setMouseTracking(True)
+        size = self.style().pixelMetric(QtWidgets.QStyle.PixelMetric.PM_ButtonIconSize)
+        self.setIconSize(QtCore.QSize(size, size))
+        self.setItemDelegate(AliasItemDelegate(self))
+
+    def cell_size(self):
+        """Returns the size used to draw each alias."""
+        size = self.gridSize()
+        if not size.isValid():
+            return self._min_cell
+        return size - QtCore.QSize(self.spacing, self.spacing)
+
+    def columns(self):
+        model = self.model()
+        return max(model.columns, 1) if model is not None else 1
+
+    def layout_width(self):
+        """Returns the width QListView wraps items at.
+
+        When the vertical scroll bar is shown as needed, QListView always
+        reserves space for it so showing it doesn't change the layout.
+        """
+        width = self.maximumViewportSize().width() - 1
+        if (
+            self.verticalScrollBarPolicy()
+            == QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded
+        ):
+            style = self.style()
+            width -= style.pixelMetric(
+                QtWidgets.QStyle.PixelMetric.PM_ScrollBarExtent,
+                None,
+                self.verticalScrollBar(),
+            )
+            option = QtWidgets.QStyleOption()
+            option.initFrom(self)
+            if style.styleHint(
+                QtWidgets.QStyle.StyleHint.SH_ScrollView_FrameOnlyAroundContents,
+                option,
+                self,
+            ):
+                width -= (
+                    style.pixelMetric(
+                        QtWidgets.QStyle.PixelMetric.PM_DefaultFrameWidth, option
+                    )
+                    * 2
+                )
+        return width
+
+    def minimumSizeHint(self):  # noqa: N802
+        return self._size_for_rows(self.min_rows)
+
+    def _size_for_rows(self, rows):
+        """Returns the size required to show up to rows rows of aliases."""
+        margins = self.contentsMargins()
+        width = self.columns() * (self._min_cell.width() + self.spacing)
+        # Include the space QListView reserves for the scroll bar
+        width += self.maximumViewportSize().width() - self.layout_width()
+        model = self.model()
+        if model is not None:
+            rows = min(rows, -(-model.rowCount() // self.columns()))
+        height = max(rows, 1) * (self._min_cell.height() + self.spacing)
+        return QtCore.QSize(
+            width + margins.left() + margins.right(),
+            height + margins.top() + margins.bottom(),
+        )
+
+    def mousePressEvent(self, event):  # noqa: N802
+        self.pressed_index = QtCore.QPersistentModelIndex(self.indexAt(event.pos()))
+        self.viewport().update()
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):  # noqa: N802
+        super().mouseReleaseEvent(event)
+        self.pressed_index = QtCore.QPersistentModelIndex()
+        self.viewport().update()
+
+    def resizeEvent(self, event):  # noqa: N802
+        super().resizeEvent(event)
+        self.update_grid()
+
+    def sizeHint(self):  # noqa: N802
+        model = self.model()
+        return self._size_for_rows(model.rowCount() if model is not None else 1)
+
+    def update_grid(self, recalculate=False):
+        """Update the grid size so `columns` aliases fill the width of the view.
+
+        Args:
+            recalculate (bool, optional): Re-calculate the minimum alias size,
+                this should be done when the model has changed.
+        """
+        model = self.model()
+        if model is None:
+            return
+
+        if recalculate or not self._min_cell.isValid():
+            option = QtWidgets.QStyleOptionViewItem()
+            option.initFrom(self)
+            delegate = self.itemDelegate()
+            min_cell = QtCore.QSize(0, 0)
+            for row in range(model.rowCount()):
+                index = model.index(row)
+                if index.data(AliasModel.AliasNameRole) is None:
+                    continue
+                min_cell = min_cell.expandedTo(delegate.button_size(option, index))
+            self._min_cell = min_cell
+            self.updateGeometry()
+
+        width = max(
+            self.layout_width() // self.columns(),
+            self._min_cell.width() + self.spacing,
+        )
+        size = QtCore.QSize(width, self._min_cell.height() + self.spacing)
+        if size != self.gridSize():
+            self.setGridSize(size)
+
+
+class AliasListView(AliasButtonGrid):
+    """Shows the aliases of the current URI using a virtualized `AliasView`.
+
+    Unlike `AliasButtonGrid` this doesn't create a widget for each alias, only
+    the visible aliases are painted. This is useful for URIs that have hundreds
+    of aliases. The aliases are arranged using `button_wrap_length` and
+    `button_layout` the same way as `AliasButtonGrid`.
+
+    Args:
+        settings (hab_gui.settings.Settings): Used to access shared hab settings.
+        button_wrap_length (int) Indicates the number of buttons per column/row.
+        button_layout (int) Sets the button layout to be either a horizontal focus
+            or a vertical focus.
+        button_cls (QToolButton, optional): Ignored, the aliases are painted by
+            `AliasItemDelegate` instead of using widgets.
+        parent (Qt.QtWidgets.QWidget, optional): Define a parent for this widget.
+    """
+
+    def __init__(
+        self,
+        settings,
+        button_wrap_length,
+        button_layout,
+        button_cls=AliasIconButton,
+        parent=None,
+    ):
+        super().__init__(
+            settings,
+            button_wrap_length,
+            button_layout,
+            button_cls=button_cls,
+            parent=parent,
+        )
+        self.model = AliasModel(self)
+        self.view = AliasView(self)
+        self.view.setModel(self.model)
+        self.view.clicked.connect(self._launch)
+        self.grid_layout.addWidget(self.view, 0, 0)
+
+    def _clear_message(self):
+        super()._clear_message()
+        self.view.show()
+
+    def _launch(self, index):
+        """Launch the alias shown by index."""
+        if not index.flags() & QtCore.Qt.ItemFlag.ItemIsEnabled:
+            return
+        alias_name = index.data(AliasModel.AliasNameRole)
+        LaunchService.instance().launch(self.model.cfg, alias_name)
+
+    def _set_message(self, text):
+        self.view.hide()
+        return super()._set_message(text)
+
+    def clear(self):
+        """Remove all aliases and any message shown."""
+        self._cfg = None
+        self._clear_message()
+        self.model.clear()
+        self.view.update_grid(recalculate=True)
+
+    def populate(self, cfg):
+        """Show the aliases of the resolved config cfg."""
+        self._clear_message()
+        # Track the shown config like `AliasButtonGrid.populate` does
+        self._cfg = cfg
+        self.model.set_aliases(
+            cfg, self.alias_names(cfg), self.button_wrap_length, self.button_layout
+        )
+        self.view.update_grid(recalculate=True)
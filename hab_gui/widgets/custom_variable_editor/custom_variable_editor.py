@@ -1,10 +1,11 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from Qt import QtCore, QtWidgets
 
 from ... import utils
-from .file_tree_widget_item import FileTreeWidgetItem
-from .variable_tree_widget_item import VariableTreeWidgetItem
+from ...disk_cache import VariableEditorIndex
+from ...models.variable_model import FileEntry, VariableModel
 
 logger = logging.getLogger(__name__)
 
@@ -13,17 +14,28 @@ class CustomVariableEditor(QtWidgets.QWidget):
     """A widget that can view and edit custom variables in hab configs/distros.
 
     This widget will only show config/distro files that have `variable_editor`
-    set to `True` in the top level dict.
+    set to `True` in the top level dict. The files are shown using a
+    `hab_gui.models.variable_model.VariableModel` which only creates the rows
+    for a file's variables once it's expanded.
 
     Args:
         settings (hab_gui.settings.Settings): Used to access shared hab settings.
         parent (Qt.QtWidgets.QWidget, optional): Define a parent for this widget.
     """
 
+    expand_limit = 50
+    """Expand all files when refreshed if there are this many files or fewer."""
+
+    width_samples = 100
+    """The number of files checked when estimating the width of the name column."""
+
     def __init__(self, settings, parent=None):
         super().__init__(parent)
         self._refresh_on_show = True
         self.settings = settings
+        self.index = VariableEditorIndex(self.settings.resolver)
+        # The files that have been saved by this widget
+        self.saved_filenames = set()
         utils.load_ui(__file__, self)
 
         self.uiAddVariableBTN.setIcon(utils.Paths.icon("plus-thick.svg"))
@@ -32,80 +44,70 @@ class CustomVariableEditor(QtWidgets.QWidget):
         self.uiRemoveVariableBTN.setIcon(utils.Paths.icon("minus-thick.svg"))
         self.uiSaveBTN.setIcon(utils.Paths.icon("content-save.svg"))
 
-        # Configure editing of widget items. _is_refreshing is used to only
-        # prevent updating the model while refreshing, not other signals.
-        self._is_refreshing = False
-        self.uiVariableTREE.model().dataChanged.connect(self.editing_finished)
+        self.model = VariableModel(self)
+        self.uiVariableTREE.setModel(self.model)
+        self.uiVariableTREE.selectionModel().currentChanged.connect(
+            self.current_changed
+        )
 
     def add_variable(self):
-        """Add a new variable to the selected FileTreeWidgetItem"""
-        item = self.uiVariableTREE.currentItem()
-        if "Undefined" in item.parser.variables:
+        """Add a new variable to the selected file."""
+        index = self.uiVariableTREE.currentIndex()
+        if not self.model.is_file(index):
+            return
+        if not self.model.add_variable(index.row()):
             QtWidgets.QMessageBox.information(
                 self,
                 "Variable already defined",
                 "You already have a variable named Undefined. Change the name "
                 "of that variable before adding a new one.",
             )
-        else:
-            item.parser.variables["Undefined"] = "Undefined"
-            VariableTreeWidgetItem(item, "Undefined")
-            # Mark the item as dirty
-            item.dirty = True
+            return
+        self.uiVariableTREE.expand(index)
 
     @property
     def dirty(self):
-        """Generator that yields any FileTreeWidgetItem's that are modified."""
-        for index in range(self.uiVariableTREE.topLevelItemCount()):
-            child = self.uiVariableTREE.topLevelItem(index)
-            if child.dirty:
-                yield child
+        """Generator that yields the FileEntry of any files that are modified."""
+        for row in self.model.dirty:
+            yield self.model.files[row]
 
     def edit_cell(self):
         """Edit the currently selected cell"""
         index = self.uiVariableTREE.currentIndex()
         self.uiVariableTREE.edit(index)
 
-    def editing_finished(self, top_left, bottom_right, roles):
-        if self._is_refreshing:
-            return
-
-        if QtCore.Qt.ItemDataRole.EditRole in roles:
-            item = self.uiVariableTREE.itemFromIndex(top_left)
-            column = top_left.column()
-            if column == 0:
-                item.variable_name = item.text(column)
-            elif column == 1:
-                item.value = item.text(column)
-
     def current_changed(self, current=None, previous=None):
         """Enable buttons based on the current selection."""
-        item = self.uiVariableTREE.currentItem()
-        is_file = isinstance(item, FileTreeWidgetItem)
+        index = self.uiVariableTREE.currentIndex()
+        is_file = self.model.is_file(index)
+        is_variable = bool(self.model.flags(index) & QtCore.Qt.ItemFlag.ItemIsEditable)
         self.uiAddVariableBTN.setEnabled(is_file)
-        self.uiEditCurrentItemBTN.setEnabled(not is_file)
-        self.uiRemoveVariableBTN.setEnabled(not is_file)
+        self.uiEditCurrentItemBTN.setEnabled(is_variable)
+        self.uiRemoveVariableBTN.setEnabled(is_variable)
 
     @utils.cursor_override()
     def refresh(self):
-        self._is_refreshing = True
         resolver = self.settings.resolver
-        try:
-            self.uiVariableTREE.clear()
-
+        parsers = []
+        # Workers may be resolving or prefetching using the resolver
+        with self.settings.resolve_lock:
             for forest in (resolver.configs, resolver.distros):
                 for row in resolver.dump_forest(forest, attr=None):
-                    parser = row.node
-                    if parser.filename:
-                        if parser.load(parser.filename).get("variable_editor", False):
-                            FileTreeWidgetItem(self.uiVariableTREE, parser)
+                    if row.node.filename:
+                        parsers.append(row.node)
 
+        # Use the index to check which files opt in to the variable editor
+        flags = self.index.flags(parser.filename for parser in parsers)
+        parsers = [parser for parser in parsers if flags[str(parser.filename)]]
+        self.model.set_parsers(parsers)
+
+        # Expanding creates the rows for every variable, only do it if there
+        # aren't many files.
+        if len(parsers) <= self.expand_limit:
             self.uiVariableTREE.expandAll()
-            self.uiVariableTREE.resizeColumnToContents(0)
+        self.resize_name_column()
 
-            self.current_changed()
-        finally:
-            self._is_refreshing = False
+        self.current_changed()
 
     @property
     def refresh_on_show(self):
@@ -118,25 +120,62 @@ class CustomVariableEditor(QtWidgets.QWidget):
 
     def remove_variable(self):
         """Remove the currently selected variable"""
-        item = self.uiVariableTREE.currentItem()
-        item.remove_variable()
-        parent = item.parent()
-        idx = parent.indexOfChild(item)
-        parent.takeChild(idx)
-        parent.dirty = True
+        index = self.uiVariableTREE.currentIndex()
+        if self.model.flags(index) & QtCore.Qt.ItemFlag.ItemIsEditable:
+            self.model.remove_variable(index)
+
+    def resize_name_column(self):
+        """Resize the name column to fit an estimate of the widest name.
+
+        Only the names of `width_samples` files spread evenly through the model
+        and the first few variable names of each are measured.
+        """
+        view = self.uiVariableTREE
+        metrics = view.fontMetrics()
+        files = self.model.files
+        step = max(1, len(files) // self.width_samples)
+        file_width = 0
+        variable_width = metrics.horizontalAdvance("Filename")
+        for entry in files[::step]:
+            # Include the `*` shown when the file is modified
+            name = f"{entry.parser.name}*"
+            file_width = max(file_width, metrics.horizontalAdvance(name))
+            for variable_name in list(entry.parser.variables)[:10]:
+                width = metrics.horizontalAdvance(variable_name)
+                variable_width = max(variable_width, width)
+
+        # Account for the indentation of each level and some padding
+        indent = view.indentation()
+        width = max(file_width + indent, variable_width + indent * 2)
+        view.header().resizeSection(0, width + metrics.horizontalAdvance("  "))
 
     def reset(self):
         """Revert any un-saved changes."""
-        self.settings.resolver.clear_caches()
+        self.settings.clear_caches()
         self.refresh()
 
     def save(self):
-        """Save all changes to disk"""
-        for parser in self.dirty:
-            parser.save()
+        """Save all changes to disk.
+
+        The modified files are saved concurrently and only those files are
+        re-loaded. Any configs resolved from them are removed from the settings
+        resolve cache. The saved files are added to `saved_filenames`.
+        """
+        rows = list(self.model.dirty)
+        if not rows:
+            return
+
+        entries = [self.model.files[row] for row in rows]
+        with ThreadPoolExecutor(max_workers=len(entries)) as executor:
+            list(executor.map(FileEntry.save, entries))
 
         # Re-display the saved data
-        self.reset()
+        filenames = {str(entry.parser.filename) for entry in entries}
+        with self.settings.resolve_lock:
+            for row in rows:
+                self.model.reload(row)
+        self.saved_filenames.update(filenames)
+        self.settings.invalidate_files(filenames)
 
     def showEvent(self, event):  # noqa: N802
         super().showEvent(event)
@@ -3,9 +3,10 @@ import logging
 from hab.errors import InvalidRequirementError
 from hab.solvers import Solver
 from hab.utils import NotSet
-from Qt.QtCore import QTimer
+from Qt.QtCore import QThreadPool, QTimer
 
-from .. import utils
+from .. import utils, workers
+from ..resolve_prefetcher import ResolvePrefetcher
 from .name_picker import NamePicker
 
 logger = logging.getLogger(__name__)
@@ -17,6 +18,17 @@ class DistroPicker(NamePicker):
     This displays the `optional_distros` config setting. Any distros checked use
     `hab.Resolver.forced_requirements` to load those distros. See the cli argument
     `--requirement` for more info.
+
+    While idle, the configs the user would get by toggling each optional distro
+    are resolved in the background using a `ResolvePrefetcher`, so toggling a
+    distro can use the already resolved config. Toggling a distro postpones any
+    queued prefetches, but has to wait for a prefetch resolve that already
+    started to finish.
+
+    Unless the `resolve_mode` is `sync`, the URI is resolved on a worker thread
+    or process to find its optional distros so the gui isn't blocked. Until it
+    has finished, the distros saved in the user_prefs for the URI are used. If
+    the resolved defaults require different distros, the aliases are refreshed.
     """
 
     pref_name = "distro_picker"
@@ -26,27 +38,72 @@ class DistroPicker(NamePicker):
         # This widget needs to update the hab resolver before other widgets
         # are updated. This signal is used to update forced_requirements.
         self.settings.uri_changing.connect(self.refresh)
+        self.prefetcher = ResolvePrefetcher(settings, parent=self)
+        # Incremented every refresh so results of out of date resolves are ignored
+        self._generation = 0
+        self._worker = None
+        self._worker_pool = None
+
+    def _resolve_errored(self, token, error):
+        """Called on the main thread if a worker failed to resolve the URI."""
+        generation, uri, forced_requirements = token
+        if generation != self._generation:
+            return
+        logger.info(f"Error resolving URI: {uri}", exc_info=error)
+        self._resolve_finished(token, {})
+
+    def _resolve_finished(self, token, optional):
+        """Called on the main thread with the optional distros of the URI."""
+        generation, uri, forced_requirements = token
+        if generation != self._generation:
+            return
+        self._worker = None
+        self.set_optional_distros(uri, optional)
+        current = self.forced_requirements(self.selected())
+        if self._requirements_key(current) != self._requirements_key(
+            forced_requirements
+        ):
+            # The aliases were resolved using the wrong distros, refresh them
+            self.uri_changed()
+
+    @classmethod
+    def _requirements_key(cls, forced_requirements):
+        return sorted(str(req) for req in forced_requirements.values())
+
+    def _optional_distros(self, uri, forced_requirements):
+        """Resolve uri on a worker thread returning its optional distros."""
+        if self.settings.resolve_mode == "process":
+            payload = self.settings.process_resolver.resolve(
+                uri, self.settings.verbosity, forced_requirements.values()
+            )
+            return payload["optional_distros"]
+        cfg = self.settings.resolve(uri, forced_requirements=forced_requirements)
+        return cfg.optional_distros
 
     def item_changed(self, item, column):
         """Called when a item is modified, saves the user prefs when a checked
         state is updated and updates the displayed aliases."""
         super().item_changed(item, column)
+        # Don't let queued prefetches start before the aliases are resolved
+        ResolvePrefetcher.postpone_all(self.settings)
         # Ensure the UI is updated with the new forced_requirements
         self.update_requirements()
         QTimer.singleShot(0, self.uri_changed)
+        self.prefetch(self.settings.uri)
 
     def reset_to_default(self):
         """Reset the checked state of names to the default values, clearing
         saved user_prefs for the current URI.
         """
         super().reset_to_default()
+        ResolvePrefetcher.postpone_all(self.settings)
         # Refresh the alias button widget
         self.update_requirements()
         self.uri_changed()
+        self.prefetch(self.settings.uri)
 
-    def update_requirements(self):
-        # Ensure the UI is updated with the new forced_requirements
-        selected = self.selected()
+    def forced_requirements(self, selected):
+        """Returns the resolver forced_requirements to use for selected distros."""
         forced_requirements = Solver.simplify_requirements(list(selected))
 
         # Preserve any requirements passed via the cli.
@@ -54,8 +111,26 @@ class DistroPicker(NamePicker):
         if cli_reqs:
             # If the same distro is specified, the GUI's requirement should win.
             forced_requirements = dict(cli_reqs, **forced_requirements)
+        return forced_requirements
 
-        self.settings.resolver.forced_requirements = forced_requirements
+    def prefetch(self, uri):
+        """Resolve the configs for uri reached by toggling each optional distro
+        in the background. Any previous prefetching is cancelled."""
+        selected = self.selected()
+        self.prefetcher.prefetch(
+            [
+                (uri, self.forced_requirements(selected ^ {name}))
+                for name in self.names()
+            ]
+        )
+
+    def update_requirements(self):
+        # Ensure the UI is updated with the new forced_requirements
+        forced_requirements = self.forced_requirements(self.selected())
+
+        # Don't change the requirements while a worker thread is resolving
+        with self.settings.resolve_lock:
+            self.settings.resolver.forced_requirements = forced_requirements
 
     def uri_changed(self):
         """Work function that forces the gui to update its aliases."""
@@ -66,9 +141,17 @@ class DistroPicker(NamePicker):
             self.settings.uri_changed.emit(self.settings.uri)
 
     def refresh(self, uri):
-        resolver = self.settings.resolver
+        self._generation += 1
+        if self._worker is not None:
+            workers.cancel(self._worker, pool=self._worker_pool)
+            self._worker = None
+
+        if self.settings.resolve_mode != "sync":
+            self._start_resolve(uri)
+            return
+
         try:
-            cfg = resolver.resolve(uri)
+            cfg = self.settings.resolve(uri)
         except InvalidRequirementError:
             # The hab config is invalid. Handle this by clearing the name_tree
             # and just log the error, instead of raising the error to the user.
@@ -76,6 +159,10 @@ class DistroPicker(NamePicker):
             optional = {}
         else:
             optional = cfg.optional_distros
+        self.set_optional_distros(uri, optional)
+
+    def set_optional_distros(self, uri, optional):
+        """Show the optional distros of uri and update the forced_requirements."""
         if optional is NotSet:
             optional = {}
         self.set_names(optional, uri=uri)
@@ -83,3 +170,32 @@ class DistroPicker(NamePicker):
         # Ensure the alias_buttons widget has the updated requirements before
         # it refreshes from the `uri_changed` signal emited later.
         self.update_requirements()
+        self.prefetch(uri)
+
+    def _start_resolve(self, uri):
+        """Find the optional distros of uri without blocking the gui.
+
+        Until they are known, the aliases are resolved using the distros
+        saved in the user_prefs for uri.
+        """
+        self.set_names({}, uri=uri)
+        self.prefetcher.cancel()
+        forced_requirements = self.forced_requirements(self.user_selection(uri) or ())
+        with self.settings.resolve_lock:
+            self.settings.resolver.forced_requirements = forced_requirements
+
+        if self.settings.resolve_mode == "process":
+            # The thread only waits for the worker process
+            self._worker_pool = QThreadPool.globalInstance()
+        else:
+            self._worker_pool = workers.resolve_pool()
+        self._worker = workers.Worker(
+            self._optional_distros,
+            uri,
+            forced_requirements,
+            token=(self._generation, uri, forced_requirements),
+            parent=self,
+        )
+        self._worker.signals.finished.connect(self._resolve_finished)
+        self._worker.signals.errored.connect(self._resolve_errored)
+        workers.start(self._worker, pool=self._worker_pool)
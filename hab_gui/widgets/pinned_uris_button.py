@@ -89,22 +89,12 @@ class PinnedUriButton(QtWidgets.QToolButton):
         that if prefs are enabled. Returns `set()` otherwise. This will call load
         to ensure the preference file has been loaded.
         """
-        prefs = self.settings.resolver.user_prefs()
-        if prefs.enabled:
-            # Ensure the preferences are loaded.
-            prefs.load()
-            return set(prefs.get("pinned_uris", []))
-        return set()
+        return set(self.settings.user_pref("pinned_uris", []))
 
     def set_uris(self, uris):
         """Saves URIS to pinned_uris in user_prefs. It will only do that if prefs
         are enabled. This will call load to ensure the preference file has been loaded.
         """
-        prefs = self.settings.resolver.user_prefs()
-        if prefs.enabled:
-            # Ensure the preferences are loaded.
-            prefs.load()
-
-            prefs["pinned_uris"] = sorted(uris, key=str.casefold)
-            prefs.save()
-            logger.debug(f"Pinned URI's saved {prefs.filename}")
+        uris = sorted(uris, key=str.casefold)
+        if self.settings.set_user_pref("pinned_uris", uris):
+            logger.debug("Pinned URI's updated.")
@@ -1,30 +1,126 @@
-from Qt import QtGui, QtWidgets
+from Qt import QtCore, QtGui, QtWidgets
 
 
 class SplashScreen(QtWidgets.QSplashScreen):
     """A widget that provides a QSplashScreen that can be used for long
     load times.  This subclass can use both static and animated images.
 
+    Large images are scaled down while they are decoded to fit inside
+    `screen_fraction` of the primary screen so large animated images don't use
+    excessive memory. The decoded frames are only cached if they fit inside
+    `max_cache_bytes`, otherwise only the current frame is kept in memory. The
+    mask of each frame with transparency is only calculated once. The movie
+    is released once `finish` is called.
+
     Args:
         path_to_image (string): The full filepath to an image.
     """
 
+    screen_fraction = 0.5
+    """Images larger than this fraction of the primary screen are scaled down."""
+
+    max_cache_bytes = 32 * 1024 * 1024
+    """Cache the decoded frames of animated images if they fit in this many bytes."""
+
     def __init__(self, path_to_image: str):
         # QMovie can be used for both animated and static images
         self.movie = QtGui.QMovie(path_to_image)
+        # Read the image size without decoding it so the frames can be
+        # decoded at the scaled size.
+        size = QtGui.QImageReader(path_to_image).size()
+        max_size = self.max_size()
+        if (
+            size.isValid()
+            and max_size is not None
+            and (size.width() > max_size.width() or size.height() > max_size.height())
+        ):
+            size = size.scaled(max_size, QtCore.Qt.AspectRatioMode.KeepAspectRatio)
+            self.movie.setScaledSize(size)
+        self.movie.setCacheMode(self.cache_mode(size, self.movie.frameCount()))
         self.movie.jumpToFrame(0)
-        pixmap = QtGui.QPixmap(self.movie.frameRect().size())
-        QtWidgets.QSplashScreen.__init__(self, pixmap)
-        self.movie.frameChanged.connect(self.repaint)
+        self._pixmap = self.movie.currentPixmap()
+        # The mask region of each frame with transparency, see `_update_mask`
+        self._masks = {}
+        # The mask region currently applied, None if not masked
+        self._mask = None
+
+        QtWidgets.QSplashScreen.__init__(self, QtGui.QPixmap(self._pixmap.size()))
+        self._update_mask(0)
+        self.movie.frameChanged.connect(self._frame_changed)
+
+    def _frame_changed(self, frame):
+        self._pixmap = self.movie.currentPixmap()
+        self._update_mask(frame)
+        self.repaint()
+
+    def _update_mask(self, frame):
+        """Mask the transparent parts of the current frame.
+
+        Calculating the mask of a frame is slow, so it's calculated once per
+        frame number and only updated if it changed.
+        """
+        # Only images with transparency need a mask
+        if not self._pixmap.hasAlphaChannel():
+            if self._mask is not None:
+                self.clearMask()
+                self._mask = None
+            return
+
+        mask = self._masks.get(frame)
+        if mask is None:
+            mask = self._masks[frame] = QtGui.QRegion(self._pixmap.mask())
+        if mask != self._mask:
+            self.setMask(mask)
+            self._mask = mask
+
+    @classmethod
+    def cache_mode(cls, size, frame_count):
+        """Returns the QMovie.CacheMode used for frame_count frames of size.
+
+        All frames are cached if they fit inside `max_cache_bytes`. Otherwise
+        only the current frame is kept and the rest are decoded again when the
+        animation loops. If the size or number of frames is unknown nothing is
+        cached.
+        """
+        if not size.isValid():
+            return QtGui.QMovie.CacheMode.CacheNone
+        frame_bytes = size.width() * size.height() * 4
+        if 0 < frame_count * frame_bytes <= cls.max_cache_bytes:
+            return QtGui.QMovie.CacheMode.CacheAll
+        return QtGui.QMovie.CacheMode.CacheNone
+
+    def finish(self, widget):
+        """Close the splash screen once widget is shown and release the movie."""
+        super().finish(widget)
+        self.release()
+
+    @classmethod
+    def max_size(cls):
+        """Returns the largest size images are shown at or None if unknown."""
+        screen = QtWidgets.QApplication.primaryScreen()
+        if screen is None:
+            return None
+        return screen.availableGeometry().size() * cls.screen_fraction
+
+    def release(self):
+        """Stop playback and release the movie. The current frame is still shown."""
+        if self.movie is None:
+            return
+        self.movie.stop()
+        self.movie.frameChanged.disconnect(self._frame_changed)
+        self.movie.deleteLater()
+        self.movie = None
+        # The frame shown won't change again
+        self._masks = {}
 
     def showEvent(self, event):  # noqa: N802
-        self.movie.start()
+        if self.movie is not None:
+            self.movie.start()
 
     def hideEvent(self, event):  # noqa: N802
-        self.movie.stop()
+        if self.movie is not None:
+            self.movie.stop()
 
     def paintEvent(self, event):  # noqa: N802
         painter = QtGui.QPainter(self)
-        pixmap = self.movie.currentPixmap()
-        self.setMask(pixmap.mask())
-        painter.drawPixmap(0, 0, pixmap)
+        painter.drawPixmap(0, 0, self._pixmap)
@@ -1,49 +1,165 @@
-import hab
+import logging
+
 from Qt import QtCore, QtWidgets
 
+from .. import utils, workers
+from ..disk_cache import URICache
+from ..models.uri_model import URIModel
+from ..uri_committer import URICommitter
+
+logger = logging.getLogger(__name__)
+
 
 class URIComboBox(QtWidgets.QComboBox):
     """Create a QComboBox to store a given list of URIs.
 
+    The URIs are stored in a `hab_gui.models.uri_model.URIModel` so large numbers
+    of URIs can be populated and looked up quickly. While typing, a popup shows
+    the URIs that start with the text or contain a segment starting with it.
+    Typed URIs are applied to `Settings.uri` using a `URICommitter`, choosing a
+    URI from the list or popup applies it immediately.
+
     Args:
         settings (hab_gui.settings.Settings): Used to access shared hab settings.
         parent (Qt.QtWidgets.QWidget, optional): Define a parent for this widget.
     """
 
+    max_completions = 200
+    """The maximum number of URIs shown in the completion popup."""
+
     def __init__(self, settings, parent=None):
         super().__init__(parent)
         self.settings = settings
+        self.uri_cache = URICache(self.settings.resolver)
+        # Used to ignore out of date cache validation results
+        self._generation = 0
         self.setEditable(True)
+        # The URIs come from hab, pressing Enter should only commit the URI
+        # instead of trying to add it to the model.
+        self.setInsertPolicy(QtWidgets.QComboBox.InsertPolicy.NoInsert)
         _translate = QtCore.QCoreApplication.translate
         self.setPlaceholderText(_translate("Launch_Aliases", "Select a URI..."))
         self.lineEdit().setPlaceholderText(self.placeholderText())
-        self.refresh()
 
-        self.currentTextChanged.connect(self._uri_changed)
+        self.uri_model = URIModel(parent=self)
+        self.setModel(self.uri_model)
+        # Prevent Qt from checking the size of every item in the model
+        self.view().setUniformItemSizes(True)
+        self.setSizeAdjustPolicy(
+            QtWidgets.QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon
+        )
+        self.setMinimumContentsLength(20)
+
+        # Replace the default completer that scans every item in the model
+        self.completion_model = QtCore.QStringListModel(self)
+        self.uri_completer = QtWidgets.QCompleter(self.completion_model, self)
+        self.uri_completer.setCompletionMode(
+            QtWidgets.QCompleter.CompletionMode.UnfilteredPopupCompletion
+        )
+        self.uri_completer.activated.connect(self.set_uri)
+        self.lineEdit().setCompleter(self.uri_completer)
+        self.lineEdit().textEdited.connect(self.update_completions)
+
+        self._populate()
+
+        self.committer = URICommitter(
+            self.settings,
+            self,
+            self.lineEdit(),
+            is_known=lambda uri: self.uri_model.find(uri) > -1,
+        )
+        self.activated.connect(self._activated)
         self.settings.verbosity_changed.connect(self.refresh)
 
-    def _uri_changed(self):
-        self.settings.uri = self.uri()
+    def _activated(self):
+        # The user chose a URI from the list
+        self.committer.commit()
 
-    def refresh(self):
-        current = self.uri()
-        self.clear()
-        if self.uri is None:
+    def _cache_errored(self, token, error):
+        logger.warning("Unable to generate the URIs", exc_info=error)
+
+    def _cache_validated(self, token, uris):
+        """Called once a worker has checked if the shown URIs are out of date."""
+        if token != self._generation or uris is None:
             return
-        resolver = self.settings.resolver
-        with hab.utils.verbosity_filter(resolver, self.settings.verbosity):
-            items = resolver.dump_forest(resolver.configs, indent="")
-            self.addItems(items)
-        self.set_uri(current)
+        logger.debug("The cached URIs are out of date, refreshing them.")
+        self._set_uris(uris)
+
+    def _populate(self):
+        """Update the model with the current URIs keeping the current URI.
+
+        The URIs stored by `uri_cache` are shown immediately if possible. They
+        are then validated on a worker thread and replaced if out of date. If
+        they are not cached, they are generated immediately if the
+        `resolve_mode` is `sync`, otherwise they are shown once a worker thread
+        has generated them.
+        """
+        # Ignore the results of any workers that are still running
+        self._generation += 1
+        verbosity = self.settings.verbosity
+        fingerprint, uris = self.uri_cache.load(verbosity)
+        if uris is None:
+            fingerprint = None
+            if self.settings.resolve_mode == "sync":
+                # Workers may be resolving or prefetching using the resolver
+                uris = self.uri_cache.validate(
+                    verbosity, None, lock=self.settings.resolve_lock
+                )
+                self._set_uris(uris)
+                return
+        else:
+            self._set_uris(uris)
+
+        # Validate or generate the URIs without blocking the gui
+        worker = workers.Worker(
+            self.uri_cache.validate,
+            verbosity,
+            fingerprint,
+            lock=self.settings.resolve_lock,
+            token=self._generation,
+            parent=self,
+        )
+        worker.signals.finished.connect(self._cache_validated)
+        worker.signals.errored.connect(self._cache_errored)
+        workers.start(worker)
+
+    def _set_uris(self, uris):
+        """Replace the URIs shown by the model keeping the current URI."""
+        # Resetting the model changes the current text, so prevent emitting
+        # signals until the current URI has been restored.
+        current = self.uri()
+        with utils.block_signals([self]):
+            self.uri_model.set_uris(uris)
+            self._set_text(current)
+
+    def refresh(self):
+        self._populate()
+        # Signals were blocked while updating the model, ensure the rest of
+        # the gui is updated using the refreshed URI.
+        self.committer.commit(force=True)
+
+    def update_completions(self, text):
+        """Update the URIs shown by the completion popup to match text."""
+        matches = self.uri_model.matches(text, limit=self.max_completions)
+        self.completion_model.setStringList(matches)
+        if matches:
+            self.uri_completer.complete()
+        else:
+            self.uri_completer.popup().hide()
 
     def uri(self):
         return self.currentText().strip()
 
-    def set_uri(self, uri):
+    def _set_text(self, uri):
         # If the uri is already an item in the combo box, select it
-        index = self.findText(uri)
+        index = self.uri_model.find(uri)
         if index > -1:
             self.setCurrentIndex(index)
         else:
             # Otherwise update the text of the combo box to match
             self.setEditText(uri)
+
+    def set_uri(self, uri):
+        """Show uri and apply it to `Settings.uri` immediately."""
+        self._set_text(uri)
+        self.committer.commit()
@@ -1,9 +1,13 @@
 from Qt import QtWidgets
 
+from ..uri_committer import URICommitter
+
 
 class URILineEdit(QtWidgets.QLineEdit):
     """Create a QLineEdit to store a given list of URIs.
 
+    Typed URIs are applied to `Settings.uri` using a `URICommitter`.
+
     Args:
         settings (hab_gui.settings.Settings): Used to access shared hab settings.
         parent (Qt.QtWidgets.QWidget, optional): Define a parent for this widget.
@@ -14,10 +18,7 @@ class URILineEdit(QtWidgets.QLineEdit):
         self.settings = settings
 
         self.setPlaceholderText("Enter a URI...")
-        self.textChanged.connect(self._uri_changed)
-
-    def _uri_changed(self):
-        self.settings.uri = self.uri()
+        self.committer = URICommitter(self.settings, self, self)
 
     def refresh(self):
         # Nothing to refresh on this widget
@@ -27,4 +28,6 @@ class URILineEdit(QtWidgets.QLineEdit):
         return self.text().strip()
 
     def set_uri(self, uri):
+        """Show uri and apply it to `Settings.uri` immediately."""
         self.setText(uri)
+        self.committer.commit()
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import logging
 import math
 from functools import partial
@@ -5,7 +7,10 @@ from functools import partial
 import hab
 from Qt import QtCore, QtWidgets
 
-from .. import utils
+from .. import utils, workers
+from ..config_watcher import ConfigWatcher
+from ..startup_profiler import profiler
+from ..uri_prefetcher import URIPrefetcher
 
 logger = logging.getLogger(__name__)
 
@@ -48,9 +53,13 @@ class AliasLaunchWindow(QtWidgets.QMainWindow):
         self.button_layout = button_layout
 
         self.checkScreenGeo = True
+        # Incremented by `refresh_changed` so out of date checks are ignored
+        self._refresh_generation = 0
 
-        self.process_entry_points()
-        self.init_gui(uri)
+        with profiler.phase("process_entry_points"):
+            self.process_entry_points()
+        with profiler.phase("init_gui"):
+            self.init_gui(uri)
 
         # Window properties
         self.setMinimumWidth(400)
@@ -63,8 +72,18 @@ class AliasLaunchWindow(QtWidgets.QMainWindow):
         )
         refresh_time = refresh_time[0]
         if refresh_time:
-            self.refresh_timer.timeout.connect(partial(self.refresh_cache, False))
             refresh_time = math.ceil(utils.interval(refresh_time))
+        self.config_watcher = None
+        if self.refresh_mode == "watch":
+            # Only refresh if the config files have actually changed
+            logger.debug(f"Watching for changes, polling every {refresh_time} seconds")
+            self.config_watcher = ConfigWatcher(
+                self.settings.resolver, poll_interval=refresh_time, parent=self
+            )
+            self.config_watcher.changed.connect(self.refresh_changed)
+            self.config_watcher.check()
+        elif refresh_time:
+            self.refresh_timer.timeout.connect(partial(self.refresh_cache, False))
             logger.debug(f"Setting auto-refresh interval to {refresh_time} seconds")
             self.refresh_timer.start(refresh_time * 1000)
 
@@ -112,6 +131,8 @@ class AliasLaunchWindow(QtWidgets.QMainWindow):
     def closeEvent(self, event):  # noqa: N802
         """Saves the prefs on close if prefs are enabled."""
         self.record_prefs()
+        # Don't wait for the prefs to be saved in the background
+        self.settings.prefs.flush()
         super().closeEvent(event)
 
     def process_entry_points(self):
@@ -202,6 +223,10 @@ class AliasLaunchWindow(QtWidgets.QMainWindow):
         # Ensure the window title always shows the currently selected URI
         self.settings.uri_changed.connect(self._update_window_title)
 
+        # Resolve the user's recent and pinned URIs once the gui is idle
+        self.prefetcher = URIPrefetcher(self.settings, parent=self)
+        self.prefetcher.refresh()
+
         # Window properties
         self.center_window_position()
 
@@ -209,12 +234,15 @@ class AliasLaunchWindow(QtWidgets.QMainWindow):
         self.restore_prefs()
 
     @utils.cursor_override()
-    def refresh_cache(self, reset_timer=True):
+    def refresh_cache(self, reset_timer=True, filenames=None):
         """Refresh the resolved hab and re-display.
 
         Args:
             reset_timer (bool, optional): Stop and restart the refresh_timer if
                 its currently active.
+            filenames (set, optional): If passed, only the resolved configs that
+                depend on these files are refreshed instead of clearing all
+                caches. See `Settings.invalidate_files`.
         """
         logger.debug(f"Refreshing cache with reset_timer: {reset_timer}")
         running = self.refresh_timer.isActive()
@@ -222,13 +250,132 @@ class AliasLaunchWindow(QtWidgets.QMainWindow):
             if reset_timer and running:
                 self.refresh_timer.stop()
 
-            self.settings.resolver.clear_caches()
+            if filenames is None:
+                self.settings.clear_caches()
+            else:
+                self.settings.invalidate_files(filenames)
             self.uri_widget.refresh()
             self.alias_buttons.refresh()
+            self.prefetcher.refresh()
         finally:
             if reset_timer and running:
                 self.refresh_timer.start()
 
+    def _refresh_digests(self, uri):
+        """Clear the resolver's caches returning the `refresh_digest` and config
+        of uri from before and after they were cleared.
+
+        This is called on a worker thread unless the `resolve_mode` is `sync`.
+        The resolve lock is held so nothing can resolve using the old caches
+        once they are cleared.
+        """
+        settings = self.settings
+        with settings.resolve_lock:
+            previous = self.refresh_digest(uri)
+            old_cfg = self._resolve_quietly(uri)
+            settings.resolver.clear_caches()
+            settings.clear_resolve_cache()
+            current = self.refresh_digest(uri)
+            return previous, current, old_cfg, self._resolve_quietly(uri)
+
+    def _refresh_digested(self, token, result):
+        """Update the gui once `_refresh_digests` has finished."""
+        generation, uri = token
+        if generation != self._refresh_generation:
+            return
+        previous, current, old_cfg, new_cfg = result
+        # The resolver's caches were cleared by `_refresh_digests`
+        self.settings.clear_caches(resolver=False)
+        if current != previous or uri != self.settings.uri:
+            self.uri_widget.refresh()
+            self.alias_buttons.refresh()
+        else:
+            logger.debug("Hab configuration changes didn't affect the gui.")
+            # Launch aliases using the re-resolved config. If the aliases widget
+            # has changed config since the check started, it's already current.
+            shown = getattr(self.alias_buttons, "_cfg", None)
+            if new_cfg is not None and shown is old_cfg:
+                self.alias_buttons.populate(new_cfg)
+        # Only prefetch once the gui has been updated
+        self.prefetcher.refresh()
+
+    def _refresh_errored(self, token, error):
+        generation, uri = token
+        if generation != self._refresh_generation:
+            return
+        logger.warning("Unable to check hab configuration changes", exc_info=error)
+        self.refresh_cache(reset_timer=False)
+
+    def _resolve_quietly(self, uri):
+        """Returns the resolved config for uri, or None if it can't be resolved."""
+        if not uri:
+            return None
+        try:
+            return self.settings.resolve(uri)
+        except Exception:
+            return None
+
+    def refresh_changed(self):
+        """Refresh the resolved hab, only re-displaying it if the result changed.
+
+        This is called by `config_watcher` when the config files have changed.
+        The hab configuration is re-resolved and if the URIs and current URI's
+        resolved config are the same as before, the gui is not updated, only
+        the config the aliases are launched with is replaced. Unless the
+        `resolve_mode` is `sync`, this is done on a worker thread.
+        """
+        self._refresh_generation += 1
+        token = (self._refresh_generation, self.settings.uri)
+        if self.settings.resolve_mode == "sync":
+            with utils.cursor_override():
+                self._refresh_digested(token, self._refresh_digests(token[1]))
+            return
+
+        worker = workers.Worker(
+            self._refresh_digests, token[1], token=token, parent=self
+        )
+        worker.signals.finished.connect(self._refresh_digested)
+        worker.signals.errored.connect(self._refresh_errored)
+        workers.start(worker, pool=workers.resolve_pool())
+
+    def refresh_digest(self, uri=None):
+        """Returns a hash of the available URIs and uri's resolved config.
+
+        This is used by `refresh_changed` to check if the gui needs updated.
+
+        Args:
+            uri (str, optional): The URI whose config is included. Defaults to
+                the current URI.
+        """
+        settings = self.settings
+        resolver = settings.resolver
+        if uri is None:
+            uri = settings.uri
+        data = {}
+        with settings.resolve_lock:
+            with hab.utils.verbosity_filter(resolver, settings.verbosity):
+                data["uris"] = list(resolver.dump_forest(resolver.configs, indent=""))
+                if uri:
+                    try:
+                        cfg = settings.resolve(uri)
+                        data["aliases"] = cfg.aliases
+                        data["environment"] = cfg.environment
+                        data["optional_distros"] = cfg.optional_distros
+                    except Exception as error:
+                        data["error"] = str(error)
+        data = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+    @property
+    def refresh_mode(self):
+        """How the gui is automatically refreshed.
+
+        This is controlled by the site config setting `hab_gui_refresh_mode`.
+        `timer`(the default) refreshes every `hab_gui_refresh_inverval`. `watch`
+        only refreshes if the hab config files have changed.
+        """
+        return self.settings.resolver.site.get("hab_gui_refresh_mode", ["timer"])[0]
+
     def center_window_position(self):
         # Place window onto screen center
         qt_rectangle = self.frameGeometry()
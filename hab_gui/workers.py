@@ -0,0 +1,128 @@
+import logging
+import threading
+import weakref
+
+from Qt import QtCore
+
+logger = logging.getLogger(__name__)
+
+_running = set()
+"""Holds a reference to every Worker that has been started but not finished.
+This prevents python from garbage collecting the Worker while its still running.
+"""
+
+_resolve_pool = None
+
+_resolve_locks = weakref.WeakKeyDictionary()
+_resolve_locks_lock = threading.Lock()
+
+
+class WorkerSignals(QtCore.QObject):
+    """Signals emitted by a `Worker` when its work is done.
+
+    This object is created on the thread that creates the Worker, so any slots
+    connected to these signals are called on that thread, not the worker thread.
+    If `parent` is deleted before the Worker finishes, the result is discarded.
+    """
+
+    finished = QtCore.Signal(object, object)
+    """Emitted with the token and return value of the callable once it finishes."""
+    errored = QtCore.Signal(object, object)
+    """Emitted with the token and exception if the callable raises an exception."""
+
+
+class Worker(QtCore.QRunnable):
+    """Calls a function on a QThreadPool thread and reports the result using signals.
+
+    Args:
+        func (callable): The function to call on the worker thread. This must not
+            create or modify any widgets.
+        *args: Passed to func.
+        token (optional): Emitted along with the result so the receiver can
+            tell if the result is still wanted.
+        parent (Qt.QtCore.QObject, optional): Parent of the `signals` object.
+        **kwargs: Passed to func.
+    """
+
+    def __init__(self, func, *args, token=None, parent=None, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.token = token
+        self.signals = WorkerSignals(parent)
+
+    def _emit(self, name, value):
+        try:
+            getattr(self.signals, name).emit(self.token, value)
+            # Emitted signals are queued before this so they are still processed
+            self.signals.deleteLater()
+        except RuntimeError:
+            # The parent of signals was deleted, nothing is left to report to.
+            logger.debug(f"Discarding worker result for {self.token}")
+
+    def run(self):
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as error:
+            self._emit("errored", error)
+        else:
+            self._emit("finished", result)
+        finally:
+            _running.discard(self)
+
+
+def resolve_lock(resolver):
+    """Returns the lock to hold while using resolver on more than one thread.
+
+    The hab resolver is not thread safe, so any code that resolves URIs, launches
+    aliases or modifies the resolver while a worker may be using it should hold
+    this lock. The same re-entrant lock is returned for every call with the same
+    resolver, so all `hab_gui.settings.Settings` using it share the lock.
+    """
+    with _resolve_locks_lock:
+        lock = _resolve_locks.get(resolver)
+        if lock is None:
+            lock = _resolve_locks[resolver] = threading.RLock()
+        return lock
+
+
+def resolve_pool():
+    """Returns the QThreadPool used to resolve hab URIs.
+
+    The hab resolver is not thread safe, so this pool only runs one resolve at
+    a time. Any queued workers that are no longer needed can be removed by
+    passing them to `cancel`.
+    """
+    global _resolve_pool
+
+    if _resolve_pool is None:
+        _resolve_pool = QtCore.QThreadPool()
+        _resolve_pool.setMaxThreadCount(1)
+    return _resolve_pool
+
+
+def start(worker, pool=None):
+    """Start running the worker on pool. Uses `QThreadPool.globalInstance` if
+    pool is not specified. Returns worker.
+    """
+    if pool is None:
+        pool = QtCore.QThreadPool.globalInstance()
+    _running.add(worker)
+    pool.start(worker)
+    return worker
+
+
+def cancel(worker, pool=None):
+    """Remove worker from pool if it has not started running yet.
+
+    Returns:
+        bool: If the worker was removed and will never run.
+    """
+    if pool is None:
+        pool = QtCore.QThreadPool.globalInstance()
+    if pool.tryTake(worker):
+        _running.discard(worker)
+        return True
+    return False
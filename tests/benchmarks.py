@@ -0,0 +1,201 @@
+"""Benchmark common hab_gui operations using a synthetic hab site.
+
+The gui is created using the offscreen Qt platform so this can run without a
+display. The results are written as json and can be compared against a
+previously saved baseline, exiting with a non-zero exit code if any benchmark
+is slower than the baseline by more than the tolerance::
+
+    python tests/benchmarks.py --output baseline.json
+    python tests/benchmarks.py --baseline baseline.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import hab  # noqa: E402
+import Qt  # noqa: E402
+from Qt import QtCore, QtWidgets  # noqa: E402
+from site_generator import add_arguments, generate_site, site_kwargs  # noqa: E402
+
+from hab_gui.settings import Settings  # noqa: E402
+from hab_gui.widgets.custom_variable_editor import CustomVariableEditor  # noqa: E402
+from hab_gui.windows.alias_launch_window import AliasLaunchWindow  # noqa: E402
+
+
+def process_events():
+    """Process any pending events, like the QTimers used by AliasLaunchWindow."""
+    QtWidgets.QApplication.processEvents()
+
+
+def delete_later(widget):
+    """Delete widget now instead of waiting for the event loop."""
+    widget.close()
+    widget.deleteLater()
+    QtWidgets.QApplication.sendPostedEvents(None, QtCore.QEvent.Type.DeferredDelete)
+
+
+def timeit(func, repeat, setup=None):
+    """Call func repeat times and return a dict of statistics in seconds.
+
+    func is called with the index of the current run. If specified, setup is
+    called with the index before each run and isn't included in the time.
+    """
+    runs = []
+    for index in range(repeat):
+        if setup is not None:
+            setup(index)
+            process_events()
+        start = time.perf_counter()
+        func(index)
+        process_events()
+        runs.append(time.perf_counter() - start)
+    return dict(min=min(runs), median=statistics.median(runs), runs=runs)
+
+
+def run(site_file, prefs_dir, repeat=5):
+    """Run each benchmark on the hab site defined by site_file.
+
+    The user prefs are stored in prefs_dir so benchmarking an existing site
+    doesn't modify the user's or the site's files.
+
+    Returns:
+        dict: The timing statistics for each benchmark name.
+    """
+    resolver = hab.Resolver(site=hab.Site([site_file]))
+    resolver.user_prefs().filename = Path(prefs_dir) / "user_prefs.json"
+    uris = [uri for uri in resolver.dump_forest(resolver.configs, indent="")]
+    # Pin a few URIs so PinnedUriButton has something to show
+    settings = Settings(resolver, 0, uri=uris[0])
+    settings.set_user_pref("pinned_uris", uris[: min(len(uris), 10)])
+
+    results = {}
+    windows = []
+
+    def create_window(index):
+        windows.append(AliasLaunchWindow(settings))
+
+    def delete_windows(index):
+        # Only keep one window alive so its slots are the only ones timed
+        while windows:
+            delete_later(windows.pop())
+
+    results["window_init"] = timeit(create_window, repeat, setup=delete_windows)
+    window = windows[-1]
+    window.show()
+    process_events()
+
+    def clear_resolve_cache(index):
+        # Only keep the parsed configs, so each run has to resolve the URI
+        settings.clear_resolve_cache()
+
+    def switch_uri(index):
+        settings.uri = uris[(index + 1) % len(uris)]
+
+    results["uri_switch"] = timeit(switch_uri, repeat, setup=clear_resolve_cache)
+    # Switching between recently used URIs, these are cached by Settings.resolve
+    for index in range(repeat):
+        switch_uri(index)
+        process_events()
+    results["uri_switch_cached"] = timeit(switch_uri, repeat)
+
+    def change_verbosity(index):
+        settings.verbosity = (index + 1) % 2
+
+    results["verbosity_change"] = timeit(
+        change_verbosity, repeat, setup=clear_resolve_cache
+    )
+    results["refresh_cache"] = timeit(lambda index: window.refresh_cache(), repeat)
+
+    editor = CustomVariableEditor(settings)
+    editor.refresh_on_show = False
+    results["variable_editor_refresh"] = timeit(lambda index: editor.refresh(), repeat)
+
+    if getattr(window, "pinned_uris", None) is not None:
+        results["pinned_uris_refresh"] = timeit(
+            lambda index: window.pinned_uris.refresh(), repeat
+        )
+
+    settings.prefs.flush()
+    delete_later(window)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Returns the benchmarks whose median is slower than baseline by tolerance.
+
+    Returns:
+        list: A (name, baseline median, current median) tuple for each regression.
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base and stats["median"] > base["median"] * (1 + tolerance):
+            regressions.append((name, base["median"], stats["median"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark.")
+    parser.add_argument("--output", help="Save the results to this json file.")
+    parser.add_argument("--baseline", help="Compare the results to this json file.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="The fraction a benchmark can be slower than the baseline.",
+    )
+    parser.add_argument(
+        "--site",
+        help="Benchmark this existing site json file instead of generating one.",
+    )
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    with tempfile.TemporaryDirectory() as root:
+        site_file = args.site or generate_site(root, **site_kwargs(args))
+        results = run(site_file, root, repeat=args.repeat)
+
+    data = dict(
+        site=None if args.site else site_kwargs(args),
+        repeat=args.repeat,
+        python=platform.python_version(),
+        qt=f"{Qt.__binding__} {Qt.__qt_version__}",
+        hab=hab.__version__,
+        results=results,
+    )
+    if args.output:
+        with open(args.output, "w") as fle:
+            json.dump(data, fle, indent=4)
+
+    for name, stats in results.items():
+        print(f"{name:<28}{stats['median'] * 1000:10.2f} ms")
+
+    if args.baseline:
+        with open(args.baseline) as fle:
+            baseline = json.load(fle)
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for name, base, current in regressions:
+            print(
+                f"Regression: {name} {current * 1000:.2f} ms is slower than "
+                f"{base * 1000:.2f} ms"
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Generate synthetic hab sites used to benchmark hab_gui.
+
+Run this file directly to generate a site on disk, use `--help` for options.
+"""
+
+import argparse
+import inspect
+import json
+from pathlib import Path
+
+PLATFORMS = ("linux", "osx", "windows")
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w") as fle:
+        json.dump(data, fle, indent=4)
+
+
+def generate_site(
+    root,
+    configs=10,
+    uris=10,
+    distros=20,
+    versions=2,
+    aliases=3,
+    optional_distros=2,
+    variables=5,
+):
+    """Generate a hab site in root and return the path to its site json file.
+
+    Args:
+        root (os.PathLike): The directory to create the site in.
+        configs (int): The number of top level project configs.
+        uris (int): The number of child URIs defined under each project.
+        distros (int): The number of distros.
+        versions (int): The number of versions of each distro.
+        aliases (int): The number of aliases defined by each distro version.
+        optional_distros (int): The number of optional distros each project
+            defines. These are used by the DistroPicker.
+        variables (int): The number of custom variables in each project. The
+            projects opt in to the custom variable editor.
+    """
+    root = Path(root)
+    distro_names = [f"distro{index:04d}" for index in range(distros)]
+
+    for name in distro_names:
+        for version in range(versions):
+            version = f"1.{version}"
+            alias_list = [
+                [f"{name}_{index}", {"cmd": ["echo", name], "label": f"{name} {index}"}]
+                for index in range(aliases)
+            ]
+            data = dict(
+                name=name,
+                version=version,
+                aliases={platform: alias_list for platform in PLATFORMS},
+            )
+            _write(root / "distros" / name / version / ".hab.json", data)
+
+    _write(
+        root / "configs" / "default.json",
+        dict(name="default", context=[], inherits=False, distros=distro_names[:1]),
+    )
+    for index in range(configs):
+        project = f"project{index:04d}"
+        # Spread the distros and optional distros used across the projects.
+        start = index % max(len(distro_names), 1)
+        required = distro_names[start : start + 3]
+        optional = distro_names[start + 3 : start + 3 + optional_distros]
+        data = dict(
+            name=project,
+            context=[],
+            inherits=False,
+            distros=required,
+            optional_distros={name: [f"Optional {name}", False] for name in optional},
+            variable_editor=True,
+            variables={f"var{v:03d}": f"value{v}" for v in range(variables)},
+        )
+        _write(root / "configs" / f"{project}.json", data)
+
+        for child in range(uris):
+            data = dict(name=f"seq{child:04d}", context=[project], inherits=True)
+            _write(root / "configs" / f"{project}_seq{child:04d}.json", data)
+
+    site_file = root / "site.json"
+    _write(
+        site_file,
+        {
+            "set": {
+                "config_paths": ["{relative_root}/configs"],
+                "distro_paths": ["{relative_root}/distros/*"],
+                "prefs_default": "--prefs",
+                "hab_gui_refresh_inverval": "",
+            },
+            "prepend": {
+                "entry_points": {
+                    "hab_gui.footer.widget": {
+                        "default": "hab_gui.widgets.distro_picker:DistroPicker"
+                    }
+                }
+            },
+        },
+    )
+    return site_file
+
+
+def site_defaults():
+    """Returns a dict of the keyword arguments of `generate_site` and their defaults."""
+    params = inspect.signature(generate_site).parameters
+    return {k: v.default for k, v in params.items() if v.default is not v.empty}
+
+
+def add_arguments(parser):
+    """Add the kwargs of `generate_site` as arguments to an ArgumentParser."""
+    for name, default in site_defaults().items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+
+
+def site_kwargs(args):
+    """Returns the kwargs for `generate_site` parsed by `add_arguments`."""
+    return {name: getattr(args, name) for name in site_defaults()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("root", help="The directory to create the site in.")
+    add_arguments(parser)
+    args = parser.parse_args()
+    print(generate_site(args.root, **site_kwargs(args)))
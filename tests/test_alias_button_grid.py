@@ -0,0 +1,204 @@
+import json
+import logging
+import threading
+
+import hab
+import pytest
+from Qt import QtCore, QtWidgets
+from site_generator import generate_site
+
+from hab_gui.disk_cache import AliasSnapshot
+from hab_gui.settings import Settings
+from hab_gui.widgets.alias_icon_button import AliasIconButton
+from hab_gui.widgets.alias_button_grid import AliasButtonGrid
+
+
+@pytest.fixture
+def settings(tmp_path):
+    site_file = generate_site(tmp_path, configs=2, uris=1, distros=6, aliases=2)
+    resolver = hab.Resolver(site=hab.Site([site_file]))
+    resolver.user_prefs().filename = tmp_path / "prefs.json"
+    settings = Settings(resolver, 0)
+    yield settings
+    settings.prefs.flush()
+
+
+def grid_coords(grid):
+    """Returns the alias names of the visible buttons and their grid coords."""
+    coords = {}
+    for name, button in grid._buttons.items():
+        assert button.isVisibleTo(grid)
+        index = grid.grid_layout.indexOf(button)
+        coords[name] = grid.grid_layout.getItemPosition(index)[:2]
+    return coords
+
+
+def test_reuse_buttons(settings, tmp_path):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    grid = AliasButtonGrid(settings, 3, 0)
+
+    settings.uri = "project0000/seq0000"
+    buttons = dict(grid._buttons)
+    assert grid_coords(grid) == {
+        "distro0000_0": (0, 0),
+        "distro0000_1": (0, 1),
+        "distro0001_0": (0, 2),
+        "distro0001_1": (1, 0),
+        "distro0002_0": (1, 1),
+        "distro0002_1": (1, 2),
+    }
+
+    # Shared aliases keep their buttons, they are moved to their new coords
+    # and point at the new config.
+    settings.uri = "project0001/seq0000"
+    cfg = settings.resolve(settings.uri)
+    assert grid_coords(grid) == {
+        "distro0001_0": (0, 0),
+        "distro0001_1": (0, 1),
+        "distro0002_0": (0, 2),
+        "distro0002_1": (1, 0),
+        "distro0003_0": (1, 1),
+        "distro0003_1": (1, 2),
+    }
+    for name in ("distro0001_0", "distro0001_1", "distro0002_0", "distro0002_1"):
+        assert grid._buttons[name] is buttons[name]
+    for button in grid._buttons.values():
+        assert button.cfg is cfg
+    # The buttons of the removed aliases were re-used for the new aliases
+    removed = {buttons["distro0000_0"], buttons["distro0000_1"]}
+    assert {grid._buttons["distro0003_0"], grid._buttons["distro0003_1"]} == removed
+    assert grid._button_pool == []
+
+    # Removed aliases are hidden and kept for later refreshes
+    filename = tmp_path / "configs" / "project0001.json"
+    data = json.loads(filename.read_text())
+    data["distros"] = ["distro0001"]
+    filename.write_text(json.dumps(data))
+    settings.clear_caches()
+    grid.refresh()
+    assert list(grid_coords(grid)) == ["distro0001_0", "distro0001_1"]
+    assert len(grid._button_pool) == 4
+    for button in grid._button_pool:
+        assert button.isHidden()
+        assert grid.grid_layout.indexOf(button) == -1
+
+    grid.clear()
+    grid.deleteLater()
+
+
+def test_threaded_resolve(settings, qtbot, monkeypatch, caplog):
+    settings.resolver.site["hab_gui_resolve_mode"] = ["thread"]
+    grid = AliasButtonGrid(settings, 3, 0)
+    qtbot.addWidget(grid)
+
+    # Block the first resolve until the URI has been changed again
+    started = threading.Event()
+    release = threading.Event()
+    resolve = settings.resolve
+
+    def blocking_resolve(uri, **kwargs):
+        if uri == "project0000/seq0000":
+            started.set()
+            release.wait(5)
+        return resolve(uri, **kwargs)
+
+    monkeypatch.setattr(settings, "resolve", blocking_resolve)
+
+    settings.uri = "project0000/seq0000"
+    assert grid._message.text() == "Resolving project0000/seq0000\u2026"
+    assert started.wait(5)
+    first = grid._worker
+
+    settings.uri = "project0001/seq0000"
+    second = grid._worker
+    assert second is not first
+    caplog.set_level(logging.DEBUG, logger="hab_gui.widgets.alias_button_grid")
+    with qtbot.waitSignals(
+        [first.signals.finished, second.signals.finished], timeout=5000
+    ):
+        release.set()
+    qtbot.waitUntil(lambda: grid._worker is None)
+
+    # Only the result of the current URI is shown
+    assert "Discarding out of date resolve of project0000/seq0000" in caplog.messages
+    assert grid._message is None
+    assert grid._cfg is resolve("project0001/seq0000")
+    assert list(grid_coords(grid)) == [
+        "distro0001_0",
+        "distro0001_1",
+        "distro0002_0",
+        "distro0002_1",
+        "distro0003_0",
+        "distro0003_1",
+    ]
+
+
+def test_snapshot(settings, qtbot, monkeypatch, tmp_path):
+    settings.resolver.site["hab_gui_resolve_mode"] = ["thread"]
+    settings.resolver.site["hab_gui_cache_dir"] = [str(tmp_path / "cache")]
+    uri = "project0000/seq0000"
+    grid = AliasButtonGrid(settings, 3, 0)
+    qtbot.addWidget(grid)
+
+    # Save a out of date snapshot of uri
+    filename = grid.snapshots.filename(uri, settings.verbosity)
+    aliases = {
+        "distro0000_0": {"label": "Old label"},
+        "distro0001_0": {"label": "distro0001 0"},
+        "removed": {"label": "Removed"},
+    }
+    assert grid.snapshots.save(filename, uri, aliases, [])
+
+    refreshed = []
+    refresh = AliasIconButton.refresh
+
+    def record_refresh(button):
+        refreshed.append(button.alias_name)
+        refresh(button)
+
+    monkeypatch.setattr(AliasIconButton, "refresh", record_refresh)
+
+    # Block the resolve so the snapshot stays visible
+    release = threading.Event()
+    resolve = settings.resolve
+
+    def blocking_resolve(uri, **kwargs):
+        release.wait(5)
+        return resolve(uri, **kwargs)
+
+    monkeypatch.setattr(settings, "resolve", blocking_resolve)
+
+    # The snapshot is shown while the URI is resolved
+    settings.uri = uri
+    assert isinstance(grid._cfg, AliasSnapshot)
+    assert grid._message is None
+    texts = {name: button.text() for name, button in grid._buttons.items()}
+    assert texts == {
+        "distro0000_0": "Old label",
+        "distro0001_0": "distro0001 0",
+        "removed": "Removed",
+    }
+    buttons = dict(grid._buttons)
+
+    # Once resolved, only the buttons that changed are refreshed
+    refreshed.clear()
+    with qtbot.waitSignal(grid._worker.signals.finished, timeout=5000):
+        release.set()
+    qtbot.waitUntil(lambda: grid._worker is None)
+    cfg = resolve(uri)
+    assert grid._cfg is cfg
+    assert sorted(grid_coords(grid)) == sorted(cfg.aliases)
+    assert grid._buttons["distro0000_0"] is buttons["distro0000_0"]
+    assert grid._buttons["distro0000_0"].text() == "distro0000 0"
+    assert grid._buttons["distro0001_0"] is buttons["distro0001_0"]
+    assert grid._buttons["distro0001_0"].cfg is cfg
+    assert "distro0001_0" not in refreshed
+    assert "distro0000_0" in refreshed
+    assert buttons["removed"] in grid._buttons.values()
+
+    # The snapshot is updated in the background
+    QtCore.QThreadPool.globalInstance().waitForDone(5000)
+    data = grid.snapshots.load(filename, uri)
+    assert data["aliases"] == {
+        name: grid.snapshots.display(alias) for name, alias in cfg.aliases.items()
+    }
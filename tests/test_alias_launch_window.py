@@ -0,0 +1,71 @@
+import json
+
+import hab
+from Qt import QtWidgets
+from Qt.QtTest import QTest
+from site_generator import generate_site
+
+from hab_gui import workers
+from hab_gui.settings import Settings
+from hab_gui.windows.alias_launch_window import AliasLaunchWindow
+
+
+def wait_for(check):
+    for _ in range(200):
+        workers.resolve_pool().waitForDone(10)
+        QTest.qWait(10)
+        if check():
+            return
+    raise AssertionError("Timed out")
+
+
+def test_refresh_changed(tmp_path, monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    site_file = generate_site(tmp_path, configs=2, uris=1, distros=6, aliases=1)
+    resolver = hab.Resolver(site=hab.Site([site_file]))
+    resolver.site["hab_gui_resolve_mode"] = ["thread"]
+    resolver.user_prefs().filename = tmp_path / "prefs.json"
+    settings = Settings(resolver, 0, uri="project0000/seq0000")
+    window = AliasLaunchWindow(settings)
+    grid = window.alias_buttons
+    picker = window.footer_widget
+    wait_for(lambda: grid._cfg is not None and picker.names())
+    assert sorted(picker.names()) == ["distro0003", "distro0004"]
+
+    calls = []
+    for name in ("uri_widget", "prefetcher"):
+        widget = getattr(window, name)
+        original = widget.refresh
+        monkeypatch.setattr(
+            widget,
+            "refresh",
+            lambda original=original, name=name: calls.append(name) or original(),
+        )
+
+    # Re-saving a config without changes only replaces the config of the aliases
+    digest = window.refresh_digest()
+    cfg = grid._cfg
+    buttons = dict(grid._buttons)
+    filename = tmp_path / "configs" / "project0000.json"
+    filename.write_text(filename.read_text())
+    window.refresh_changed()
+    wait_for(lambda: calls)
+    assert calls == ["prefetcher"]
+    assert window.refresh_digest() == digest
+    assert grid._cfg is not cfg
+    assert grid._cfg is settings.resolve(settings.uri)
+    assert grid._buttons == buttons
+
+    # Changing only the optional distros refreshes the gui
+    calls.clear()
+    data = json.loads(filename.read_text())
+    data["optional_distros"] = {"distro0005": ["Optional distro0005", False]}
+    filename.write_text(json.dumps(data))
+    window.refresh_changed()
+    wait_for(lambda: list(picker.names()) == ["distro0005"])
+    assert calls == ["uri_widget", "prefetcher"]
+    assert window.refresh_digest() != digest
+
+    settings.prefs.flush()
+    window.close()
+    window.deleteLater()
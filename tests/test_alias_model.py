@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+from hab_gui.models.alias_model import AliasModel
+
+
+def make_cfg(names):
+    aliases = {name: {"cmd": "echo", "label": name.upper()} for name in names}
+    return SimpleNamespace(uri="app/test", aliases=aliases)
+
+
+def test_grid_cells():
+    names = ["a", "b", "c", "d"]
+    model = AliasModel()
+
+    # Fill rows first, the last row has an empty cell
+    model.set_aliases(make_cfg(names), names, 3, 0)
+    assert model.columns == 3
+    cells = [model.index(row).data(model.AliasNameRole) for row in range(6)]
+    assert cells == ["a", "b", "c", "d", None, None]
+    assert model.rowCount() == 6
+
+    # Fill columns first, empty cells are inserted so a list view wrapping
+    # every `columns` items shows the same arrangement as AliasButtonGrid.
+    model.set_aliases(make_cfg(names), names, 3, 1)
+    assert model.columns == 2
+    cells = [model.index(row).data(model.AliasNameRole) for row in range(6)]
+    assert cells == ["a", "d", "b", None, "c", None]
+    assert not model.flags(model.index(3))
+    assert model.index(1).data() == "D"
+    assert model.alias_index("c").row() == 4
+    assert not model.alias_index("missing").isValid()
+
+    model.clear()
+    assert model.rowCount() == 0
+
+
+def test_icon_loaded():
+    names = ["a", "b", "c", "d"]
+    cfg = make_cfg(names)
+    cfg.aliases["b"]["icon"] = "shared.png"
+    cfg.aliases["d"]["icon"] = "shared.png"
+    model = AliasModel()
+    model.set_aliases(cfg, names, 3, 0)
+
+    changed = []
+    model.dataChanged.connect(
+        lambda first, last, *args: changed.append((first.row(), last.row()))
+    )
+    # A single range covering every alias using the icon is updated
+    model._icon_loaded("shared.png")
+    assert changed == [(1, 3)]
+
+    changed.clear()
+    model._icon_loaded("unused.png")
+    assert changed == []
@@ -0,0 +1,32 @@
+import benchmarks
+import hab
+from Qt import QtWidgets
+from site_generator import generate_site
+
+
+def test_generate_site(tmp_path):
+    site_file = generate_site(tmp_path, configs=2, uris=2, distros=4, aliases=2)
+    resolver = hab.Resolver(site=hab.Site([site_file]))
+    uris = list(resolver.dump_forest(resolver.configs, indent=""))
+    assert "project0001/seq0001" in uris
+
+    cfg = resolver.resolve("project0000/seq0000")
+    assert cfg.variables["var000"] == "value0"
+    assert "distro0000_1" in cfg.aliases
+
+
+def test_benchmarks(tmp_path):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    site_file = generate_site(tmp_path, configs=2, uris=2, distros=4, aliases=2)
+    prefs_dir = tmp_path / "prefs"
+    prefs_dir.mkdir()
+    results = benchmarks.run(site_file, prefs_dir, repeat=1)
+    assert (prefs_dir / "user_prefs.json").exists()
+    assert not (tmp_path / "user_prefs.json").exists()
+    assert results["uri_switch"]["runs"]
+
+    # Only benchmarks slower than the baseline by more than tolerance are reported
+    baseline = {"uri_switch": {"median": results["uri_switch"]["median"] * 2}}
+    assert benchmarks.compare(results, baseline, 0.25) == []
+    baseline = {"uri_switch": {"median": results["uri_switch"]["median"] / 2}}
+    assert [r[0] for r in benchmarks.compare(results, baseline, 0.25)] == ["uri_switch"]
@@ -0,0 +1,49 @@
+import hab
+from Qt import QtWidgets
+from site_generator import generate_site
+
+from hab_gui.config_watcher import ConfigWatcher, watched_paths
+
+
+def test_watched_paths(tmp_path):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    site_file = generate_site(tmp_path, configs=2, uris=2, distros=4, aliases=2)
+    resolver = hab.Resolver(site=hab.Site([site_file]))
+    files, dirs = watched_paths(resolver)
+    assert str(site_file) in files
+    assert str(site_file.parent) in dirs
+
+    watcher = ConfigWatcher(resolver)
+    paths, fingerprint = watcher._scan()
+    assert set(paths) <= set(files + dirs)
+    assert set(dirs) <= set(paths)
+
+    # Only directories are watched if there are too many paths
+    watcher.max_watched_paths = len(dirs)
+    paths, capped = watcher._scan()
+    assert sorted(paths) == dirs
+    assert capped == fingerprint
+    # Only polling is used if there are too many directories
+    watcher.max_watched_paths = 1
+    assert watcher._scan() == ([], fingerprint)
+
+
+def test_recheck(monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    watcher = ConfigWatcher(None)
+    checks = []
+    monkeypatch.setattr(watcher, "check", lambda: checks.append(True))
+    emitted = []
+    watcher.changed.connect(lambda: emitted.append(True))
+    watcher.fingerprint = "old"
+
+    # A result that is out of date is discarded and the files are checked again
+    watcher._recheck = True
+    watcher._checked(None, ([], "partial"))
+    assert checks == [True]
+    assert emitted == []
+    assert watcher.fingerprint == "old"
+
+    watcher._checked(None, ([], "new"))
+    assert emitted == [True]
+    assert watcher.fingerprint == "new"
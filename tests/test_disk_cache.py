@@ -0,0 +1,176 @@
+import contextlib
+import os
+from collections import namedtuple
+
+import hab
+from site_generator import generate_site
+
+from hab_gui import disk_cache, utils
+
+
+def test_fingerprint(tmpdir):
+    path = tmpdir / "a.json"
+    missing = tmpdir / "missing.json"
+    utils.save_json(path, {"name": "a"})
+
+    check = disk_cache.fingerprint([path, missing])
+    # Order of the paths doesn't matter
+    assert disk_cache.fingerprint([missing, path]) == check
+
+    # Modifying a file changes the fingerprint
+    utils.save_json(path, {"name": "ab"})
+    os.utime(path, ns=(0, 0))
+    modified = disk_cache.fingerprint([path, missing])
+    assert modified != check
+
+    # Creating a missing file changes the fingerprint
+    utils.save_json(missing, {})
+    assert disk_cache.fingerprint([path, missing]) != modified
+
+
+def test_save_load(tmpdir):
+    filename = tmpdir / "sub" / "cache.json"
+    assert disk_cache.load(filename) is None
+    assert disk_cache.save(filename, {"uris": ["a", "b"]})
+    assert disk_cache.load(filename) == {"uris": ["a", "b"]}
+    # No temp files are left behind
+    assert os.listdir(tmpdir / "sub") == ["cache.json"]
+
+    # Invalid data is treated as not cached
+    with open(filename, "w") as fle:
+        fle.write("{invalid")
+    assert disk_cache.load(filename) is None
+
+
+class FakeSite(dict):
+    paths = []
+
+
+FakeResolver = namedtuple("FakeResolver", ["site"])
+
+
+def test_splash_index(tmpdir):
+    images = tmpdir / "images"
+    images.mkdir()
+    (images / "a.png").write_binary(b"")
+    (images / "notes.txt").write_text("", "utf-8")
+    site = FakeSite(
+        hab_gui_cache_dir=[str(tmpdir / "cache")], splash_screen=[str(images)]
+    )
+    index = disk_cache.SplashIndex(FakeResolver(site))
+
+    # There is no index until it has been scanned
+    assert index.load() is None
+    assert index.rescan() == [str(images / "a.png")]
+    assert index.load() == [str(images / "a.png")]
+
+    # Adding an image modifies the directory invalidating the index
+    (images / "b.png").write_binary(b"")
+    os.utime(images, ns=(0, 0))
+    assert index.load() is None
+    assert sorted(index.rescan()) == [str(images / "a.png"), str(images / "b.png")]
+
+
+def test_variable_editor_index(tmpdir, monkeypatch):
+    opt_in = tmpdir / "opt_in.json"
+    opt_out = tmpdir / "opt_out.json"
+    utils.save_json(opt_in, {"name": "a", "variable_editor": True})
+    utils.save_json(opt_out, {"name": "b"})
+    site = FakeSite(hab_gui_cache_dir=[str(tmpdir / "cache")])
+    index = disk_cache.VariableEditorIndex(FakeResolver(site))
+
+    read = []
+    read_flag = disk_cache.VariableEditorIndex.read_flag
+    monkeypatch.setattr(index, "read_flag", lambda f: read.append(f) or read_flag(f))
+
+    expected = {str(opt_in): True, str(opt_out): False}
+    assert index.flags([opt_in, opt_out]) == expected
+    assert sorted(read) == sorted(expected)
+
+    # Un-modified files are not read again, even by a new index
+    index = disk_cache.VariableEditorIndex(FakeResolver(site))
+    monkeypatch.setattr(index, "read_flag", lambda f: read.append(f) or read_flag(f))
+    read.clear()
+    assert index.flags([opt_in, opt_out]) == expected
+    assert read == []
+
+    # Modified files are re-read
+    utils.save_json(opt_out, {"name": "b", "variable_editor": True})
+    os.utime(opt_out, ns=(0, 0))
+    assert index.flags([opt_in, opt_out]) == {str(opt_in): True, str(opt_out): True}
+    assert read == [str(opt_out)]
+
+    # Deleted files are dropped from the index instead of raising an error
+    opt_out.remove()
+    assert index.flags([opt_in, opt_out]) == {str(opt_in): True, str(opt_out): False}
+    assert list(disk_cache.load(index.filename)) == [str(opt_in)]
+
+    # Stale entries are pruned when the index is loaded
+    utils.save_json(opt_out, {"name": "b"})
+    index.flags([opt_out])
+    opt_out.remove()
+    index = disk_cache.VariableEditorIndex(FakeResolver(site))
+    assert index.flags([opt_in]) == {str(opt_in): True}
+    assert list(disk_cache.load(index.filename)) == [str(opt_in)]
+
+
+def test_alias_snapshots(tmpdir):
+    config = tmpdir / "config.json"
+    utils.save_json(config, {"name": "a"})
+    site = FakeSite(hab_gui_cache_dir=[str(tmpdir / "cache")])
+    resolver = namedtuple("Resolver", ["site", "forced_requirements"])(site, {})
+    snapshots = disk_cache.AliasSnapshots(resolver)
+
+    filename = snapshots.filename("app", 0)
+    # Each verbosity and URI is stored separately
+    assert filename != snapshots.filename("app", 1)
+    assert filename != snapshots.filename("app/child", 0)
+    assert snapshots.load(filename, "app") is None
+
+    aliases = {"maya": {"cmd": "maya", "label": "Maya", "icon": None}}
+    assert snapshots.save(filename, "app", aliases, [config])
+    data = snapshots.load(filename, "app")
+    # Only the information shown by the buttons is stored
+    assert data["aliases"] == {"maya": {"label": "Maya"}}
+    assert data["files"] == [str(config)]
+    # It's only saved again if something changed
+    assert not snapshots.save(filename, "app", aliases, [config])
+    os.utime(config, ns=(0, 0))
+    assert snapshots.save(filename, "app", aliases, [config])
+
+    # Launching from a snapshot uses the resolved config
+    launched = []
+    cfg = namedtuple("Config", ["launch"])(
+        lambda *args, **kwargs: launched.append((args, kwargs))
+    )
+    snapshot = disk_cache.AliasSnapshot("app", data["aliases"], lambda uri: cfg)
+    snapshot.launch("maya", args=["-v"])
+    assert launched == [(("maya",), {"args": ["-v"]})]
+
+
+def test_uri_cache(tmp_path):
+    site_file = generate_site(tmp_path, configs=2, uris=1, distros=4, aliases=1)
+    resolver = hab.Resolver(site=hab.Site([site_file]))
+    resolver.site["hab_gui_cache_dir"] = [str(tmp_path / "cache")]
+    uri_cache = disk_cache.URICache(resolver)
+    assert uri_cache.load(0) == (None, None)
+
+    # Out of date or missing URIs are generated and cached
+    uris = uri_cache.validate(0, None)
+    assert "project0001/seq0000" in uris
+    fingerprint, cached = uri_cache.load(0)
+    assert cached == uris
+    # Valid cached URIs don't need to be generated
+    assert uri_cache.validate(0, fingerprint) is None
+    assert uri_cache.uris(0) == uris
+
+    # The lock is held while using the resolver
+    locked = []
+
+    @contextlib.contextmanager
+    def lock():
+        locked.append(True)
+        yield
+
+    assert uri_cache.validate(0, "out of date", lock=lock()) == uris
+    assert locked == [True]
@@ -0,0 +1,95 @@
+import os
+
+from Qt import QtCore, QtGui
+
+from hab_gui.icon_cache import IconCache
+
+
+def save_image(path, color="red", size=32):
+    image = QtGui.QImage(size, size, QtGui.QImage.Format.Format_ARGB32)
+    image.fill(QtGui.QColor(color))
+    assert image.save(str(path))
+    return str(path)
+
+
+def load(qtbot, cache, path, size):
+    """Request path from cache and wait for it to be loaded."""
+    with qtbot.waitSignal(cache.icon_loaded, timeout=5000) as blocker:
+        assert cache.pixmap(path, size) is None
+    assert blocker.args == [path]
+    return cache.pixmap(path, size)
+
+
+def test_async_load(qtbot, tmp_path):
+    cache = IconCache()
+    path = save_image(tmp_path / "icon.png")
+    size = QtCore.QSize(16, 16)
+
+    # A placeholder is shown until the image has been loaded
+    with qtbot.waitSignal(cache.icon_loaded, timeout=5000):
+        icon = cache.icon(path, size)
+        assert not icon.isNull()
+        assert cache.pixmap(path, size) is None
+    pixmap = cache.pixmap(path, size)
+    assert pixmap.size() == size
+    assert pixmap.toImage().pixelColor(8, 8) == QtGui.QColor("red")
+
+    # Missing files are only checked once
+    missing = str(tmp_path / "missing.png")
+    assert load(qtbot, cache, missing, size).isNull()
+    assert cache.icon(missing, size).isNull()
+    assert cache.icon("", size).isNull()
+
+
+def test_key(qtbot, tmp_path):
+    cache = IconCache()
+    path = save_image(tmp_path / "icon.png")
+    small = load(qtbot, cache, path, QtCore.QSize(16, 16))
+
+    # Each size is cached separately
+    large = load(qtbot, cache, path, QtCore.QSize(24, 24))
+    assert large.size() == QtCore.QSize(24, 24)
+    assert cache.pixmap(path, QtCore.QSize(16, 16)) is small
+    mtime = os.stat(path).st_mtime_ns
+    assert set(cache._pixmaps) == {
+        (path, mtime, (16, 16)),
+        (path, mtime, (24, 24)),
+    }
+
+    # If the file hasn't changed, the cached image is used
+    cache.invalidate()
+    assert load(qtbot, cache, path, QtCore.QSize(16, 16)) is small
+
+    # Modified files are re-read
+    save_image(path, color="blue")
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+    cache.invalidate()
+    pixmap = load(qtbot, cache, path, QtCore.QSize(16, 16))
+    assert pixmap is not small
+    assert pixmap.toImage().pixelColor(8, 8) == QtGui.QColor("blue")
+    assert (path, mtime + 10**9, (16, 16)) in cache._pixmaps
+
+
+def test_lru_budget(qtbot, tmp_path):
+    size = QtCore.QSize(16, 16)
+    paths = [save_image(tmp_path / f"icon{i}.png") for i in range(3)]
+    cache = IconCache()
+    first = load(qtbot, cache, paths[0], size)
+    # Only allow two images to be cached
+    cache.max_bytes = cache.pixmap_bytes(first) * 2
+
+    load(qtbot, cache, paths[1], size)
+    assert cache._bytes == cache.max_bytes
+    # Using the first image makes the second the least recently used
+    assert cache.pixmap(paths[0], size) is first
+    load(qtbot, cache, paths[2], size)
+    assert [key[0] for key in cache._pixmaps] == [paths[0], paths[2]]
+    assert cache._bytes == cache.max_bytes
+
+    # The evicted image is loaded again when requested
+    load(qtbot, cache, paths[1], size)
+    assert [key[0] for key in cache._pixmaps] == [paths[2], paths[1]]
+
+    cache.clear()
+    assert cache._bytes == 0
+    assert cache.pixmap(paths[0], size) is None
@@ -0,0 +1,58 @@
+import sys
+from collections import namedtuple
+from multiprocessing import Pipe
+from pathlib import Path
+
+import pytest
+from hab.cli import SharedSettings
+
+from hab_gui import launch_client
+
+FakeSite = namedtuple("FakeSite", ["paths"])
+
+
+def test_no_server(tmp_path, monkeypatch):
+    monkeypatch.setattr(launch_client, "runtime_dir", lambda: tmp_path)
+    site = FakeSite([tmp_path / "site.json"])
+    # If the server isn't running the client handles the request itself
+    assert launch_client.send(site, dict(command="ping")) is None
+    assert not launch_client.stop(site)
+
+
+def test_client_cli_settings(tmp_path):
+    settings = SharedSettings(script_dir=".", script_ext=".bat")
+    request = dict(script_dir=str(tmp_path), script_ext=".sh")
+    client = launch_client.client_cli_settings(settings, request)
+    assert client.script_dir == Path(tmp_path)
+    assert client.script_ext == ".sh"
+    assert settings.script_ext == ".bat"
+
+    # Requests can only be handled if the cli options match
+    key = launch_client.cli_settings_key(settings)
+    settings.forced_requirements = ["maya==2024"]
+    assert launch_client.cli_settings_key(settings) != key
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Modes are not checked")
+def test_secure_runtime_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    path = tmp_path / "hab_gui"
+    assert launch_client.runtime_dir() == path
+    assert launch_client.secure_runtime_dir() is None
+    assert launch_client.secure_runtime_dir(create=True) == path
+
+    # Directories other users could access are not used
+    path.chmod(0o755)
+    assert launch_client.secure_runtime_dir(create=True) is None
+    assert launch_client.send(FakeSite([tmp_path / "site.json"]), {}) is None
+
+
+def test_messages():
+    # Messages are sent as json instead of being pickled
+    sender, receiver = Pipe()
+    launch_client.send_message(sender, dict(command="ping"))
+    assert launch_client.recv_message(receiver) == dict(command="ping")
+
+    sender.send(dict(command="ping"))
+    with pytest.raises(ValueError):
+        launch_client.recv_message(receiver)
@@ -0,0 +1,41 @@
+import sys
+import threading
+from multiprocessing.connection import Client
+
+import pytest
+from hab.cli import SharedSettings
+from Qt import QtWidgets
+from Qt.QtTest import QTest
+
+from hab_gui import launch_client
+from hab_gui.launch_server import LaunchServer
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Uses the posix runtime dir")
+def test_stalled_client(tmp_path, monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    cli_settings = SharedSettings(site_paths=["tests/site/hab-gui.json"])
+    site = cli_settings.resolver.site
+    server = LaunchServer(cli_settings)
+    server.request_timeout = 0.5
+    assert server.start()
+    # These clients never finish authenticating or sending their request
+    stalled = [Client(launch_client.address(site)) for _ in range(2)]
+    try:
+        replies = []
+        thread = threading.Thread(
+            target=lambda: replies.append(launch_client.send(site, {"command": "ping"}))
+        )
+        thread.start()
+        for _ in range(200):
+            QTest.qWait(10)
+            if replies:
+                break
+        thread.join(5)
+        # Other clients are still handled
+        assert replies == [dict(exit_code=0, error=None)]
+    finally:
+        for conn in stalled:
+            conn.close()
+        server.close()
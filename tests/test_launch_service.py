@@ -0,0 +1,107 @@
+import threading
+
+from Qt import QtWidgets
+from Qt.QtTest import QTest
+
+from hab_gui import workers
+from hab_gui.disk_cache import AliasSnapshot
+from hab_gui.launch_service import LaunchService
+from hab_gui.widgets.alias_button import AliasButton
+
+
+class FakeResolver:
+    pass
+
+
+class FakeConfig:
+    """Stand in for a FlatConfig whose launch waits until `release` is set."""
+
+    def __init__(self, uri):
+        self.uri = uri
+        self.aliases = {"maya": {}, "houdini": {}, "broken": {}}
+        self.resolver = FakeResolver()
+        self.release = threading.Event()
+        self.launched = []
+
+    def launch(self, alias_name, args=None):
+        # The resolver is locked while launching
+        lock = workers.resolve_lock(self.resolver)
+        locked = []
+        thread = threading.Thread(
+            target=lambda: locked.append(not lock.acquire(blocking=False))
+        )
+        thread.start()
+        thread.join()
+        assert locked == [True]
+        self.release.wait(5)
+        if alias_name == "broken":
+            raise RuntimeError("Unable to launch")
+        self.launched.append((alias_name, args))
+        return alias_name
+
+
+def wait_for(check):
+    for _ in range(100):
+        if check():
+            return
+        QTest.qWait(10)
+    raise AssertionError("Timed out")
+
+
+def test_launch_service(monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    service = LaunchService()
+    monkeypatch.setattr(LaunchService, "_instance", service)
+    signals = []
+    for name in ("launch_started", "launch_finished", "launch_errored"):
+        getattr(service, name).connect(
+            lambda *args, name=name: signals.append((name,) + args)
+        )
+    cfg = FakeConfig("app")
+    other = FakeConfig("other")
+    button = AliasButton(cfg, "maya")
+    other_button = AliasButton(cfg, "houdini")
+
+    # A launch is ignored while the same alias is launching for the same URI
+    assert service.launch(cfg, "maya", args=["-v"])
+    assert service.is_launching("app", "maya")
+    # Buttons are disabled while their alias is launching
+    assert not button.isEnabled()
+    assert other_button.isEnabled()
+    assert not service.launch(cfg, "maya")
+    assert service.launch(cfg, "houdini")
+    assert service.launch(other, "maya")
+    assert signals == [
+        ("launch_started", "app", "maya"),
+        ("launch_started", "app", "houdini"),
+        ("launch_started", "other", "maya"),
+    ]
+
+    cfg.release.set()
+    other.release.set()
+    wait_for(lambda: not service._pending)
+    assert button.isEnabled()
+    assert sorted(cfg.launched) == [("houdini", None), ("maya", ["-v"])]
+    assert sorted(signals[3:]) == [
+        ("launch_finished", "app", "houdini", "houdini"),
+        ("launch_finished", "app", "maya", "maya"),
+        ("launch_finished", "other", "maya", "maya"),
+    ]
+    assert len(service.timings["maya"]) == 2
+    # It can be launched again once finished
+    assert service.launch(cfg, "maya")
+    wait_for(lambda: not service._pending)
+
+    # Snapshots are resolved before launching
+    snapshot = AliasSnapshot("app", {}, lambda uri: cfg)
+    del signals[:]
+    assert service.launch(snapshot, "broken")
+    wait_for(lambda: not service._pending)
+    # Errors are reported instead of raised
+    assert [s[:3] for s in signals] == [
+        ("launch_started", "app", "broken"),
+        ("launch_errored", "app", "broken"),
+        ("launch_finished", "app", "broken"),
+    ]
+    assert isinstance(signals[1][3], RuntimeError)
+    assert signals[2][3] is None
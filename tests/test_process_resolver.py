@@ -0,0 +1,73 @@
+import json
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import hab
+import pytest
+from site_generator import generate_site
+
+from hab_gui.disk_cache import AliasSnapshots, config_filenames
+from hab_gui.process_resolver import ProcessResolver
+
+
+def test_process_resolver(tmp_path):
+    site_file = generate_site(tmp_path, configs=2, uris=2, distros=4, aliases=2)
+    resolver = hab.Resolver(site=hab.Site([site_file]))
+    resolver.site["hab_gui_process_max_jobs"] = [2]
+    process_resolver = ProcessResolver(resolver)
+    try:
+        uri = "project0000/seq0000"
+        payload = process_resolver.resolve(uri, 0, [])
+        # The payload matches resolving in this process
+        cfg = resolver.resolve(uri)
+        assert payload["uri"] == uri
+        assert payload["aliases"] == {
+            name: AliasSnapshots.display(alias) for name, alias in cfg.aliases.items()
+        }
+        assert payload["files"] == sorted(config_filenames(cfg))
+        executor = process_resolver._executor
+        # Recent results are re-used
+        future = process_resolver.submit(uri, 0, [])
+        assert future.result() == payload
+        assert process_resolver._jobs == 1
+
+        # Workers are replaced after max_jobs
+        process_resolver.resolve(uri, 1, [])
+        assert process_resolver._executor is executor
+        process_resolver.resolve(uri, 2, [])
+        assert process_resolver._executor is not executor
+        # Recycling discards the previous results
+        assert list(process_resolver._futures) == [(uri, 2, ())]
+
+        # A crashed worker raises an error and the next resolve uses new workers
+        process_resolver._executor.submit(os._exit, 1)
+        with pytest.raises(BrokenProcessPool):
+            process_resolver.resolve(uri, 3, [])
+        assert process_resolver.resolve(uri, 3, [])["uri"] == uri
+    finally:
+        process_resolver.recycle()
+
+
+def test_invalidate_files(tmp_path):
+    from hab_gui.settings import Settings
+
+    site_file = generate_site(tmp_path, configs=1, uris=1, distros=5, aliases=1)
+    resolver = hab.Resolver(site=hab.Site([site_file]))
+    settings = Settings(resolver, 0, uri="project0000")
+    try:
+        uri = "project0000"
+        payload = settings.process_resolver.resolve(uri, 0, [])
+        assert list(payload["optional_distros"]) == ["distro0003", "distro0004"]
+
+        # Simulate the custom variable editor saving a config file
+        filename = tmp_path / "configs" / "project0000.json"
+        data = json.loads(filename.read_text())
+        data["optional_distros"] = {"distro0004": ["Optional distro0004", False]}
+        filename.write_text(json.dumps(data))
+        settings.invalidate_files([filename])
+
+        # The worker processes and saved results no longer use the old file
+        payload = settings.process_resolver.resolve(uri, 0, [])
+        assert list(payload["optional_distros"]) == ["distro0004"]
+    finally:
+        settings.process_resolver.recycle()
@@ -0,0 +1,97 @@
+import threading
+
+from Qt import QtWidgets
+from test_settings import FakeResolver
+
+from hab_gui import workers
+from hab_gui.resolve_prefetcher import ResolvePrefetcher
+from hab_gui.settings import Settings
+
+
+def test_resolve_prefetcher_yields():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    resolver = FakeResolver()
+    settings = Settings(resolver, 0, uri="app")
+    prefetcher = ResolvePrefetcher(settings)
+    requests = [("a", {}), ("b", {})]
+
+    # Keep the resolve pool busy so prefetch workers stay queued
+    release = threading.Event()
+    blocker = workers.Worker(release.wait, 5)
+    workers.start(blocker, pool=workers.resolve_pool())
+    try:
+        prefetcher.prefetch(requests)
+        prefetcher._next()
+        assert prefetcher._worker is not None
+
+        # Changing the URI puts the queued request back and waits for the user
+        settings.uri_changing.emit("b")
+        assert prefetcher._worker is None
+        assert prefetcher._requests == requests
+        assert prefetcher._timer.isActive()
+
+        # A cancelled request that has already started doesn't resolve
+        prefetcher._timer.stop()
+        prefetcher._next()
+        cancelled = prefetcher._cancelled
+        prefetcher.cancel()
+        assert cancelled.is_set()
+        assert prefetcher._resolve("a", {}, cancelled) == 0.0
+        assert resolver.resolved == []
+    finally:
+        release.set()
+        workers.resolve_pool().waitForDone(5000)
+
+
+def test_resolve_prefetcher_shares_cache():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    resolver = FakeResolver({"hab_gui_resolve_cache_size": 6})
+    settings = Settings(resolver, 0, uri="app")
+    first = ResolvePrefetcher(settings)
+    second = ResolvePrefetcher(settings)
+    other = ResolvePrefetcher(Settings(FakeResolver(), 0, uri="app"))
+    requests = [(uri, {}) for uri in "abcdef"]
+
+    # One entry is kept for the current URI, the rest is shared
+    first.prefetch(requests[:3])
+    assert len(first._requests) == 3
+    second.prefetch(requests)
+    assert len(second._requests) == 2
+    # Prefetchers using other settings have their own cache
+    other.prefetch(requests)
+    assert len(other._requests) == 6
+
+    # Cancelling releases the entries
+    first.cancel()
+    second.prefetch(requests)
+    assert len(second._requests) == 5
+    for prefetcher in (first, second, other):
+        prefetcher.cancel()
+
+
+def test_resolve_prefetcher_postpone_all():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    settings = Settings(FakeResolver(), 0, uri="app")
+    prefetcher = ResolvePrefetcher(settings)
+    other = ResolvePrefetcher(Settings(FakeResolver(), 0, uri="app"))
+    requests = [("a", {}), ("b", {})]
+
+    release = threading.Event()
+    blocker = workers.Worker(release.wait, 5)
+    workers.start(blocker, pool=workers.resolve_pool())
+    try:
+        for item in (prefetcher, other):
+            item.prefetch(requests)
+            item._next()
+
+        # Only the prefetchers using settings are postponed
+        ResolvePrefetcher.postpone_all(settings)
+        assert prefetcher._worker is None
+        assert prefetcher._requests == requests
+        assert prefetcher._timer.isActive()
+        assert other._worker is not None
+    finally:
+        for item in (prefetcher, other):
+            item.cancel()
+        release.set()
+        workers.resolve_pool().waitForDone(5000)
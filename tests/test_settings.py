@@ -0,0 +1,177 @@
+import gc
+import json
+import weakref
+from types import SimpleNamespace
+
+from hab.user_prefs import UserPrefs
+
+from hab_gui import settings as settings_module
+from hab_gui.settings import Settings
+
+
+class FakeResolver:
+    """Minimal stand in for `hab.Resolver` that counts calls to resolve."""
+
+    def __init__(self, site=None):
+        self.site = {} if site is None else site
+        self.forced_requirements = {}
+        self.resolved = []
+        self._user_prefs = UserPrefs(self)
+
+    def clear_caches(self):
+        pass
+
+    def resolve(self, uri):
+        self.resolved.append(uri)
+        return object()
+
+    def user_prefs(self):
+        return self._user_prefs
+
+
+def test_resolve_cache():
+    resolver = FakeResolver()
+    settings = Settings(resolver, 0, uri="app")
+
+    cfg = settings.resolve("app")
+    assert settings.resolve("app") is cfg
+    assert resolver.resolved == ["app"]
+    assert settings.resolve_cache_info() == dict(hits=1, misses=1, size=1, max_size=16)
+
+    # Verbosity and forced_requirements are part of the key
+    settings._verbosity = 1
+    assert settings.resolve("app") is not cfg
+    settings._verbosity = 0
+    resolver.forced_requirements = {"maya": "maya==2024"}
+    assert settings.resolve("app") is not cfg
+    resolver.forced_requirements = {}
+    assert settings.resolve("app") is cfg
+    assert resolver.resolved == ["app"] * 3
+
+    # Clearing caches forces a new resolve
+    settings.clear_caches()
+    assert settings.resolve("app") is not cfg
+    assert settings.resolve_cache_info()["size"] == 1
+
+
+def test_resolve_cache_size():
+    resolver = FakeResolver({"hab_gui_resolve_cache_size": 2})
+    settings = Settings(resolver, 0, uri="a")
+
+    cfg_a = settings.resolve("a")
+    settings.resolve("b")
+    # Using "a" makes "b" the least recently used config
+    assert settings.resolve("a") is cfg_a
+    settings.resolve("c")
+    assert settings.resolve_cache_info()["size"] == 2
+    assert settings.resolve("a") is cfg_a
+    settings.resolve("b")
+    assert resolver.resolved == ["a", "b", "c", "b"]
+
+
+def test_invalidate_files():
+    parent = SimpleNamespace(filename="proj.json", parent=None)
+    node = SimpleNamespace(filename="seq.json", parent=parent)
+    version = SimpleNamespace(filename="maya/.hab.json")
+    configs = {
+        "proj/seq": SimpleNamespace(original_node=node, versions=[version]),
+        "proj": SimpleNamespace(original_node=parent, versions=[]),
+    }
+
+    resolver = FakeResolver()
+    resolver.resolve = lambda uri: configs[uri]
+    settings = Settings(resolver, 0, uri="proj")
+    assert Settings.config_filenames(configs["proj/seq"]) == {
+        "proj.json",
+        "seq.json",
+        "maya/.hab.json",
+    }
+
+    settings.resolve("proj")
+    settings.resolve("proj/seq")
+    # Only configs built from the files are removed
+    settings.invalidate_files(["maya/.hab.json"])
+    assert [key[0] for key in settings._resolve_cache] == ["proj"]
+    settings.resolve("proj/seq")
+    settings.invalidate_files(["proj.json"])
+    assert settings.resolve_cache_info()["size"] == 0
+
+
+def test_prefs_write_behind(tmp_path):
+    resolver = FakeResolver({"prefs_default": ["--prefs"]})
+    filename = tmp_path / "prefs.json"
+    resolver.user_prefs().filename = filename
+    settings = Settings(resolver, 0, uri="app")
+
+    # Changes are kept in memory until flushed
+    assert settings.set_user_pref("pinned_uris", ["app"])
+    settings.verbosity = 2
+    assert settings.user_pref("pinned_uris") == ["app"]
+    assert settings.prefs.dirty
+    assert not filename.exists()
+
+    assert settings.prefs.flush()
+    assert not settings.prefs.dirty
+    data = json.loads(filename.read_text())
+    assert data == {"pinned_uris": ["app"], "verbosity": {"hab-gui": 2}}
+    # Nothing is written if there are no changes
+    assert not settings.prefs.flush()
+
+
+def test_prefs_disabled(tmp_path):
+    resolver = FakeResolver({"prefs_default": ["disabled"]})
+    resolver.user_prefs().filename = tmp_path / "prefs.json"
+    settings = Settings(resolver, 0, uri="app")
+
+    assert not settings.set_user_pref("pinned_uris", ["app"])
+    assert settings.user_pref("pinned_uris", "default") == "default"
+    assert not settings.prefs.flush()
+    assert not (tmp_path / "prefs.json").exists()
+
+
+def test_resolve_forced_requirements():
+    resolver = FakeResolver()
+    resolver.forced_requirements = {"maya": "maya==2024"}
+    settings = Settings(resolver, 0, uri="app")
+    forced = {"houdini": "houdini==20.0"}
+
+    assert not settings.is_resolved("app", forced)
+    cfg = settings.resolve("app", forced_requirements=forced)
+    # The resolver's forced_requirements are restored
+    assert resolver.forced_requirements == {"maya": "maya==2024"}
+    assert settings.is_resolved("app", forced)
+    assert not settings.is_resolved("app")
+
+    # Changing the resolver's forced_requirements to match uses the cached config
+    resolver.forced_requirements = forced
+    assert settings.is_resolved("app")
+    assert settings.resolve("app") is cfg
+
+
+def test_recent_uris(tmp_path):
+    resolver = FakeResolver({"prefs_default": ["--prefs"]})
+    resolver.user_prefs().filename = tmp_path / "prefs.json"
+    settings = Settings(resolver, 0, uri="app")
+    settings.recent_uris_limit = 3
+
+    for uri in ("a", "b", "a", "", "c", "d"):
+        settings.uri = uri
+    # Most recent first, without duplicates or empty URIs
+    assert settings.recent_uris() == ["d", "c", "a"]
+
+
+def test_prefs_not_kept_alive(tmp_path):
+    resolver = FakeResolver({"prefs_default": ["--prefs"]})
+    resolver.user_prefs().filename = tmp_path / "prefs.json"
+    settings = Settings(resolver, 0, uri="app")
+    settings.set_user_pref("pinned_uris", ["app"])
+    assert settings.prefs in settings_module._prefs_stores
+    settings.prefs.flush()
+    assert settings.prefs not in settings_module._prefs_stores
+
+    # Settings with unsaved prefs are not kept alive until python exits
+    settings.set_user_pref("pinned_uris", ["other"])
+    ref = weakref.ref(settings.prefs)
+    del settings
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,72 @@
+import json
+
+from Qt import QtCompat, QtCore
+
+from hab_gui.settings import Settings
+from hab_gui.signal_tracer import SignalTracer, tracer
+
+
+class Receiver(QtCore.QObject):
+    def __init__(self, settings):
+        super().__init__()
+        self.settings = settings
+        self.uris = []
+        settings.uri_changing.connect(self.changing)
+        settings.uri_changed.connect(self.changed)
+
+    def changing(self, uri):
+        # Re-emitting a signal from a slot is recorded as nested
+        self.settings.uri_changed.emit(uri)
+
+    def changed(self):
+        self.uris.append(self.settings.uri)
+
+
+def test_signal_tracer(tmp_path):
+    from test_settings import FakeResolver
+
+    tracer.start(str(tmp_path / "trace.json"))
+    try:
+        settings = Settings(FakeResolver(), 0, uri="app")
+        receiver = Receiver(settings)
+        settings.uri = "app/child"
+    finally:
+        tracer.finish()
+
+    assert receiver.uris == ["app", "app/child"]
+    report = [(r["name"], r["category"], r["depth"]) for r in tracer.report()]
+    assert report == [
+        ("Settings.uri_changing", "signal", 0),
+        ("Receiver.changing", "slot", 1),
+        ("Settings.uri_changed", "signal", 2),
+        ("Receiver.changed", "slot", 3),
+        ("Settings.uri_changed", "signal", 0),
+        ("Receiver.changed", "slot", 1),
+    ]
+    summary = tracer.summary()
+    assert summary["Receiver.changed"]["calls"] == 2
+    assert summary["Settings.uri_changed"]["calls"] == 2
+
+    data = json.loads((tmp_path / "trace.json").read_text())
+    events = data["traceEvents"]
+    assert [event["name"] for event in events] == [r[0] for r in report]
+    assert events[0]["ph"] == "X"
+    assert events[0]["args"] == {"args": ["'app/child'"]}
+    assert events[1]["args"] == {"signal": "Settings.uri_changing"}
+
+    # Like untraced slots, they are disconnected when the receiver is deleted
+    uris = receiver.uris
+    QtCompat.delete(receiver)
+    settings.uri = "other"
+    assert uris == ["app", "app/child"]
+
+
+def test_signal_tracer_disabled():
+    # Nothing is recorded or installed unless started
+    _tracer = SignalTracer()
+    obj = QtCore.QObject()
+    _tracer.install(obj, ["destroyed"])
+    assert not hasattr(obj.destroyed, "tracer")
+    with _tracer.record("name", "slot"):
+        pass
+    assert _tracer.report() == []
@@ -0,0 +1,86 @@
+from Qt import QtCore, QtGui, QtWidgets
+
+from hab_gui.widgets.splash_screen import SplashScreen
+
+
+def save_image(filename, width, height, alpha=True):
+    fmt = (
+        QtGui.QImage.Format.Format_ARGB32 if alpha else QtGui.QImage.Format.Format_RGB32
+    )
+    image = QtGui.QImage(width, height, fmt)
+    image.fill(
+        QtCore.Qt.GlobalColor.transparent if alpha else QtCore.Qt.GlobalColor.red
+    )
+    if alpha:
+        # Only the top left quarter is opaque
+        QtGui.QPainter(image).fillRect(
+            0, 0, width // 2, height // 2, QtCore.Qt.GlobalColor.red
+        )
+    image.save(str(filename))
+    return str(filename)
+
+
+def test_scaled(tmp_path):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    max_size = SplashScreen.max_size()
+    width, height = max_size.width() * 4, max_size.height() * 4
+    splash = SplashScreen(save_image(tmp_path / "large.png", width, height))
+    # Large images are decoded at a size that fits inside max_size
+    size = splash._pixmap.size()
+    assert size.width() <= max_size.width() and size.height() <= max_size.height()
+    assert size.width() * height == size.height() * width
+
+    # Small images are not scaled
+    splash = SplashScreen(save_image(tmp_path / "small.png", 20, 10))
+    assert splash._pixmap.size() == QtCore.QSize(20, 10)
+
+
+def test_cache_mode():
+    size = QtCore.QSize(100, 100)
+    assert SplashScreen.cache_mode(size, 10) == QtGui.QMovie.CacheMode.CacheAll
+    # Only the current frame is kept if all of the frames don't fit
+    frames = SplashScreen.max_cache_bytes // (100 * 100 * 4) + 1
+    assert SplashScreen.cache_mode(size, frames) == QtGui.QMovie.CacheMode.CacheNone
+    assert SplashScreen.cache_mode(size, 0) == QtGui.QMovie.CacheMode.CacheNone
+    assert (
+        SplashScreen.cache_mode(QtCore.QSize(), 1) == QtGui.QMovie.CacheMode.CacheNone
+    )
+
+
+def test_mask(tmp_path, monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    splash = SplashScreen(save_image(tmp_path / "alpha.png", 20, 20))
+    assert splash.mask().boundingRect() == QtCore.QRect(0, 0, 10, 10)
+
+    # The mask of each frame is only calculated and applied once
+    masks = []
+    monkeypatch.setattr(splash, "setMask", masks.append)
+    splash._update_mask(0)
+    assert masks == []
+    splash._update_mask(1)
+    splash._update_mask(1)
+    assert len(splash._masks) == 2
+    assert masks == []
+
+    # Frames without transparency clear the mask
+    splash._pixmap = QtGui.QPixmap(save_image(tmp_path / "opaque.png", 20, 20, False))
+    splash._update_mask(2)
+    assert splash.mask().isEmpty()
+    assert splash._mask is None
+
+
+def test_finish_releases_movie(tmp_path):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    splash = SplashScreen(save_image(tmp_path / "alpha.png", 20, 20))
+    splash.show()
+    movie = splash.movie
+    window = QtWidgets.QWidget()
+    window.show()
+    splash.finish(window)
+    assert splash.movie is None
+    assert movie.state() == QtGui.QMovie.MovieState.NotRunning
+    assert splash._masks == {}
+    # The last frame can still be painted
+    assert not splash._pixmap.isNull()
+    splash.repaint()
+    window.close()
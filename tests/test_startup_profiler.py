@@ -0,0 +1,95 @@
+import itertools
+import json
+import logging
+
+from Qt import QtWidgets
+
+from hab_gui import startup_profiler
+from hab_gui.startup_profiler import StartupProfiler
+
+
+def fake_clock(monkeypatch):
+    """Make `time.perf_counter` advance by 0.25 seconds every call."""
+    ticks = itertools.count()
+    monkeypatch.setattr(
+        startup_profiler.time, "perf_counter", lambda: next(ticks) * 0.25
+    )
+
+
+def test_phases(monkeypatch):
+    fake_clock(monkeypatch)
+    profiler = StartupProfiler()
+
+    # Nothing is recorded unless enabled
+    with profiler.phase("disabled"):
+        profiler.mark("disabled")
+    assert profiler.report() == []
+
+    profiler.start()
+    with profiler.phase("outer"):
+        profiler.mark("event")
+        with profiler.phase("inner"):
+            pass
+    assert profiler.report() == [
+        dict(name="start", start=0.25, duration=0, depth=0),
+        dict(name="outer", start=0.5, duration=1.0, depth=0),
+        dict(name="event", start=0.75, duration=0, depth=1),
+        dict(name="inner", start=1.0, duration=0.25, depth=1),
+    ]
+
+    # Starting again discards the previous records
+    profiler.start()
+    assert [record["name"] for record in profiler.report()] == ["start"]
+
+
+def test_report(monkeypatch, tmp_path, capsys, caplog):
+    fake_clock(monkeypatch)
+    profiler = StartupProfiler()
+    profiler.start()
+    with profiler.phase("settings"):
+        profiler.mark("uri_changed")
+    table = "\n".join(
+        [
+            "  Start ms  Duration ms  Phase",
+            "     250.0          0.0  start",
+            "     500.0        500.0  settings",
+            "     750.0          0.0    uri_changed",
+        ]
+    )
+    assert profiler.table() == table
+
+    profiler.write("-")
+    assert capsys.readouterr().out == f"{table}\n"
+
+    profiler.write(tmp_path / "profile.txt")
+    assert (tmp_path / "profile.txt").read_text() == f"{table}\n"
+
+    with caplog.at_level(logging.INFO, logger="hab_gui.startup_profiler"):
+        profiler.write()
+    assert caplog.messages == [f"hab gui startup profile:\n{table}"]
+
+    # Finishing records the end, writes the output and stops recording
+    output = tmp_path / "profile.json"
+    profiler.output = str(output)
+    profiler.finish()
+    assert not profiler.enabled
+    phases = json.loads(output.read_text())["phases"]
+    assert phases == profiler.report()
+    assert phases[-1] == dict(name="finished", start=1.25, duration=0, depth=0)
+
+
+def test_watch(qtbot, tmp_path):
+    profiler = StartupProfiler()
+    widget = QtWidgets.QWidget()
+    qtbot.addWidget(widget)
+
+    # Watching does nothing unless enabled
+    profiler.watch(widget)
+
+    output = tmp_path / "profile.json"
+    profiler.start(str(output))
+    profiler.watch(widget)
+    widget.show()
+    qtbot.waitUntil(lambda: not profiler.enabled)
+    phases = json.loads(output.read_text())["phases"]
+    assert [phase["name"] for phase in phases] == ["start", "first_paint", "finished"]
@@ -0,0 +1,45 @@
+from Qt import QtWidgets
+from test_settings import FakeResolver
+
+from hab_gui.settings import Settings
+from hab_gui.widgets.uri_line_edit import URILineEdit
+
+
+def test_uri_committer():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    resolver = FakeResolver()
+    resolver.configs = {"app": None, "app/child": None}
+    settings = Settings(resolver, 0, uri="")
+    changes = []
+    settings.uri_changed.connect(changes.append)
+
+    widget = URILineEdit(settings)
+    committer = widget.committer
+    # Setting the URI from code commits it immediately
+    widget.set_uri("app")
+    assert changes == ["app"]
+    assert settings.uri == "app"
+
+    # Typing only starts the timer
+    for text in ("app/", "app/c", "app/child"):
+        widget.setText(text)
+        widget.textEdited.emit(text)
+        assert committer.pending
+    assert changes == ["app"]
+    # Known URIs are committed sooner than unknown URIs
+    assert committer._timer.interval() == committer.delay
+    widget.setText("app/chi")
+    widget.textEdited.emit("app/chi")
+    assert committer._timer.interval() == committer.unknown_delay
+
+    # Pressing enter or changing focus commits the URI
+    widget.setText("app/child")
+    widget.editingFinished.emit()
+    assert not committer.pending
+    assert changes == ["app", "app/child"]
+
+    # Nothing happens if the URI didn't change unless forced
+    widget.editingFinished.emit()
+    assert changes == ["app", "app/child"]
+    committer.commit(force=True)
+    assert changes == ["app", "app/child", "app/child"]
@@ -0,0 +1,37 @@
+from hab_gui.models.uri_model import URIModel
+
+URIS = [
+    "default",
+    "projectA",
+    "projectA/seq010",
+    "projectA/seq010/shot0100",
+    "projectA/seq020/shot0100",
+    "projectB/Seq010",
+]
+
+
+def test_find():
+    model = URIModel(URIS)
+    assert model.rowCount() == len(URIS)
+    assert model.find("projectA/seq010") == 2
+    assert model.find("projectA/seq030") == -1
+
+    model.set_uris(URIS[:2])
+    assert model.rowCount() == 2
+    assert model.find("projectA/seq010") == -1
+    assert model.uris() == URIS[:2]
+
+
+def test_matches():
+    model = URIModel(URIS)
+    # Matches the start of the URI
+    assert model.matches("projecta/") == URIS[2:5]
+    # Matches the start of each segment case-insensitively
+    assert model.matches("SEQ010") == [URIS[2], URIS[3], URIS[5]]
+    assert model.matches("seq010/shot") == [URIS[3]]
+    assert model.matches("shot0100") == [URIS[3], URIS[4]]
+    # Doesn't match text in the middle of a segment
+    assert model.matches("010") == []
+    # No text returns all of the URIs
+    assert model.matches("") == URIS
+    assert len(model.matches("project", limit=2)) == 2
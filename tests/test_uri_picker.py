@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from hab.user_prefs import UserPrefs
+
+from hab_gui import uri_picker
+
+
+def make_prefs(tmp_path, data, enabled=True):
+    site = {"prefs_default": ["--prefs" if enabled else "disabled"]}
+    site["prefs_uri_timeout"] = dict(days=1)
+    user_prefs = UserPrefs(SimpleNamespace(site=site))
+    user_prefs.filename = tmp_path / "prefs.json"
+    user_prefs.filename.write_text(json.dumps(data))
+    return user_prefs
+
+
+def test_should_show(tmp_path):
+    data = {"uri": "app", "uri_last_changed": "2100-01-01T00:00:00"}
+    user_prefs = make_prefs(tmp_path, data)
+
+    # The shift key is only checked if nothing else requires the picker
+    assert uri_picker.should_show(user_prefs, "maya", lambda: False) is False
+    assert uri_picker.should_show(user_prefs, "maya", lambda: True) is True
+    assert uri_picker.should_show(user_prefs, "maya", lambda: None) is None
+
+    # The prefs are only read once
+    user_prefs.filename.write_text(json.dumps(dict(data, uri_picker={"maya": True})))
+    assert uri_picker.should_show(user_prefs, "maya", lambda: False) is False
+    user_prefs.load(force=True)
+    assert uri_picker.should_show(user_prefs, "maya", lambda: None) is True
+    assert uri_picker.should_show(user_prefs, "houdini", lambda: False) is False
+
+    # The saved uri has timed out
+    data["uri_last_changed"] = "2000-01-01T00:00:00"
+    user_prefs = make_prefs(tmp_path, data)
+    assert uri_picker.should_show(user_prefs, "maya", lambda: None) is True
+
+    # User prefs are disabled
+    user_prefs = make_prefs(tmp_path, {"uri": "app"}, enabled=False)
+    assert uri_picker.should_show(user_prefs, "maya", lambda: False) is True
+
+
+def test_launch_does_not_import_qt():
+    # Importing the cli must not import Qt so launching aliases doesn't need it
+    code = "import sys, hab_gui.cli; sys.exit('Qt' in sys.modules)"
+    assert subprocess.call([sys.executable, "-c", code]) == 0
+
+    # The default `hab_gui.init` entry point only imports Qt to show an error
+    site = Path(__file__).parent / "site" / "hab-gui.json"
+    code = (
+        "import sys, hab\n"
+        "from hab_gui.entry_points.base_init import entry_point_init\n"
+        f"resolver = hab.Resolver(site=hab.Site([{str(site)!r}]))\n"
+        "entry_point_init(resolver, 'launch')\n"
+        "assert sys.excepthook is not sys.__excepthook__\n"
+        "sys.exit('Qt' in sys.modules)"
+    )
+    assert subprocess.call([sys.executable, "-c", code]) == 0
@@ -0,0 +1,48 @@
+import hab
+from Qt import QtWidgets
+from site_generator import generate_site
+from test_settings import FakeResolver
+
+from hab_gui.settings import Settings
+from hab_gui.uri_prefetcher import URIPrefetcher
+from hab_gui.widgets.distro_picker import DistroPicker
+
+
+def test_uris(tmp_path):
+    resolver = FakeResolver({"prefs_default": ["--prefs"]})
+    resolver.user_prefs().filename = tmp_path / "prefs.json"
+    settings = Settings(resolver, 0, uri="app")
+    settings.recent_uris_limit = 3
+    for uri in ("a", "b", "a", "", "c", "d"):
+        settings.uri = uri
+
+    settings.set_user_pref("pinned_uris", ["Pin", "c", "app"])
+    prefetcher = URIPrefetcher(settings)
+    # The current URI is already resolved so it's skipped
+    assert prefetcher.uris() == ["c", "a", "app", "Pin"]
+
+
+def test_forced_requirements(tmp_path):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    site_file = generate_site(tmp_path, configs=2, uris=1, distros=6)
+    resolver = hab.Resolver(site=hab.Site([site_file]))
+    resolver.site["prefs_default"] = ["--prefs"]
+    resolver.user_prefs().filename = tmp_path / "prefs.json"
+    settings = Settings(resolver, 0, uri="project0000")
+    settings.set_user_pref("recent_uris", ["project0001/seq0000", "project0000"])
+    prefetcher = URIPrefetcher(settings)
+    # Without a DistroPicker the current forced requirements are used
+    assert prefetcher.forced_requirements("project0001/seq0000") is None
+
+    root = QtWidgets.QWidget()
+    settings.root_widget = root
+    DistroPicker(settings, parent=root)
+    settings.set_user_pref("distro_picker", {"project0001": ["distro0004"]})
+    # The optional distros the user saved for the URI are used
+    forced = prefetcher.forced_requirements("project0001/seq0000")
+    assert sorted(forced) == ["distro0004"]
+    assert prefetcher.forced_requirements("project0000") == {}
+
+    prefetcher.refresh()
+    assert prefetcher.prefetcher._requests == [("project0001/seq0000", forced)]
+    prefetcher.prefetcher.cancel()
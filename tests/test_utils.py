@@ -1,3 +1,10 @@
+import json
+import os
+import stat
+import sys
+
+import pytest
+
 import hab_gui.utils
 
 
@@ -20,3 +27,18 @@ def test_exec_obj():
     assert hab_gui.utils.exec_obj(ExecBoth()) == "exec"
     assert hab_gui.utils.exec_obj(Exec_()) == "exec_"
     assert hab_gui.utils.exec_obj(Exec()) == "exec"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Uses posix permissions")
+def test_save_json_permissions(tmp_path):
+    filename = tmp_path / "prefs.json"
+    # New files use the umask like any other file instead of mkstemp's 0600
+    hab_gui.utils.save_json(filename, {"a": 1})
+    mode = stat.S_IMODE(filename.stat().st_mode)
+    assert mode == 0o666 & ~hab_gui.utils._umask
+
+    # The permissions of existing files are kept
+    os.chmod(filename, 0o640)
+    hab_gui.utils.save_json(filename, {"a": 2})
+    assert stat.S_IMODE(filename.stat().st_mode) == 0o640
+    assert json.loads(filename.read_text()) == {"a": 2}
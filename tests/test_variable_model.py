@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+from hab_gui import utils
+from hab_gui.models.variable_model import VariableModel
+
+
+def make_parser(tmp_path, name, variables):
+    filename = tmp_path / f"{name}.json"
+    utils.save_json(filename, {"name": name, "variables": variables})
+    return SimpleNamespace(name=name, filename=filename, variables=dict(variables))
+
+
+def test_lazy_rows(tmp_path):
+    model = VariableModel()
+    model.set_parsers([make_parser(tmp_path, "a", {"x": "1", "y": "2"})])
+    parent = model.index(0, 0)
+    assert model.rowCount() == 1
+    assert model.hasChildren(parent)
+
+    # Variable rows are not created until fetched
+    assert model.rowCount(parent) == 0
+    assert model.canFetchMore(parent)
+    model.fetchMore(parent)
+    assert not model.canFetchMore(parent)
+    assert model.rowCount(parent) == 3
+    assert model.index(0, 1, parent).data() == str(tmp_path / "a.json")
+    assert model.index(2, 0, parent).data() == "y"
+    assert model.index(2, 1, parent).parent() == parent
+
+
+def test_edit_and_reload(tmp_path):
+    parser = make_parser(tmp_path, "a", {"x": "1", "y": "2"})
+    model = VariableModel()
+    model.set_parsers([parser])
+    parent = model.index(0, 0)
+    model.fetchMore(parent)
+
+    # Renaming keeps the order of the variables
+    assert model.setData(model.index(1, 0, parent), "z")
+    assert list(parser.variables) == ["z", "y"]
+    assert model.setData(model.index(2, 1, parent), "3")
+    assert parent.data() == "a*"
+    assert list(model.dirty) == [0]
+    # Renaming to an existing variable is not allowed
+    assert not model.setData(model.index(1, 0, parent), "y")
+
+    assert model.add_variable(0)
+    assert not model.add_variable(0)
+    model.remove_variable(model.index(1, 0, parent))
+    assert parser.variables == {"y": "3", "Undefined": "Undefined"}
+    assert model.rowCount(parent) == 3
+
+    # Reloading discards the changes
+    model.reload(0)
+    assert parser.variables == {"x": "1", "y": "2"}
+    assert parent.data() == "a"
+    assert model.rowCount(parent) == 3